@@ -0,0 +1,57 @@
+"""Handoff candidate index: a max-heap of drones keyed on their handoff score."""
+import heapq
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class CandidateIndex:
+    """
+    Keeps each eligible drone's latest score in a heap. update() pushes a new
+    entry and leaves the old one in place; best() skips entries whose score is
+    no longer current, so updates are O(log n) and a lookup pops only stale
+    entries and the candidates it rejects. Equal scores go to the drone that
+    was indexed first, as a scan over insertion order would.
+    """
+
+    def __init__(self):
+        self.scores: Dict[str, float] = {}
+        self._order: Dict[str, int] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+
+    def update(self, agent_id: str, score: float):
+        if self.scores.get(agent_id) == score:
+            return
+        self.scores[agent_id] = score
+        order = self._order.setdefault(agent_id, len(self._order))
+        heapq.heappush(self._heap, (-score, order, agent_id))
+        if len(self._heap) > 4 * len(self.scores) + 64:
+            self._compact()
+
+    def discard(self, agent_id: str):
+        """Stop offering an agent (its heap entries become stale)."""
+        self.scores.pop(agent_id, None)
+
+    def best(self, exclude: Optional[str] = None,
+             accept: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """Highest-scoring agent other than `exclude` that passes `accept`, or None."""
+        heap = self._heap
+        skipped = []
+        found = None
+        while heap:
+            entry = heapq.heappop(heap)
+            neg_score, _, agent_id = entry
+            if self.scores.get(agent_id) != -neg_score:
+                continue
+            skipped.append(entry)
+            if agent_id != exclude and (accept is None or accept(agent_id)):
+                found = agent_id
+                break
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return found
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def _compact(self):
+        self._heap = [(-score, self._order[agent_id], agent_id) for agent_id, score in self.scores.items()]
+        heapq.heapify(self._heap)
@@ -0,0 +1,104 @@
+"""Ground command batching: dedup by alert level, per-drone rate limits, one message per drone per flush."""
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+BROADCAST_TARGET = "*"
+
+
+class CommandBatcher:
+    """
+    Sits between GroundAgent decisions and the bus.
+
+    Commands submitted with a `level` are alerts about a drone's state (e.g.
+    BATTERY_WARNING low/critical). The last level sent per (drone, command) is
+    remembered and a repeat of it is dropped, so alert traffic follows state
+    changes rather than heartbeat frequency; clear() forgets the state once the
+    condition is over. A newer level for the same alert replaces one that is
+    still pending. Commands without a level are always queued.
+
+    flush() returns, per drone, every pending command in one batch, at most
+    once per `min_interval` of simulation time per drone; drones still inside
+    their interval keep their commands for a later flush.
+    """
+
+    def __init__(self, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self.levels: Dict[Tuple[str, str], Any] = {}
+        self.pending: Dict[str, "OrderedDict[Hashable, Any]"] = {}
+        self.last_sent: Dict[str, float] = {}
+        self._seq = 0
+        self.stats = {
+            "submitted": 0,
+            "deduplicated": 0,
+            "coalesced": 0,
+            "escalations": 0,
+            "rate_limited": 0,
+            "batches_sent": 0,
+            "commands_sent": 0
+        }
+
+    def submit(self, target: Optional[str], command: Any, level: Optional[str] = None) -> bool:
+        """Queue a command (anything with .command_type); False if it repeats the current alert level."""
+        target = target or BROADCAST_TARGET
+        command_type = command.command_type
+        self.stats["submitted"] += 1
+        queue = self.pending.setdefault(target, OrderedDict())
+
+        if level is None:
+            self._seq += 1
+            queue[(command_type, self._seq)] = command
+            return True
+
+        state_key = (target, command_type)
+        previous = self.levels.get(state_key)
+        if previous == level:
+            self.stats["deduplicated"] += 1
+            return False
+        if previous is not None:
+            self.stats["escalations"] += 1
+        self.levels[state_key] = level
+
+        if command_type in queue:
+            self.stats["coalesced"] += 1
+            del queue[command_type]
+        queue[command_type] = command
+        return True
+
+    def clear(self, target: str, command_type: str):
+        """Forget the alert state for a drone, so the next alert is sent again."""
+        self.levels.pop((target, command_type), None)
+
+    def forget(self, target: str):
+        """Drop all state and pending commands for a drone."""
+        self.pending.pop(target, None)
+        self.last_sent.pop(target, None)
+        for state_key in [k for k in self.levels if k[0] == target]:
+            del self.levels[state_key]
+
+    def flush(self, now: float) -> List[Tuple[Optional[str], List[Any]]]:
+        """Pending commands due at `now`, as (target or None for broadcast, [commands]) batches."""
+        batches = []
+        for target in list(self.pending):
+            queue = self.pending[target]
+            if not queue:
+                del self.pending[target]
+                continue
+            last = self.last_sent.get(target)
+            if last is not None and now - last < self.min_interval:
+                self.stats["rate_limited"] += 1
+                continue
+
+            commands = list(queue.values())
+            del self.pending[target]
+            self.last_sent[target] = now
+            self.stats["batches_sent"] += 1
+            self.stats["commands_sent"] += len(commands)
+            batches.append((None if target == BROADCAST_TARGET else target, commands))
+        return batches
+
+    @property
+    def pending_count(self) -> int:
+        return sum(len(queue) for queue in self.pending.values())
+
+    def get_stats(self) -> dict:
+        return dict(self.stats, pending=self.pending_count)
@@ -23,6 +23,7 @@ class MessageType(Enum):
     ACCEPT_HANDOFF = "ACCEPT_HANDOFF"
     HEARTBEAT = "HEARTBEAT"
     TARGET_FOUND = "TARGET_FOUND"
+    GROUND_COMMAND = "GROUND_COMMAND"
 
 @dataclass
 class Position:
@@ -71,7 +72,15 @@ class DroneAgent:
     BATTERY_DRAIN_SCAN = 0.3
     LOW_BATTERY_THRESHOLD = 20.0
     HANDOFF_ACCEPT_THRESHOLD = 40.0
+    HANDOFF_ACCEPT_MAX = 10  # Tiles a peer takes from the front of a HANDOFF_REQUEST
     CRITICAL_BATTERY = 5.0
+    # Broadcast types _handle_message acts on; others are not delivered
+    SUBSCRIBED_MESSAGES = (
+        MessageType.OFFER_TILE.value,
+        MessageType.ACCEPT_OFFER.value,
+        MessageType.HANDOFF_REQUEST.value,
+        MessageType.ACCEPT_HANDOFF.value,
+    )
     
     def __init__(
         self,
@@ -92,6 +101,7 @@ class DroneAgent:
         self.visited_tiles: Set[tuple] = set()
         self.pending_offers: Dict[str, tuple] = {}
         self.targets_found: List[tuple] = []
+        self.inference_ms: List[float] = []  # Detection call times not yet collected by the environment
         self.inbox: List[Message] = []
         self.send_message = send_message_callback
         self.detection_probability = detection_probability
@@ -141,11 +151,12 @@ class DroneAgent:
             messages_sent.append(heartbeat)
             self.last_heartbeat = current_time
 
-        if self.battery < self.LOW_BATTERY_THRESHOLD and not self.handoff_pending and self.assigned_tiles:
+        unsearched = self.assigned_tiles - self.visited_tiles
+        if self.battery < self.LOW_BATTERY_THRESHOLD and not self.handoff_pending and unsearched:
             handoff_request = self._create_message(
                 MessageType.HANDOFF_REQUEST,
                 {
-                    "tiles": list(self.assigned_tiles),
+                    "tiles": sorted(unsearched),
                     "position": self.position.to_dict(),
                     "battery": self.battery
                 }
@@ -171,7 +182,9 @@ class DroneAgent:
                     self.visited_tiles.add(current_pos)
                     self.battery -= self.BATTERY_DRAIN_SCAN
                     
-                    # Use CNN model for person detection on every tile scan
+                    # Use CNN model for person detection on every tile scan; timed in
+                    # `finally` so failed calls and the fallback path are sampled too
+                    started = time.perf_counter()
                     try:
                         from models.person_detector import detect_person
 
@@ -215,6 +228,8 @@ class DroneAgent:
                                     )
                                     self.send_message(target_msg)
                                     messages_sent.append(target_msg)
+                    finally:
+                        self.inference_ms.append((time.perf_counter() - started) * 1000)
             else:
                 self.state = DroneState.IDLE
                 self.battery -= self.BATTERY_DRAIN_IDLE
@@ -264,7 +279,7 @@ class DroneAgent:
         elif msg_type == MessageType.HANDOFF_REQUEST.value:
             if self.battery > self.HANDOFF_ACCEPT_THRESHOLD and not self.handoff_pending:
                 tiles = message.payload.get("tiles", [])
-                tiles_to_accept = tiles[:min(len(tiles), 10)]
+                tiles_to_accept = tiles[:self.HANDOFF_ACCEPT_MAX]
                 accept_msg = self._create_message(
                     MessageType.ACCEPT_HANDOFF,
                     {
@@ -289,6 +304,42 @@ class DroneAgent:
         elif msg_type == MessageType.HEARTBEAT.value:
             pass
 
+        elif msg_type == MessageType.GROUND_COMMAND.value:
+            for command in message.payload.get("commands", []):
+                self._apply_ground_command(command)
+
+    def _apply_ground_command(self, command: dict):
+        # Ground commands are unicast, so they arrive without a subscription
+        command_type = command.get("command_type")
+        if command_type not in ("ASSIGN_TILES", "RELEASE_TILES"):
+            return
+        payload = command.get("payload", {})
+        tiles = {
+            (tile[0], tile[1]) if isinstance(tile, (list, tuple)) else (tile["x"], tile["y"])
+            for tile in payload.get("tiles", [])
+        }
+        within = payload.get("within")
+        if command_type == "RELEASE_TILES":
+            # The ground handed these (or everything left inside `within`, a region
+            # this drone flew out of) to another drone
+            self.assigned_tiles -= tiles
+            if within:
+                self.assigned_tiles = {
+                    t for t in self.assigned_tiles
+                    if t in self.visited_tiles
+                    or not (within[0] <= t[0] < within[2] and within[1] <= t[1] < within[3])
+                }
+            return
+        if payload.get("replace"):
+            # A zone reallocation supersedes whatever this drone had left to search,
+            # or only what it had inside `within` ([x0, y0, x1, y1), set by a regional coordinator)
+            self.assigned_tiles = {
+                t for t in self.assigned_tiles
+                if t in self.visited_tiles
+                or (within and not (within[0] <= t[0] < within[2] and within[1] <= t[1] < within[3]))
+            }
+        self.assign_tiles(tiles)
+
     def _get_nearest_unvisited_tile(self) -> Optional[tuple]:
         unvisited = self.assigned_tiles - self.visited_tiles
         if not unvisited:
@@ -3,11 +3,17 @@ import asyncio
 import time
 import uuid
 import logging
-from typing import Dict, List, Set, Optional, Callable, Any
+from collections import deque
+from concurrent.futures import Executor
+from typing import Deque, Dict, List, Set, Optional, Callable, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
-from agents.drone_agent import Message, Position
+from agents.drone_agent import DroneAgent, Message, Position
+from agents.command_batcher import CommandBatcher
+from agents.world_state import WorldUpdate
+from agents.liveness import DeadlineTracker, LivenessEvent
+from agents.candidate_index import CandidateIndex
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +25,7 @@ class GroundAgentState(Enum):
 
 class CommandType(Enum):
     ASSIGN_TILES = "ASSIGN_TILES"
+    RELEASE_TILES = "RELEASE_TILES"
     RECALL_DRONE = "RECALL_DRONE"
     PRIORITY_AREA = "PRIORITY_AREA"
     BATTERY_WARNING = "BATTERY_WARNING"
@@ -75,14 +82,41 @@ class GroundAgent:
     HEARTBEAT_TIMEOUT = 10.0  # Consider drone inactive after 10s without heartbeat
     LOW_BATTERY_THRESHOLD = 25.0
     CRITICAL_BATTERY_THRESHOLD = 15.0
+    HANDOFF_MIN_BATTERY = 40.0  # Drones at or below this never take over tiles
+    HANDOFF_WORKLOAD_WEIGHT = 0.5  # Score = battery - weight * assigned tiles
     COORDINATION_INTERVAL = 5.0  # Run coordination logic every 5 seconds
+    SUBSCRIBED_MESSAGES = ("HEARTBEAT", "TARGET_FOUND", "HANDOFF_REQUEST", "OFFER_TILE")
+    # Agent fields mirrored into DroneStatus from the world feed
+    WORLD_FIELDS = ("assigned_tiles", "visited_tiles", "state")
+    HISTORY_SIZE = 500  # Recent messages/commands kept; counters cover the whole run
+    COMMAND_INTERVAL = 1.0  # At most one command message per drone per second
+    # Reallocation: idle or lost drones force a new plan, other reasons ask should_reallocate()
+    REALLOCATION_COOLDOWN_TICKS = 5
+    REALLOCATION_MIN_TICKS = 20
+    FORCED_REALLOCATION_REASONS = {"idle", "lost"}
+    IDLE_REALLOCATION_BATTERY = 30.0
+    ZONE_RESYNC_INTERVAL = 10  # Every Nth reallocation sends whole zones
     
     def __init__(
         self,
         agent_id: str,
         grid_size: tuple,
-        send_message_callback: Callable[[Message], None]
+        send_message_callback: Callable[[Message], None],
+        history_size: int = HISTORY_SIZE,
+        allocator: Optional[Any] = None,
+        executor: Optional[Executor] = None,
+        handoff_max_distance: Optional[float] = None,
+        commands: Optional[CommandBatcher] = None
     ):
+        """
+        `allocator` is a sim.zone_allocator.ZoneAllocator (passed in, since
+        agents cannot import sim); without one the ground never reallocates.
+        Plans are computed on `executor` (the loop's default if None).
+        With `handoff_max_distance`, a handoff only goes to a drone within that
+        Manhattan distance of the centre of the tiles being handed off.
+        Agents given the same `commands` batcher share its per-drone rate
+        limit and alert levels (see RegionalHierarchy).
+        """
         self.agent_id = agent_id
         self.grid_size = grid_size
         self.state = GroundAgentState.MONITORING
@@ -92,22 +126,56 @@ class GroundAgent:
         self.drone_status: Dict[str, DroneStatus] = {}
         self.discovered_targets: Set[tuple] = set()
         self.coverage_map: Set[tuple] = set()
+        self.visited_count = 0  # len(coverage_map), or visit counts alone under regional coordinators
         self.priority_areas: List[tuple] = []
+        # Latest fields per agent from the world feed, kept even before a drone's first heartbeat
+        self.world_agents: Dict[str, Dict[str, Any]] = {}
+        self.last_world_tick = -1
+        # Drones able to take a handoff, kept current as heartbeats and world updates arrive
+        self.handoff_candidates = CandidateIndex()
+        self.handoff_max_distance = handoff_max_distance
+        # Latest RegionSummary per region when regional coordinators own the drones
+        self.regions: Dict[str, Any] = {}
         
-        # Command tracking
-        self.commands_sent: List[GroundCommand] = []
-        self.messages_received: List[Message] = []
+        # Command tracking: bounded recent history plus running counters
+        self.commands_sent: Deque[GroundCommand] = deque(maxlen=history_size)
+        self.messages_received: Deque[Message] = deque(maxlen=history_size)
+        self.message_counts: Dict[str, Dict[str, int]] = {"by_type": {}, "by_drone": {}}
+        self.command_counts: Dict[str, Dict[str, int]] = {"by_type": {}, "by_drone": {}}
+        self.commands = commands or CommandBatcher(self.COMMAND_INTERVAL)
         
         # Statistics
         self.stats = {
             "total_commands_sent": 0,
+            "command_messages_sent": 0,
             "total_messages_received": 0,
             "targets_found": 0,
             "active_drones": 0,
             "coverage_percent": 0.0,
-            "coordination_cycles": 0
+            "coordination_cycles": 0,
+            "reallocations": 0,
+            "tiles_reassigned": 0
         }
         
+        # Simulation clock: the time of the latest tick. Heartbeats are stamped
+        # with it so timeouts never mix wall-clock and simulation time.
+        self.now = 0.0
+        self.liveness = DeadlineTracker(self.HEARTBEAT_TIMEOUT)
+        self.liveness_listeners: List[Callable[[LivenessEvent], None]] = []
+        self.liveness_events: Deque[LivenessEvent] = deque(maxlen=history_size)
+        
+        # Zone reallocation: events add reasons, tick() plans in the executor
+        # and sends each drone whose zone changed the tiles it gains and loses
+        self.allocator = allocator
+        self.executor = executor
+        self.allocation: Dict[str, Set[tuple]] = {}
+        self.realloc_reasons: Set[str] = set()
+        self._realloc_job: Optional[asyncio.Future] = None
+        self._realloc_job_reasons: List[str] = []
+        self.ticks = 0
+        self.last_realloc_tick = 0
+        self.add_liveness_listener(self._on_liveness)
+        
         self.last_coordination_time = 0.0
         self.start_time = time.time()
         
@@ -126,18 +194,77 @@ class GroundAgent:
             "discovered_targets": [
                 {"x": t[0], "y": t[1]} for t in self.discovered_targets
             ],
-            "coverage_tiles": len(self.coverage_map),
+            "coverage_tiles": self.visited_count,
             "priority_areas": [
                 {"x": t[0], "y": t[1]} for t in self.priority_areas
             ],
             "stats": self.stats,
+            "counters": self.get_counters(),
+            "command_batching": self.commands.get_stats(),
+            "liveness_events": [e.to_dict() for e in list(self.liveness_events)[-20:]],
+            "regions": [summary.to_dict() for summary in self.regions.values()],
+            "reallocation": {
+                "enabled": self.allocator is not None,
+                "pending_reasons": sorted(self.realloc_reasons),
+                "running": self._realloc_job is not None,
+                "last_tick": self.last_realloc_tick
+            },
             "uptime": round(time.time() - self.start_time, 1)
         }
     
+    @staticmethod
+    def _count(counts: Dict[str, Dict[str, int]], msg_type: str, drone_id: Optional[str]):
+        counts["by_type"][msg_type] = counts["by_type"].get(msg_type, 0) + 1
+        if drone_id:
+            counts["by_drone"][drone_id] = counts["by_drone"].get(drone_id, 0) + 1
+    
+    def get_counters(self) -> dict:
+        """Per-type and per-drone totals for received messages and sent commands."""
+        return {
+            "messages": self.message_counts,
+            "commands": self.command_counts
+        }
+    
+    def message_count(self, msg_type: Optional[str] = None, drone_id: Optional[str] = None) -> int:
+        """Messages received of a type, or from a drone (total if neither is given)."""
+        if msg_type is not None:
+            return self.message_counts["by_type"].get(msg_type, 0)
+        if drone_id is not None:
+            return self.message_counts["by_drone"].get(drone_id, 0)
+        return self.stats["total_messages_received"]
+    
+    def command_count(self, command_type: Optional[str] = None, drone_id: Optional[str] = None) -> int:
+        """Commands sent of a type, or to a drone (total if neither is given)."""
+        if command_type is not None:
+            return self.command_counts["by_type"].get(command_type, 0)
+        if drone_id is not None:
+            return self.command_counts["by_drone"].get(drone_id, 0)
+        return self.stats["total_commands_sent"]
+    
+    def add_liveness_listener(self, callback: Callable[[LivenessEvent], None]):
+        """Call back whenever a drone times out or is heard from again."""
+        self.liveness_listeners.append(callback)
+    
+    def _emit_liveness(self, agent_id: str, alive: bool):
+        event = LivenessEvent(agent_id, alive, self.now)
+        self.liveness_events.append(event)
+        for callback in self.liveness_listeners:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error("Liveness listener error: %s", e)
+    
+    def recent_messages(self, count: int = 50) -> List[dict]:
+        return [m.to_dict() for m in list(self.messages_received)[-count:]]
+    
+    def recent_commands(self, count: int = 50) -> List[dict]:
+        return [c.to_dict() for c in list(self.commands_sent)[-count:]]
+    
     def receive_message(self, message: Message):
         """Receive and process messages from drones."""
         self.messages_received.append(message)
         self.stats["total_messages_received"] += 1
+        self._count(self.message_counts, message.type, message.agent_id)
         
         msg_type = message.type
         agent_id = message.agent_id
@@ -163,10 +290,13 @@ class GroundAgent:
         
         if agent_id in self.drone_status:
             status = self.drone_status[agent_id]
+            if status.battery >= self.LOW_BATTERY_THRESHOLD > battery:
+                self.request_reallocation("battery")
             status.position = position
             status.battery = battery
-            status.last_heartbeat = time.time()
+            status.last_heartbeat = self.now
             status.is_active = True
+            self._refresh_candidate(status)
         else:
             # First heartbeat from new drone
             self.drone_status[agent_id] = DroneStatus(
@@ -177,28 +307,36 @@ class GroundAgent:
                 assigned_tiles=0,
                 visited_tiles=0,
                 targets_found=0,
-                last_heartbeat=time.time()
+                last_heartbeat=self.now
             )
+            self._apply_world_fields(self.drone_status[agent_id], self.world_agents.get(agent_id, {}))
+        if self.liveness.touch(agent_id, self.now):
+            self._emit_liveness(agent_id, True)
         
-        # Check for low battery
+        # Check for low battery; repeats of the current level are suppressed
         if battery < self.CRITICAL_BATTERY_THRESHOLD:
             self._send_command(
                 CommandType.BATTERY_WARNING,
                 agent_id,
-                {"level": "critical", "action": "recall"}
+                {"level": "critical", "action": "recall"},
+                level="critical"
             )
         elif battery < self.LOW_BATTERY_THRESHOLD:
             self._send_command(
                 CommandType.BATTERY_WARNING,
                 agent_id,
-                {"level": "low", "action": "coordinate_handoff"}
+                {"level": "low", "action": "coordinate_handoff"},
+                level="low"
             )
+        else:
+            self.commands.clear(agent_id, CommandType.BATTERY_WARNING.value)
     
     def _handle_target_found(self, agent_id: str, payload: dict):
         """Process target found notification."""
         position = payload.get("position", {})
-        target_pos = (position.get("x"), position.get("y"))
-        
+        self._record_target(agent_id, (position.get("x"), position.get("y")))
+    
+    def _record_target(self, agent_id: str, target_pos: tuple):
         if target_pos not in self.discovered_targets:
             self.discovered_targets.add(target_pos)
             self.stats["targets_found"] += 1
@@ -210,25 +348,38 @@ class GroundAgent:
                        agent_id, target_pos, self.stats["targets_found"])
     
     def _handle_handoff_request(self, agent_id: str, payload: dict):
-        """Coordinate handoff from low-battery drone."""
-        tiles = payload.get("tiles", [])
-        battery = payload.get("battery", 0)
+        """
+        Coordinate handoff from low-battery drone. Peers answer the same request
+        by taking its first HANDOFF_ACCEPT_MAX tiles, so the ground moves only
+        the unsearched tiles after those: assigned to the best candidate,
+        released by the requester and recorded in the allocation.
+        """
+        tiles = [
+            (t[0], t[1]) if isinstance(t, (list, tuple)) else (t["x"], t["y"])
+            for t in payload.get("tiles", [])
+        ]
+        remaining = [t for t in tiles[DroneAgent.HANDOFF_ACCEPT_MAX:] if t not in self.coverage_map]
+        if not remaining:
+            return
         
         # Find best drone to take over tiles
-        best_drone = self._find_best_drone_for_handoff(agent_id, tiles)
+        best_drone = self._find_best_drone_for_handoff(agent_id, remaining)
+        if not best_drone:
+            return
         
-        if best_drone:
-            self._send_command(
-                CommandType.ASSIGN_TILES,
-                best_drone,
-                {
-                    "tiles": tiles[:len(tiles)//2],  # Assign half the tiles
-                    "priority": "high",
-                    "from_agent": agent_id
-                }
-            )
-            logger.info("Ground Agent: Coordinating handoff from %s to %s", 
-                       agent_id, best_drone)
+        moved = [list(t) for t in remaining]
+        self._send_command(
+            CommandType.ASSIGN_TILES,
+            best_drone,
+            {"tiles": moved, "priority": "high", "from_agent": agent_id}
+        )
+        self._send_command(CommandType.RELEASE_TILES, agent_id, {"tiles": moved, "to_agent": best_drone})
+        if self.allocation:
+            self.allocation.get(agent_id, set()).difference_update(remaining)
+            self.allocation.setdefault(best_drone, set()).update(remaining)
+        self.stats["tiles_reassigned"] += len(remaining)
+        logger.info("Ground Agent: Coordinating handoff of %d tiles from %s to %s",
+                    len(remaining), agent_id, best_drone)
     
     def _handle_tile_offer(self, agent_id: str, payload: dict):
         """Monitor tile offers between drones."""
@@ -237,117 +388,167 @@ class GroundAgent:
     
     def _find_best_drone_for_handoff(self, requesting_agent: str, tiles: List) -> Optional[str]:
         """Find best drone to take over tiles from low-battery drone."""
-        best_drone = None
-        best_score = -1
-        
-        for drone_id, status in self.drone_status.items():
-            if drone_id == requesting_agent or not status.is_active:
-                continue
-            
-            # Score based on battery and workload
-            score = status.battery - (status.assigned_tiles * 0.5)
+        accept = None
+        if self.handoff_max_distance is not None and tiles:
+            points = [(t[0], t[1]) if isinstance(t, (list, tuple)) else (t["x"], t["y"]) for t in tiles]
+            cx = sum(p[0] for p in points) / len(points)
+            cy = sum(p[1] for p in points) / len(points)
             
-            if score > best_score and status.battery > 40:
-                best_score = score
-                best_drone = drone_id
+            def accept(drone_id: str) -> bool:
+                position = self.drone_status[drone_id].position
+                distance = abs(position.get("x", 0) - cx) + abs(position.get("y", 0) - cy)
+                return distance <= self.handoff_max_distance
         
-        return best_drone
+        return self.handoff_candidates.best(exclude=requesting_agent, accept=accept)
     
-    def _send_command(self, command_type: CommandType, target_agent: str, payload: dict):
-        """Send command to specific drone or broadcast."""
+    def _refresh_candidate(self, status: DroneStatus):
+        """Re-score a drone in the handoff index, or drop it if it cannot take tiles."""
+        # Score based on battery and workload; a score must beat -1 to be picked
+        score = status.battery - status.assigned_tiles * self.HANDOFF_WORKLOAD_WEIGHT
+        if status.is_active and status.battery > self.HANDOFF_MIN_BATTERY and score > -1:
+            self.handoff_candidates.update(status.agent_id, score)
+        else:
+            self.handoff_candidates.discard(status.agent_id)
+    
+    def _send_command(self, command_type: CommandType, target_agent: Optional[str], payload: dict,
+                      level: Optional[str] = None):
+        """
+        Queue a command for a drone (or all drones when target_agent is None).
+        Commands go out batched per drone at the end of the tick; `level` marks
+        an alert whose repeats are deduplicated (see CommandBatcher).
+        """
         command = GroundCommand(
             command_type=command_type.value,
             target_agent_id=target_agent,
             payload=payload
         )
-        
-        message = Message(
-            type="GROUND_COMMAND",
-            agent_id=self.agent_id,
-            timestamp=time.time(),
-            payload={
-                "command": command.to_dict(),
-                "target": target_agent
-            }
-        )
-        
-        self.send_message(message)
-        self.commands_sent.append(command)
-        self.stats["total_commands_sent"] += 1
+        self.commands.submit(target_agent, command, level)
     
-    async def tick(self, current_time: float, simulation_state: dict):
-        """Main coordination loop - runs every tick."""
-        # Update active drone count
-        self._update_drone_statuses(current_time)
-        
-        # Run strategic coordination periodically
-        if current_time - self.last_coordination_time >= self.COORDINATION_INTERVAL:
-            await self._coordinate_strategy(simulation_state)
-            self.last_coordination_time = current_time
-            self.stats["coordination_cycles"] += 1
+    def _flush_commands(self):
+        """Send each drone's pending commands as one GROUND_COMMAND message."""
+        for target_agent, commands in self.commands.flush(self.now):
+            message = Message(
+                type="GROUND_COMMAND",
+                agent_id=self.agent_id,
+                timestamp=time.time(),
+                payload={
+                    "commands": [command.to_dict() for command in commands],
+                    "target": target_agent
+                }
+            )
+            self.send_message(message)
+            self.stats["command_messages_sent"] += 1
+            for command in commands:
+                self.commands_sent.append(command)
+                self.stats["total_commands_sent"] += 1
+                self._count(self.command_counts, command.command_type, target_agent)
     
-    def _update_drone_statuses(self, current_time: float):
-        """Update drone status and check for timeouts."""
-        active_count = 0
-        total_coverage = set()
+    def apply_world_update(self, update: WorldUpdate):
+        """Fold one tick's world-state changes into coverage, drone status and targets."""
+        self.last_world_tick = update.tick
+        if update.visited:
+            self.coverage_map.update(update.visited)
+            self.visited_count = len(self.coverage_map)
+            self._update_coverage_percent()
         
-        for drone_id, status in self.drone_status.items():
-            # Check heartbeat timeout
-            if current_time - status.last_heartbeat > self.HEARTBEAT_TIMEOUT:
-                if status.is_active:
-                    status.is_active = False
-                    logger.warning("Ground Agent: Drone %s is no longer responding", drone_id)
-            else:
-                active_count += 1
+        for agent_id, changes in update.agent_changes.items():
+            self.world_agents.setdefault(agent_id, {}).update(changes)
+            status = self.drone_status.get(agent_id)
+            if status:
+                self._apply_world_fields(status, changes)
+                if changes.get("state") == "idle" and self._can_take_work(status):
+                    self.request_reallocation("idle")
         
-        self.stats["active_drones"] = active_count
+        for agent_id, target_pos in update.discoveries:
+            self._record_target(agent_id, tuple(target_pos))
     
-    async def _coordinate_strategy(self, simulation_state: dict):
-        """Strategic coordination logic - full command & control."""
+    def apply_visit_count(self, count: int):
+        """Tiles newly visited, counted only; regional coordinators keep the tiles themselves."""
+        self.visited_count += count
+        self._update_coverage_percent()
+    
+    def _update_coverage_percent(self):
+        grid_size = self.grid_size[0] * self.grid_size[1]
+        if grid_size > 0:
+            self.stats["coverage_percent"] = (self.visited_count / grid_size) * 100
+    
+    def _apply_world_fields(self, status: DroneStatus, changes: Dict[str, Any]):
+        for name in self.WORLD_FIELDS:
+            if name in changes:
+                setattr(status, name, changes[name])
+        self._refresh_candidate(status)
+    
+    def sync_from_state(self, simulation_state: dict):
+        """Rebuild coverage and drone status from a full get_full_state() dict."""
         agents = simulation_state.get("agents", [])
         grid = simulation_state.get("grid", {})
         
-        # Update coverage
         visited = grid.get("visited_tiles", [])
         self.coverage_map = {(t["x"], t["y"]) for t in visited}
+        self.visited_count = len(self.coverage_map)
+        self._update_coverage_percent()
         
-        grid_size = grid.get("width", self.grid_size[0]) * grid.get("height", self.grid_size[1])
-        if grid_size > 0:
-            self.stats["coverage_percent"] = (len(self.coverage_map) / grid_size) * 100
-        
-        # Update drone status from simulation state
         for agent in agents:
             agent_id = agent.get("agent_id")
+            self.world_agents[agent_id] = dict(agent)
             if agent_id in self.drone_status:
-                status = self.drone_status[agent_id]
-                status.assigned_tiles = agent.get("assigned_tiles", 0)
-                status.visited_tiles = agent.get("visited_tiles", 0)
-                status.state = agent.get("state", "idle")
+                self._apply_world_fields(self.drone_status[agent_id], agent)
+    
+    async def tick(self, current_time: float, simulation_state: Optional[dict] = None):
+        """
+        Main coordination loop - runs every tick. World state normally arrives
+        through apply_world_update(); pass simulation_state only when no feed
+        is connected, to resync from a full snapshot.
+        """
+        self.now = current_time
+        self.ticks += 1
+        if simulation_state is not None:
+            self.sync_from_state(simulation_state)
+        # Update active drone count
+        self._update_drone_statuses(current_time)
+        
+        # Run strategic coordination periodically
+        if current_time - self.last_coordination_time >= self.COORDINATION_INTERVAL:
+            await self._coordinate_strategy()
+            self.last_coordination_time = current_time
+            self.stats["coordination_cycles"] += 1
         
+        self._run_reallocation()
+        self._flush_commands()
+    
+    def _update_drone_statuses(self, current_time: float):
+        """Mark drones whose heartbeat deadline has passed as inactive."""
+        for drone_id in self.liveness.expire(current_time):
+            status = self.drone_status.get(drone_id)
+            if status and status.is_active:
+                status.is_active = False
+                self.handoff_candidates.discard(drone_id)
+                logger.warning("Ground Agent: Drone %s is no longer responding", drone_id)
+                self.commands.forget(drone_id)
+                self._emit_liveness(drone_id, False)
+        
+        self.stats["active_drones"] = self.liveness.live_count + sum(
+            summary.active_drones for summary in self.regions.values()
+        )
+    
+    async def _coordinate_strategy(self):
+        """Strategic coordination logic - full command & control."""
         # Strategic decisions
         await self._optimize_drone_deployment()
         await self._handle_idle_drones()
         await self._coordinate_low_battery_drones()
     
     async def _optimize_drone_deployment(self):
-        """Optimize drone positions and assignments."""
-        # Find underutilized drones and redirect
-        for drone_id, status in self.drone_status.items():
-            if not status.is_active:
-                continue
-            
-            # If drone has very few tiles and good battery, could reassign
-            if status.assigned_tiles < 5 and status.battery > 60:
-                # This drone could help others
-                pass
+        """Ask for a periodic rebalance; should_reallocate() decides whether it is worth it."""
+        self.request_reallocation("periodic")
     
     async def _handle_idle_drones(self):
         """Assign work to idle drones."""
         for drone_id, status in self.drone_status.items():
-            if status.state == "idle" and status.battery > 30 and status.is_active:
-                # Could assign new tiles or priority areas
+            if status.state == "idle" and self._can_take_work(status):
                 logger.info("Ground Agent: Detected idle drone %s with %.1f%% battery", 
                           drone_id, status.battery)
+                self.request_reallocation("idle")
     
     async def _coordinate_low_battery_drones(self):
         """Proactively coordinate low battery situations."""
@@ -361,6 +562,144 @@ class GroundAgent:
             logger.info("Ground Agent: Monitoring %d low-battery drones", 
                        len(low_battery_drones))
     
+    def apply_region_summaries(self, summaries: List[Any]):
+        """Take the latest RegionSummary from each regional coordinator."""
+        for summary in summaries:
+            self.regions[summary.region_id] = summary
+    
+    def _can_take_work(self, status: DroneStatus) -> bool:
+        return status.is_active and status.battery > self.IDLE_REALLOCATION_BATTERY
+    
+    def _on_liveness(self, event: LivenessEvent):
+        # A silent drone's remaining tiles have to go to someone else
+        if not event.alive and self.allocation.get(event.agent_id):
+            self.request_reallocation("lost")
+    
+    def request_reallocation(self, reason: str):
+        """Note a reason to re-plan zones; tick() acts on it once the cooldown has passed."""
+        if self.allocator is not None:
+            self.realloc_reasons.add(reason)
+    
+    def seed_allocation(self, allocation: Dict[str, List[tuple]]):
+        """The mission's initial tile assignment, the baseline the first reallocation moves from."""
+        self.allocation = {drone_id: set(tiles) for drone_id, tiles in allocation.items()}
+    
+    def _remaining_allocation(self) -> Dict[str, List[tuple]]:
+        return {
+            drone_id: [t for t in tiles if t not in self.coverage_map]
+            for drone_id, tiles in self.allocation.items()
+            if self.liveness.is_live(drone_id)
+        }
+    
+    def _fleet_snapshot(self) -> Tuple[Dict[str, tuple], Dict[str, float]]:
+        """Positions and batteries of live drones with enough charge to take tiles."""
+        positions, batteries = {}, {}
+        for drone_id, status in self.drone_status.items():
+            if status.is_active and status.battery >= self.LOW_BATTERY_THRESHOLD:
+                positions[drone_id] = (status.position.get("x", 0), status.position.get("y", 0))
+                batteries[drone_id] = status.battery
+        return positions, batteries
+    
+    def _run_reallocation(self):
+        """Collect a finished plan, or start one in the executor if a reason is pending."""
+        job = self._realloc_job
+        if job is not None:
+            if not job.done():
+                return
+            self._realloc_job = None
+            try:
+                self._apply_reallocation(job.result())
+            except Exception as e:
+                logger.error("Ground Agent: Zone reallocation failed: %s", e)
+            return
+        
+        ticks_since = self.ticks - self.last_realloc_tick
+        if not self.realloc_reasons or ticks_since < self.REALLOCATION_COOLDOWN_TICKS:
+            return
+        reasons, self.realloc_reasons = self.realloc_reasons, set()
+        positions, batteries = self._fleet_snapshot()
+        if not positions:
+            return
+        if not reasons & self.FORCED_REALLOCATION_REASONS and not self.allocator.should_reallocate(
+            self._remaining_allocation(), positions, batteries, ticks_since, self.REALLOCATION_MIN_TICKS
+        ):
+            return
+        
+        self.last_realloc_tick = self.ticks
+        self._realloc_job_reasons = sorted(reasons)
+        self._realloc_job = asyncio.get_running_loop().run_in_executor(
+            self.executor, self._plan_allocation, positions, batteries, set(self.coverage_map)
+        )
+    
+    def _plan_allocation(
+        self,
+        positions: Dict[str, tuple],
+        batteries: Dict[str, float],
+        covered: Set[tuple]
+    ) -> Dict[str, List[tuple]]:
+        """Runs in the executor: balanced zones over every tile not yet searched."""
+        unvisited = self._search_area() - covered
+        plan = self.allocator.allocate_zones_balanced(positions, unvisited, batteries)
+        leftover = set(self.allocator.last_unassigned)
+        if leftover:
+            # Beyond the fleet's battery range: still give each to its nearest drone
+            for drone_id, tiles in self.allocator.allocate_zones_voronoi(positions, leftover, batteries).items():
+                plan[drone_id].extend(tiles)
+        return plan
+    
+    def _search_area(self) -> Set[tuple]:
+        """Every tile this agent plans zones over."""
+        width, height = self.grid_size
+        return {(x, y) for x in range(width) for y in range(height)}
+    
+    def _zone_payload(self, zone: Set[tuple], reason: str) -> dict:
+        return {"tiles": [[x, y] for x, y in zone], "replace": True, "reason": reason}
+    
+    def _apply_reallocation(self, plan: Dict[str, List[tuple]]):
+        """
+        Send each drone whose remaining zone changed only the change: RELEASE_TILES
+        for tiles it loses, then ASSIGN_TILES for tiles it gains. The whole zone
+        goes as one replace instead when that is no larger, when the allocation
+        has no record of the drone, and on every ZONE_RESYNC_INTERVAL-th
+        reallocation, which also undoes tiles peers traded without the ground.
+        """
+        # Live drones left out of the plan (low battery) hand their tiles back
+        for drone_id in list(self.allocation):
+            if drone_id in plan:
+                continue
+            if self.liveness.is_live(drone_id):
+                plan[drone_id] = []
+            else:
+                del self.allocation[drone_id]
+        
+        reason = ",".join(self._realloc_job_reasons)
+        resync = (self.stats["reallocations"] + 1) % self.ZONE_RESYNC_INTERVAL == 0
+        moved = 0
+        for drone_id, tiles in plan.items():
+            zone = set(tiles)
+            known = drone_id in self.allocation
+            previous = {t for t in self.allocation.get(drone_id, ()) if t not in self.coverage_map}
+            self.allocation[drone_id] = zone
+            if known and zone == previous:
+                continue
+            added, removed = zone - previous, previous - zone
+            moved += len(added)
+            if resync or not known or len(added) + len(removed) >= len(zone):
+                self._send_command(CommandType.ASSIGN_TILES, drone_id, self._zone_payload(zone, reason))
+                continue
+            if removed:
+                self._send_command(
+                    CommandType.RELEASE_TILES, drone_id, {"tiles": [[x, y] for x, y in removed], "reason": reason}
+                )
+            if added:
+                self._send_command(
+                    CommandType.ASSIGN_TILES, drone_id, {"tiles": [[x, y] for x, y in added], "reason": reason}
+                )
+        
+        self.stats["reallocations"] += 1
+        self.stats["tiles_reassigned"] += moved
+        logger.info("Ground Agent: Reallocated zones (%s), %d tiles moved", reason, moved)
+    
     def update_drone_state(self, agent_id: str, agent_data: dict):
         """Update drone status from simulation."""
         if agent_id not in self.drone_status:
@@ -372,8 +711,10 @@ class GroundAgent:
                 assigned_tiles=agent_data.get("assigned_tiles", 0),
                 visited_tiles=agent_data.get("visited_tiles", 0),
                 targets_found=agent_data.get("targets_found", 0),
-                last_heartbeat=time.time()
+                last_heartbeat=self.now
             )
+            self.liveness.touch(agent_id, self.now)
+            self._refresh_candidate(self.drone_status[agent_id])
         else:
             status = self.drone_status[agent_id]
             status.position = agent_data.get("position", status.position)
@@ -382,3 +723,4 @@ class GroundAgent:
             status.assigned_tiles = agent_data.get("assigned_tiles", status.assigned_tiles)
             status.visited_tiles = agent_data.get("visited_tiles", status.visited_tiles)
             status.targets_found = agent_data.get("targets_found", status.targets_found)
+            self._refresh_candidate(status)
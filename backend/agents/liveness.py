@@ -0,0 +1,65 @@
+"""Heartbeat deadline tracking: a min-heap of per-drone deadlines on the simulation clock."""
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+
+@dataclass
+class LivenessEvent:
+    """A drone went silent (alive=False) or was heard from again (alive=True)."""
+    agent_id: str
+    alive: bool
+    time: float
+
+    def to_dict(self) -> dict:
+        return {"agent_id": self.agent_id, "alive": self.alive, "time": round(self.time, 2)}
+
+
+class DeadlineTracker:
+    """
+    Each live agent has a deadline `timeout` after its last heartbeat. touch()
+    pushes the new deadline and leaves the old heap entry in place; expire()
+    pops only entries whose deadline has passed, skipping stale ones, so a
+    tick costs O(expired + stale entries) rather than O(fleet).
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.deadlines: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    def touch(self, agent_id: str, now: float) -> bool:
+        """Record a heartbeat; True if the agent was not live before."""
+        was_live = agent_id in self.deadlines
+        deadline = now + self.timeout
+        self.deadlines[agent_id] = deadline
+        heapq.heappush(self._heap, (deadline, agent_id))
+        if len(self._heap) > 4 * len(self.deadlines) + 64:
+            self._compact()
+        return not was_live
+
+    def expire(self, now: float) -> List[str]:
+        """Agents whose deadline passed before now; they stop being live."""
+        expired = []
+        heap = self._heap
+        while heap and heap[0][0] < now:
+            deadline, agent_id = heapq.heappop(heap)
+            if self.deadlines.get(agent_id) == deadline:
+                del self.deadlines[agent_id]
+                expired.append(agent_id)
+        return expired
+
+    def discard(self, agent_id: str):
+        """Stop tracking an agent (its heap entries become stale)."""
+        self.deadlines.pop(agent_id, None)
+
+    def is_live(self, agent_id: str) -> bool:
+        return agent_id in self.deadlines
+
+    @property
+    def live_count(self) -> int:
+        return len(self.deadlines)
+
+    def _compact(self):
+        self._heap = [(deadline, agent_id) for agent_id, deadline in self.deadlines.items()]
+        heapq.heapify(self._heap)
@@ -0,0 +1,352 @@
+"""Regional coordinators: each owns the drones and tiles of one grid area; the ground agent sees summaries."""
+import logging
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from agents.command_batcher import CommandBatcher
+from agents.drone_agent import Message
+from agents.ground_agent import GroundAgent, CommandType
+from agents.world_state import WorldUpdate
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Region:
+    """A rectangle of tiles, [x0, x1) x [y0, y1)."""
+    region_id: str
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+
+    @property
+    def width(self) -> int:
+        return self.x1 - self.x0
+
+    @property
+    def height(self) -> int:
+        return self.y1 - self.y0
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return ((self.x0 + self.x1 - 1) / 2, (self.y0 + self.y1 - 1) / 2)
+
+    def tiles(self) -> Set[tuple]:
+        return {(x, y) for x in range(self.x0, self.x1) for y in range(self.y0, self.y1)}
+
+    def to_dict(self) -> dict:
+        return {"region_id": self.region_id, "x0": self.x0, "y0": self.y0, "x1": self.x1, "y1": self.y1}
+
+
+@dataclass
+class RegionSummary:
+    """What a regional coordinator reports upward instead of per-drone traffic."""
+    region_id: str
+    time: float
+    drones: int
+    active_drones: int
+    capable_drones: int  # active and above the low-battery threshold
+    mean_battery: float
+    unsearched_tiles: int
+    coverage_percent: float
+    idle_drones: List[Tuple[str, Tuple[int, int]]] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "region_id": self.region_id,
+            "time": round(self.time, 2),
+            "drones": self.drones,
+            "active_drones": self.active_drones,
+            "capable_drones": self.capable_drones,
+            "mean_battery": round(self.mean_battery, 1),
+            "unsearched_tiles": self.unsearched_tiles,
+            "coverage_percent": round(self.coverage_percent, 2),
+            "idle_drones": [drone_id for drone_id, _ in self.idle_drones]
+        }
+
+
+class RegionalCoordinator(GroundAgent):
+    """
+    A GroundAgent that only sees the drones currently inside its region and
+    only plans that region's tiles. Handoffs, battery alerts and reallocation
+    all scan the region's drones, so their cost follows region size.
+    A whole-zone reallocation replaces a drone's tiles only within the
+    region's bounds, leaving tiles other regions gave it alone. Commands go into the
+    hierarchy's shared batcher, which the ground agent flushes.
+    """
+
+    def __init__(
+        self,
+        region: Region,
+        send_message_callback: Callable[[Message], None],
+        allocator: Optional[Any] = None,
+        executor: Optional[Executor] = None,
+        commands: Optional[CommandBatcher] = None
+    ):
+        super().__init__(
+            region.region_id,
+            (region.width, region.height),
+            send_message_callback,
+            allocator=allocator,
+            executor=executor,
+            commands=commands
+        )
+        self.region = region
+
+    def _flush_commands(self):
+        # The batcher is shared, so one flush per tick (the ground agent's) sends every region's commands
+        pass
+
+    def _search_area(self) -> Set[tuple]:
+        return self.region.tiles()
+
+    @property
+    def bounds(self) -> List[int]:
+        return [self.region.x0, self.region.y0, self.region.x1, self.region.y1]
+
+    def _zone_payload(self, zone: Set[tuple], reason: str) -> dict:
+        payload = super()._zone_payload(zone, reason)
+        payload["within"] = self.bounds
+        return payload
+
+    def _release_region(self, drone_id: str, reason: str) -> bool:
+        """Take back everything a drone holds in this region; False if it held nothing here."""
+        if not self.allocation.pop(drone_id, None):
+            return False
+        self._send_command(CommandType.RELEASE_TILES, drone_id, {"within": self.bounds, "reason": reason})
+        return True
+
+    def _apply_reallocation(self, plan: Dict[str, List[tuple]]):
+        # Drones holding tiles here (seeded or lent) but reporting from another
+        # region give them up before the plan hands them to this region's drones
+        for drone_id in [d for d in self.allocation if d not in plan and not self.liveness.is_live(d)]:
+            self._release_region(drone_id, "replan")
+        super()._apply_reallocation(plan)
+
+    def release_drone(self, drone_id: str):
+        """
+        The drone flew into another region. With an allocator its tiles here
+        are released before the re-plan gives them to the region's drones, so
+        no tile has two owners; without one it keeps them.
+        """
+        self.drone_status.pop(drone_id, None)
+        self.liveness.discard(drone_id)
+        self.handoff_candidates.discard(drone_id)
+        # The batcher is shared: the drone's pending commands and alert levels stay with it
+        if self.allocator is not None and self._release_region(drone_id, "left_region"):
+            self.request_reallocation("lost")
+
+    def lend_tiles(self, drone_id: str):
+        """
+        Give a drone from another region the unsearched tiles here that no
+        drone holds (the region has no capable drone of its own). A drone lent
+        earlier that never arrived gives its share back first.
+        """
+        for borrower in [d for d in self.allocation if d not in self.drone_status and d != drone_id]:
+            self._release_region(borrower, "lend_expired")
+        owned = set().union(*self.allocation.values())
+        tiles = self._search_area() - self.coverage_map - owned
+        if tiles:
+            self._send_command(
+                CommandType.ASSIGN_TILES,
+                drone_id,
+                {"tiles": [[x, y] for x, y in tiles], "reason": "lend"}
+            )
+            self.allocation.setdefault(drone_id, set()).update(tiles)
+
+    def summary(self) -> RegionSummary:
+        active = capable = 0
+        battery_total = 0.0
+        idle = []
+        for drone_id, status in self.drone_status.items():
+            if not status.is_active:
+                continue
+            active += 1
+            battery_total += status.battery
+            if status.battery >= self.LOW_BATTERY_THRESHOLD:
+                capable += 1
+            if status.state == "idle" and self._can_take_work(status):
+                idle.append((drone_id, (status.position.get("x", 0), status.position.get("y", 0))))
+        return RegionSummary(
+            region_id=self.agent_id,
+            time=self.now,
+            drones=len(self.drone_status),
+            active_drones=active,
+            capable_drones=capable,
+            mean_battery=battery_total / active if active else 0.0,
+            unsearched_tiles=self.region.width * self.region.height - len(self.coverage_map),
+            coverage_percent=self.stats["coverage_percent"],
+            idle_drones=idle
+        )
+
+
+class RegionalHierarchy:
+    """
+    Splits the grid into regions_per_side x regions_per_side regions, each with
+    a RegionalCoordinator, under one global GroundAgent.
+
+    It stands in for the ground agent on the bus and the world feed: drone
+    traffic goes to the coordinator of the region the drone last reported a
+    position in, and per-drone world changes only to that coordinator. The
+    ground agent gets target reports, discoveries and a count of newly
+    visited tiles, and every SUMMARY_INTERVAL one RegionSummary per region,
+    so its cost does not grow with the fleet. A region with tiles left but no
+    drone able to search them is lent the nearest idle drone from another
+    region.
+
+    All coordinators queue commands in the ground agent's CommandBatcher, so
+    a drone hearing from several regions (e.g. after a lend) still gets at
+    most one GROUND_COMMAND per COMMAND_INTERVAL.
+    """
+
+    SUMMARY_INTERVAL = 1.0
+    LEND_TIMEOUT = 30.0  # Lend a starving region another drone if it is still empty after this
+
+    def __init__(
+        self,
+        ground: GroundAgent,
+        regions_per_side: int,
+        send_message_callback: Callable[[Message], None],
+        allocator_factory: Optional[Callable[[], Any]] = None,
+        executor: Optional[Executor] = None
+    ):
+        self.ground = ground
+        width, height = ground.grid_size
+        self.regions_per_side = regions_per_side
+        # Region index per column and per row, so routing a position is two lookups
+        self._col = [x * regions_per_side // width for x in range(width)]
+        self._row = [y * regions_per_side // height for y in range(height)]
+
+        def edge(index: int, size: int) -> int:
+            # First coordinate whose region index is `index`: ceil(index * size / regions)
+            return -(-index * size // regions_per_side)
+
+        self.coordinators: List[RegionalCoordinator] = []
+        for j in range(regions_per_side):
+            for i in range(regions_per_side):
+                region = Region(
+                    f"{ground.agent_id}-R{i}-{j}",
+                    edge(i, width), edge(j, height), edge(i + 1, width), edge(j + 1, height)
+                )
+                self.coordinators.append(RegionalCoordinator(
+                    region,
+                    send_message_callback,
+                    allocator=allocator_factory() if allocator_factory else None,
+                    executor=executor,
+                    commands=ground.commands
+                ))
+
+        self.by_id = {c.agent_id: c for c in self.coordinators}
+        self.membership: Dict[str, RegionalCoordinator] = {}
+        self.lent: Dict[str, Tuple[str, float]] = {}
+        self.last_summary_time = float("-inf")
+        self.stats = {"routed": 0, "to_ground": 0, "region_changes": 0, "drones_lent": 0}
+
+        logger.info("Regional hierarchy: %d regions over %dx%d grid",
+                    len(self.coordinators), width, height)
+
+    def region_for(self, x: int, y: int) -> RegionalCoordinator:
+        x = min(max(x, 0), len(self._col) - 1)
+        y = min(max(y, 0), len(self._row) - 1)
+        return self.coordinators[self._row[y] * self.regions_per_side + self._col[x]]
+
+    def receive_message(self, message: Message):
+        """Route one drone message to its region (or to the ground agent)."""
+        position = message.payload.get("position")
+        if message.type == "HEARTBEAT" and position:
+            coordinator = self.region_for(position.get("x", 0), position.get("y", 0))
+            previous = self.membership.get(message.agent_id)
+            if previous is not coordinator:
+                if previous is not None:
+                    previous.release_drone(message.agent_id)
+                    self.stats["region_changes"] += 1
+                self.membership[message.agent_id] = coordinator
+        elif message.type == "TARGET_FOUND":
+            coordinator = None
+        else:
+            coordinator = self.membership.get(message.agent_id)
+            if coordinator is None and position:
+                coordinator = self.region_for(position.get("x", 0), position.get("y", 0))
+
+        if coordinator is None:
+            self.stats["to_ground"] += 1
+            self.ground.receive_message(message)
+        else:
+            self.stats["routed"] += 1
+            coordinator.receive_message(message)
+
+    def apply_world_update(self, update: WorldUpdate):
+        """Give each region its own tiles and drones' changes; the ground agent gets discoveries and a visit count."""
+        per_region: Dict[str, WorldUpdate] = {}
+
+        def region_update(coordinator: RegionalCoordinator) -> WorldUpdate:
+            if coordinator.agent_id not in per_region:
+                per_region[coordinator.agent_id] = WorldUpdate(update.tick, update.time)
+            return per_region[coordinator.agent_id]
+
+        for tile in update.visited:
+            region_update(self.region_for(*tile)).visited.append(tile)
+        for agent_id, changes in update.agent_changes.items():
+            coordinator = self.membership.get(agent_id)
+            if coordinator is not None:
+                region_update(coordinator).agent_changes[agent_id] = changes
+
+        for coordinator in self.coordinators:
+            coordinator.last_world_tick = update.tick
+            if coordinator.agent_id in per_region:
+                coordinator.apply_world_update(per_region[coordinator.agent_id])
+        if update.discoveries:
+            self.ground.apply_world_update(WorldUpdate(update.tick, update.time, discoveries=update.discoveries))
+        else:
+            self.ground.last_world_tick = update.tick
+        if update.visited:
+            self.ground.apply_visit_count(len(update.visited))
+
+    def seed_allocation(self, allocation: Dict[str, List[tuple]]):
+        """Split the initial per-drone tiles into each region's share."""
+        per_region: Dict[str, Dict[str, List[tuple]]] = {}
+        for drone_id, tiles in allocation.items():
+            for tile in tiles:
+                region_id = self.region_for(*tile).agent_id
+                per_region.setdefault(region_id, {}).setdefault(drone_id, []).append(tile)
+        for coordinator in self.coordinators:
+            coordinator.seed_allocation(per_region.get(coordinator.agent_id, {}))
+
+    async def tick(self, current_time: float):
+        for coordinator in self.coordinators:
+            await coordinator.tick(current_time)
+
+        if current_time - self.last_summary_time >= self.SUMMARY_INTERVAL:
+            summaries = [coordinator.summary() for coordinator in self.coordinators]
+            self.ground.apply_region_summaries(summaries)
+            self._lend_drones(summaries, current_time)
+            self.last_summary_time = current_time
+
+        await self.ground.tick(current_time)
+
+    def _lend_drones(self, summaries: List[RegionSummary], current_time: float):
+        """Send the nearest idle drone to each region that has tiles left and nobody to search them."""
+        idle = [drone for summary in summaries for drone in summary.idle_drones]
+        for summary in summaries:
+            if summary.capable_drones or not summary.unsearched_tiles or not idle:
+                continue
+            lent = self.lent.get(summary.region_id)
+            if lent and current_time - lent[1] < self.LEND_TIMEOUT:
+                continue
+
+            coordinator = self.by_id[summary.region_id]
+            cx, cy = coordinator.region.center
+            drone_id, _ = min(idle, key=lambda d: abs(d[1][0] - cx) + abs(d[1][1] - cy))
+            idle = [d for d in idle if d[0] != drone_id]
+            coordinator.lend_tiles(drone_id)
+            self.lent[summary.region_id] = (drone_id, current_time)
+            self.stats["drones_lent"] += 1
+            logger.info("Regional hierarchy: Lent %s to empty region %s", drone_id, summary.region_id)
+
+    def get_state(self) -> dict:
+        return {
+            "regions": [c.region.to_dict() for c in self.coordinators],
+            "stats": self.stats
+        }
@@ -0,0 +1,39 @@
+"""Typed incremental world-state updates, published by the environment once per tick."""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+
+@dataclass
+class WorldUpdate:
+    """
+    What changed during one tick: tiles newly visited, the agent fields whose
+    values changed (only those fields, keyed by agent id), and targets
+    discovered for the first time as (agent_id, tile). Applying every update
+    in order reproduces the full state without ever re-reading it.
+
+    tick_ms is the wall time from the start of the tick to this update, and
+    inference_ms the detection calls drones made during it.
+    """
+    tick: int
+    time: float
+    visited: List[Tuple[int, int]] = field(default_factory=list)
+    agent_changes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    discoveries: List[Tuple[str, Tuple[int, int]]] = field(default_factory=list)
+    tick_ms: float = 0.0
+    inference_ms: List[float] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.visited or self.agent_changes or self.discoveries)
+
+    def to_dict(self) -> dict:
+        return {
+            "tick": self.tick,
+            "time": round(self.time, 2),
+            "tick_ms": round(self.tick_ms, 3),
+            "visited": [{"x": t[0], "y": t[1]} for t in self.visited],
+            "agent_changes": self.agent_changes,
+            "discoveries": [
+                {"agent_id": agent_id, "x": t[0], "y": t[1]} for agent_id, t in self.discoveries
+            ]
+        }
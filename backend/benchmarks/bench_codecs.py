@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Bus codec benchmark: round-trip check, encoded size and encode/decode throughput. Usage: bench_codecs.py [--tiles 10 100 1000]."""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.drone_agent import Message
+from comms.codec import CODECS, CodecRegistry, get_codec
+
+
+def sample_messages(n_tiles: int) -> dict:
+    """One message of each type, shaped like the ones agents send."""
+    tiles = [(i % 50, i // 50) for i in range(n_tiles)]
+    tile_dicts = [{"x": x, "y": y} for x, y in tiles]
+
+    def make(msg_type, payload, agent_id="DRONE-01"):
+        return Message(type=msg_type, agent_id=agent_id, timestamp=time.time(), payload=payload).to_dict()
+
+    return {
+        "HEARTBEAT": make("HEARTBEAT", {"position": {"x": 3, "y": 4}, "battery": 87.5}),
+        "TARGET_FOUND": make("TARGET_FOUND", {
+            "position": {"x": 3, "y": 4}, "detection_method": "cnn", "confidence": 0.91, "detections": []
+        }),
+        "OFFER_TILE": make("OFFER_TILE", {"tiles": tile_dicts}),
+        "ACCEPT_OFFER": make("ACCEPT_OFFER", {"original_message_id": "abc", "accepted_tiles": tile_dicts}),
+        "HANDOFF_REQUEST": make("HANDOFF_REQUEST", {
+            "tiles": tiles, "position": {"x": 3, "y": 4}, "battery": 18.0
+        }),
+        "ACCEPT_HANDOFF": make("ACCEPT_HANDOFF", {"from_agent": "DRONE-02", "accepted_tiles": tiles}),
+        "GROUND_COMMAND": make("GROUND_COMMAND", {
+            "commands": [
+                {"command_type": "BATTERY_WARNING", "payload": {"level": "low", "battery": 18.0}},
+                {"command_type": "ASSIGN_TILES", "payload": {"tiles": tiles, "replace": True, "reason": "idle"}}
+            ],
+            "target": "DRONE-02"
+        }, agent_id="GROUND"),
+    }
+
+
+def check_round_trip(codec, registry, messages: dict):
+    """Decoded messages must equal what JSON would deliver (tuples become lists)."""
+    for msg_type, message in messages.items():
+        expected = json.loads(json.dumps(message))
+        actual = registry.decode(registry.encode(codec, message))
+        if actual != expected:
+            raise AssertionError(f"{codec.name}: {msg_type} did not round-trip")
+
+
+def throughput(codec, registry, message: dict, seconds: float):
+    frame = registry.encode(codec, message)
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        registry.encode(codec, message)
+        count += 1
+    encode_rate = count / (time.perf_counter() - start)
+
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        registry.decode(frame)
+        count += 1
+    decode_rate = count / (time.perf_counter() - start)
+    return len(frame), encode_rate, decode_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bus message codecs")
+    parser.add_argument('--tiles', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--seconds', type=float, default=0.2, help='Time per measurement')
+    args = parser.parse_args()
+
+    codecs = []
+    for name in CODECS:
+        try:
+            codecs.append(get_codec(name))
+        except ImportError as e:
+            print(f"Skipping {name}: {e}")
+
+    registry = CodecRegistry()
+    for codec in codecs:
+        for n_tiles in args.tiles:
+            check_round_trip(codec, registry, sample_messages(n_tiles))
+    print(f"Round-trip OK for {', '.join(c.name for c in codecs)}\n")
+
+    print(f"{'message':<16} {'tiles':>5} {'codec':<8} {'bytes':>7} {'encode/s':>10} {'decode/s':>10}")
+    for n_tiles in args.tiles:
+        messages = sample_messages(n_tiles)
+        for msg_type in ("HEARTBEAT", "OFFER_TILE", "HANDOFF_REQUEST"):
+            for codec in codecs:
+                size, enc, dec = throughput(codec, registry, messages[msg_type], args.seconds)
+                print(f"{msg_type:<16} {n_tiles:>5} {codec.name:<8} {size:>7} {enc:>10.0f} {dec:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Duplicate-delivery check and dedup overhead. Usage: bench_dedup.py [--transport local zmq] [--messages 20000].
+
+For every message type, delivers a message and then a replay with the same
+message_id to a live drone (or the ground handler) and checks the receiver
+handled it once and its tiles did not change again. Then measures dispatch
+cost with dedup on and off, and cache size after many unique ids.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import zmq.asyncio
+
+from agents.drone_agent import Message, Position
+from comms.message_bus import MessageBus
+from sim.environment import SimulationEnvironment, SimulationConfig
+
+TILES = [(5, 5), (5, 6), (6, 5)]
+
+
+def make(msg_type: str, payload: dict, agent_id: str = "DRONE-01") -> Message:
+    return Message(type=msg_type, agent_id=agent_id, timestamp=time.time(), payload=payload)
+
+
+def scenarios() -> dict:
+    """Per type: the message to replay, and tiles the receiver is re-given between deliveries."""
+    tile_dicts = [{"x": x, "y": y} for x, y in TILES]
+    return {
+        "OFFER_TILE": (make("OFFER_TILE", {"tiles": tile_dicts}), []),
+        "ACCEPT_OFFER": (make("ACCEPT_OFFER", {"original_message_id": "m1", "accepted_tiles": tile_dicts}), TILES),
+        "HANDOFF_REQUEST": (make("HANDOFF_REQUEST", {"tiles": TILES, "battery": 15.0}), []),
+        "ACCEPT_HANDOFF": (make("ACCEPT_HANDOFF", {"from_agent": "DRONE-02", "accepted_tiles": TILES}), TILES),
+        "HEARTBEAT": (make("HEARTBEAT", {"position": {"x": 1, "y": 1}, "battery": 90.0}), []),
+        "TARGET_FOUND": (make("TARGET_FOUND", {"position": {"x": 1, "y": 1}}), []),
+        "GROUND_COMMAND": (make("GROUND_COMMAND", {"command": {"command_type": "RETURN_TO_BASE"},
+                                                   "target": "DRONE-02"}, agent_id="GROUND"), []),
+    }
+
+
+async def settle():
+    await asyncio.sleep(0.05)
+
+
+async def check_type(transport: str, msg_type: str, message: Message, regiven: list, dedup: bool) -> dict:
+    context = zmq.asyncio.Context()
+    bus = MessageBus(context, transport=transport, dedup_capacity=4096 if dedup else 0)
+    await bus.start(f"inproc://dedup-{transport}-{msg_type}-{dedup}")
+    env = SimulationEnvironment(SimulationConfig(grid_width=10, grid_height=10), bus)
+    receiver = env._create_agent("DRONE-02", Position(5, 5))
+    receiver.assign_tiles(TILES)
+    env.agents[receiver.agent_id] = receiver
+
+    handled = []
+    ground_seen = []
+    drone_handler = bus.handlers["DRONE-02"]
+    bus.register_handler("DRONE-02", lambda m: (handled.append(1), drone_handler(m)),
+                         bus.subscriptions["DRONE-02"])
+    bus.register_handler("GROUND", lambda m: ground_seen.append(1),
+                         ["HEARTBEAT", "TARGET_FOUND"])
+    await asyncio.sleep(0.1)
+
+    await bus.publish(message)
+    await settle()
+    await receiver._process_inbox()
+    replies_first = len(env.outbound.queue)
+    receiver.assign_tiles(regiven)
+    tiles_before_replay = set(receiver.assigned_tiles)
+
+    await bus.publish(message)
+    await settle()
+    await receiver._process_inbox()
+
+    result = {
+        "deliveries": len(handled) + len(ground_seen),
+        "replies": len(env.outbound.queue) - replies_first,
+        "tiles_changed": receiver.assigned_tiles != tiles_before_replay,
+    }
+    await bus.stop()
+    context.term()
+    return result
+
+
+async def dispatch_cost(transport: str, n: int, dedup: bool) -> float:
+    context = zmq.asyncio.Context()
+    bus = MessageBus(context, transport=transport, dedup_capacity=4096 if dedup else 0)
+    await bus.start(f"inproc://dedup-cost-{transport}-{dedup}")
+    for i in range(8):
+        bus.register_handler(f"DRONE-{i:02d}", lambda m: None)
+    messages = [make("HEARTBEAT", {"battery": 50.0}, agent_id="SRC") for _ in range(n)]
+    start = time.perf_counter()
+    for message in messages:
+        bus._dispatch(message)
+    elapsed = time.perf_counter() - start
+    size = bus.get_stats().get("dedup", {}).get("size", 0)
+    await bus.stop()
+    context.term()
+    return elapsed / n * 1e6, size
+
+
+async def main(args):
+    logging.disable(logging.WARNING)
+    failures = 0
+    print(f"{'transport':<9} {'type':<16} {'dedup':<5} {'deliv':>5} {'replies':>7} {'tiles':>6}  ok")
+    for transport in args.transport:
+        for msg_type, (message, regiven) in scenarios().items():
+            for dedup in (False, True):
+                r = await check_type(transport, msg_type, message, regiven, dedup)
+                ok = r["deliveries"] == 1 and r["replies"] == 0 and not r["tiles_changed"]
+                if dedup and not ok:
+                    failures += 1
+                print(f"{transport:<9} {msg_type:<16} {'on' if dedup else 'off':<5} {r['deliveries']:>5} "
+                      f"{r['replies']:>7} {'moved' if r['tiles_changed'] else '-':>6}  {'yes' if ok else 'NO'}")
+
+    print(f"\n{'transport':<9} {'dedup':<5} {'us/msg':>8} {'cache ids':>10}")
+    for transport in args.transport:
+        for dedup in (False, True):
+            cost, size = await dispatch_cost(transport, args.messages, dedup)
+            print(f"{transport:<9} {'on' if dedup else 'off':<5} {cost:>8.2f} {size:>10}")
+
+    if failures:
+        print(f"\n{failures} duplicate deliveries got through with dedup on")
+        sys.exit(1)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check duplicate suppression on the message bus")
+    parser.add_argument('--transport', nargs='+', default=["local", "zmq"], choices=["local", "zmq"])
+    parser.add_argument('--messages', type=int, default=20000,
+                        help='Unique messages for the overhead/memory run')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
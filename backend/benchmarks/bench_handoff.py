@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Handoff candidate selection, indexed vs linear scan. Usage: bench_handoff.py [--drones 100 1000 5000] [--requests 2000].
+
+Builds a GroundAgent from synthetic heartbeats, then runs a handoff storm:
+each request is preceded by a batch of heartbeats that move batteries and
+workloads around. Every pick from the candidate index is checked against a
+linear scan of drone_status (with and without a distance limit), and the
+time per pick is reported for both.
+"""
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.drone_agent import Message
+from agents.ground_agent import GroundAgent
+
+
+def linear_pick(ground: GroundAgent, requesting_agent: str, tiles: list, max_distance=None):
+    """The selection as a scan over every drone, for reference."""
+    cx = sum(t[0] for t in tiles) / len(tiles)
+    cy = sum(t[1] for t in tiles) / len(tiles)
+    best_drone, best_score = None, -1
+    for drone_id, status in ground.drone_status.items():
+        if drone_id == requesting_agent or not status.is_active:
+            continue
+        if max_distance is not None:
+            if abs(status.position["x"] - cx) + abs(status.position["y"] - cy) > max_distance:
+                continue
+        score = status.battery - status.assigned_tiles * ground.HANDOFF_WORKLOAD_WEIGHT
+        if score > best_score and status.battery > ground.HANDOFF_MIN_BATTERY:
+            best_score, best_drone = score, drone_id
+    return best_drone
+
+
+def heartbeat(rng: random.Random, drone_id: str, grid: int) -> Message:
+    return Message(type="HEARTBEAT", agent_id=drone_id, timestamp=0.0, payload={
+        "position": {"x": rng.randrange(grid), "y": rng.randrange(grid)},
+        "battery": rng.uniform(25, 100)
+    })
+
+
+def run(n: int, args, max_distance) -> dict:
+    rng = random.Random(args.seed)
+    ground = GroundAgent("GROUND", (args.grid, args.grid), lambda m: None,
+                         handoff_max_distance=max_distance)
+    drone_ids = [f"DRONE-{i:04d}" for i in range(n)]
+    for drone_id in drone_ids:
+        ground.receive_message(heartbeat(rng, drone_id, args.grid))
+        ground.update_drone_state(drone_id, {"assigned_tiles": rng.randrange(60)})
+
+    mismatches = 0
+    indexed = linear = 0.0
+    for _ in range(args.requests):
+        for drone_id in rng.sample(drone_ids, min(args.updates, n)):
+            ground.receive_message(heartbeat(rng, drone_id, args.grid))
+        requester = rng.choice(drone_ids)
+        tiles = [(rng.randrange(args.grid), rng.randrange(args.grid)) for _ in range(4)]
+
+        start = time.perf_counter()
+        picked = ground._find_best_drone_for_handoff(requester, tiles)
+        indexed += time.perf_counter() - start
+        start = time.perf_counter()
+        expected = linear_pick(ground, requester, tiles, max_distance)
+        linear += time.perf_counter() - start
+        mismatches += picked != expected
+
+    return {
+        "indexed_us": indexed / args.requests * 1e6,
+        "linear_us": linear / args.requests * 1e6,
+        "mismatches": mismatches
+    }
+
+
+def main(args):
+    logging.disable(logging.CRITICAL)
+    failures = 0
+    print(f"{'drones':>6} {'max dist':>8} {'indexed us':>10} {'linear us':>10} {'mismatch':>8}")
+    for n in args.drones:
+        for max_distance in (None, args.max_distance):
+            r = run(n, args, max_distance)
+            failures += r["mismatches"]
+            print(f"{n:>6} {str(max_distance):>8} {r['indexed_us']:>10.2f} {r['linear_us']:>10.2f} "
+                  f"{r['mismatches']:>8}")
+    if failures:
+        print(f"\n{failures} picks differ from the linear scan")
+        sys.exit(1)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare indexed and linear handoff candidate selection")
+    parser.add_argument('--drones', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--updates', type=int, default=5, help='Heartbeats between handoff requests')
+    parser.add_argument('--grid', type=int, default=100)
+    parser.add_argument('--max-distance', type=float, default=30.0)
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Warm- vs cold-started K-means reallocation. Usage: bench_kmeans_warm.py [--sizes 50 100 200] [--drones 8] [--steps 20].
+
+Replays a mission: every step each drone scans the tiles of its zone nearest
+to it and moves onto the last one, then the fleet is reallocated. Each step
+is allocated three ways on the same state: ZoneAllocator.allocate_zones_kmeans
+(fits from drone positions every call), KMeansZoneAllocator reset before each
+fit (cold) and KMeansZoneAllocator keeping its centroids (warm). Reports mean
+fit time and K-means iterations per reallocation; --output appends one JSON
+line per case.
+"""
+import argparse
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim.kmeans_allocator import KMeansZoneAllocator
+from sim.zone_allocator import ZoneAllocator
+
+MODES = ("stateless", "cold", "warm")
+
+
+def nearest(tiles: list, position: tuple, n: int) -> list:
+    return sorted(tiles, key=lambda t: abs(t[0] - position[0]) + abs(t[1] - position[1]))[:n]
+
+
+def run_case(grid_size: int, num_drones: int, steps: int, scans: int, seed: int, max_iter: int) -> dict:
+    rng = random.Random(seed)
+    positions = {
+        f"DRONE-{i+1:02d}": (rng.randrange(grid_size), rng.randrange(grid_size)) for i in range(num_drones)
+    }
+    batteries = {drone_id: 100.0 for drone_id in positions}
+    unvisited = {(x, y) for x in range(grid_size) for y in range(grid_size)}
+
+    stateless = ZoneAllocator(grid_size, grid_size)
+    cold = KMeansZoneAllocator(grid_size, grid_size, max_iter=max_iter, random_state=seed)
+    warm = KMeansZoneAllocator(grid_size, grid_size, max_iter=max_iter, random_state=seed)
+    times = {mode: [] for mode in MODES}
+    iterations = {"cold": [], "warm": []}
+
+    for _ in range(steps):
+        if not unvisited:
+            break
+        start = time.perf_counter()
+        stateless.allocate_zones_kmeans(positions, unvisited, batteries)
+        times["stateless"].append(time.perf_counter() - start)
+
+        for mode, allocator in (("cold", cold), ("warm", warm)):
+            if mode == "cold":
+                allocator.reset()
+            before = allocator.stats["iterations"]
+            start = time.perf_counter()
+            allocation = allocator.allocate(positions, unvisited, batteries)
+            times[mode].append(time.perf_counter() - start)
+            iterations[mode].append(allocator.stats["iterations"] - before)
+
+        # The mission follows the warm plan
+        for drone_id, tiles in allocation.items():
+            scanned = nearest(tiles, positions[drone_id], scans)
+            unvisited.difference_update(scanned)
+            if scanned:
+                positions[drone_id] = scanned[-1]
+
+    result = {f"{mode}_ms": round(statistics.mean(times[mode]) * 1000, 3) for mode in MODES}
+    result.update({f"{mode}_iterations": round(statistics.mean(iterations[mode]), 2) for mode in iterations})
+    result["reallocations"] = len(times["warm"])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark warm-started K-means reallocation")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 200])
+    parser.add_argument('--drones', type=int, nargs='+', default=[8])
+    parser.add_argument('--steps', type=int, default=20)
+    parser.add_argument('--scans', type=int, default=10, help='Tiles each drone scans between reallocations')
+    parser.add_argument('--max-iter', type=int, default=100,
+                        help='K-means iteration cap, high enough that cold fits converge')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=Path, help='Append one JSON line per case to this file')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'grid':>9} {'drones':>6} {'stateless ms':>13} {'cold ms':>8} {'warm ms':>8} "
+          f"{'cold iter':>9} {'warm iter':>9}")
+    records = []
+    for grid_size in args.sizes:
+        for num_drones in args.drones:
+            result = run_case(grid_size, num_drones, args.steps, args.scans, args.seed, args.max_iter)
+            records.append(dict(
+                grid_size=grid_size, num_drones=num_drones, steps=args.steps, scans=args.scans,
+                max_iter=args.max_iter, seed=args.seed, timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"),
+                **result
+            ))
+            print(
+                f"{grid_size:>4}x{grid_size:<4} {num_drones:>6} {result['stateless_ms']:>13.2f} "
+                f"{result['cold_ms']:>8.2f} {result['warm_ms']:>8.2f} "
+                f"{result['cold_iterations']:>9.2f} {result['warm_iterations']:>9.2f}"
+            )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'a') as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        print(f"\nSaved {len(records)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Metrics history cost vs run length. Usage: bench_metrics_history.py [--ticks 1000 10000 100000] [--points 200].
+
+Feeds MetricsTracker one WorldUpdate per simulated tick and reports, per run length, the
+cost of an update, of a full-history request and of a "last 10 minutes"
+request, with the memory held by the history buffers.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import sim.metrics
+from agents.world_state import WorldUpdate
+from sim.metrics import MetricsTracker
+
+
+class TickClock:
+    """Stands in for the time module inside sim.metrics: each tick is tick_interval seconds (from 1, never 0)."""
+
+    def __init__(self, tick_interval: float):
+        self.tick_interval = tick_interval
+        self.tick = 0
+
+    def time(self) -> float:
+        return (self.tick + 1) * self.tick_interval
+
+
+def history_bytes(tracker: MetricsTracker) -> int:
+    return sum(
+        level.times.nbytes + level.counts.nbytes + level.mins.nbytes + level.maxs.nbytes + level.sums.nbytes
+        for level in tracker.history.levels
+    )
+
+
+def run(ticks: int, args) -> dict:
+    clock = TickClock(args.tick_interval)
+    sim.metrics.time = clock
+    tracker = MetricsTracker(total_targets=10, total_tiles=10000, total_agents=args.agents)
+    tracker.start()
+    agent_ids = [f"DRONE-{i:03d}" for i in range(args.agents)]
+    start = time.perf_counter()
+    for tick in range(ticks):
+        clock.tick = tick
+        battery = 100.0 - (tick % 1000) * 0.05
+        changes = {agent_id: {"battery": battery, "state": "searching"} for agent_id in agent_ids}
+        discoveries = [(agent_ids[0], (0, 0))] if tick % 1000 == 999 else []
+        for _ in range(3):
+            tracker.record_message("HEARTBEAT")
+        tracker.apply_world_update(WorldUpdate(tick, clock.time(), [(tick % 100, 0)], changes, discoveries))
+    update_us = (time.perf_counter() - start) / ticks * 1e6
+
+    timings = {}
+    for name, since in (("full", None), ("last_10min", 600.0)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            rows = tracker.get_history(since=since, points=args.points)
+        timings[name] = ((time.perf_counter() - start) / args.repeat * 1e3, len(rows))
+    return {"update_us": update_us, "timings": timings, "bytes": history_bytes(tracker)}
+
+
+def main(args):
+    print(f"{'ticks':>8} {'update us':>9} {'full ms':>8} {'rows':>5} {'10min ms':>8} {'rows':>5} {'history KB':>10}")
+    for ticks in args.ticks:
+        r = run(ticks, args)
+        full, recent = r["timings"]["full"], r["timings"]["last_10min"]
+        print(f"{ticks:>8} {r['update_us']:>9.2f} {full[0]:>8.2f} {full[1]:>5} {recent[0]:>8.2f} {recent[1]:>5} "
+              f"{r['bytes'] / 1024:>10.0f}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure metrics history cost as runs get longer")
+    parser.add_argument('--ticks', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--points', type=int, default=200)
+    parser.add_argument('--agents', type=int, default=8)
+    parser.add_argument('--tick-interval', type=float, default=0.5, help='Simulated seconds per tick')
+    parser.add_argument('--repeat', type=int, default=20)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Quantile sketch accuracy, size and cost. Usage: bench_quantiles.py [--samples 1000000] [--runs 4].
+
+Streams samples from latency-like distributions into one QuantileSketch and
+into `runs` separate sketches merged afterwards (as sketches from separate
+runs would be), and reports the relative error of p50/p90/p99/p999 against
+the exact quantiles, the bucket count and the cost per add.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim.quantiles import QuantileSketch
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+DISTRIBUTIONS = {
+    "lognormal": lambda rng: rng.lognormvariate(0.0, 1.5),
+    "exponential": lambda rng: rng.expovariate(1 / 5.0),
+    "bimodal": lambda rng: rng.gauss(2.0, 0.2) if rng.random() < 0.95 else rng.gauss(80.0, 10.0),
+}
+
+
+def run(name: str, args) -> dict:
+    rng = random.Random(args.seed)
+    values = [max(0.0, DISTRIBUTIONS[name](rng)) for _ in range(args.samples)]
+
+    sketch = QuantileSketch(args.accuracy, args.max_bins)
+    start = time.perf_counter()
+    for value in values:
+        sketch.add(value)
+    add_ns = (time.perf_counter() - start) / len(values) * 1e9
+
+    merged = QuantileSketch(args.accuracy, args.max_bins)
+    chunk = len(values) // args.runs + 1
+    for i in range(args.runs):
+        part = QuantileSketch(args.accuracy, args.max_bins)
+        for value in values[i * chunk:(i + 1) * chunk]:
+            part.add(value)
+        merged.merge(QuantileSketch.from_state(part.to_state()))
+
+    exact = np.quantile(values, QUANTILES)
+    return {
+        "add_ns": add_ns,
+        "bins": len(sketch.bins),
+        "error": [abs(sketch.quantile(q) / e - 1) for q, e in zip(QUANTILES, exact)],
+        "merged_error": [abs(merged.quantile(q) / e - 1) for q, e in zip(QUANTILES, exact)]
+    }
+
+
+def main(args):
+    labels = " ".join(f"{'p' + format(q * 100, 'g'):>6}" for q in QUANTILES)
+    print(f"{'distribution':<12} {'sketch':<7} {labels} {'bins':>5} {'ns/add':>7}")
+    worst = 0.0
+    for name in DISTRIBUTIONS:
+        r = run(name, args)
+        for label, errors in (("single", r["error"]), ("merged", r["merged_error"])):
+            worst = max(worst, *errors)
+            cells = " ".join(f"{e * 100:>5.2f}%" for e in errors)
+            print(f"{name:<12} {label:<7} {cells} {r['bins']:>5} {r['add_ns']:>7.0f}")
+    print(f"\nworst relative error {worst * 100:.2f}% (bound {args.accuracy * 100:.2f}%)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure quantile sketch accuracy against exact quantiles")
+    parser.add_argument('--samples', type=int, default=1000000)
+    parser.add_argument('--runs', type=int, default=4, help='Sketches merged into one')
+    parser.add_argument('--accuracy', type=float, default=0.01, help='Relative accuracy')
+    parser.add_argument('--max-bins', type=int, default=1024)
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
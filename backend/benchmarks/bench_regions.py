@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Ground coordination cost, one GroundAgent vs regional coordinators. Usage: bench_regions.py [--drones 500 1000 2000] [--regions 5].
+
+Feeds synthetic heartbeats from drones spread over the grid, then handoff
+requests, to a flat GroundAgent and to a RegionalHierarchy, and reports the
+cost per heartbeat, per handoff (candidate scan) and of one full zone plan
+(the flat agent plans the whole grid, the hierarchy every region in turn).
+"""
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.drone_agent import Message
+from agents.ground_agent import GroundAgent
+from agents.regional import RegionalHierarchy
+from sim.zone_allocator import ZoneAllocator
+
+
+def heartbeat(drone_id: str, x: int, y: int, battery: float) -> Message:
+    return Message(type="HEARTBEAT", agent_id=drone_id, timestamp=0.0,
+                   payload={"position": {"x": x, "y": y}, "battery": battery})
+
+
+def handoff(drone_id: str) -> Message:
+    return Message(type="HANDOFF_REQUEST", agent_id=drone_id, timestamp=0.0,
+                   payload={"tiles": [[0, 0], [0, 1]], "battery": 18.0})
+
+
+def measure(control, planners, drones, grid: int, handoffs: int) -> dict:
+    start = time.perf_counter()
+    for drone_id, x, y, battery in drones:
+        control.receive_message(heartbeat(drone_id, x, y, battery))
+    heartbeat_us = (time.perf_counter() - start) / len(drones) * 1e6
+
+    requesters = random.Random(1).sample([d[0] for d in drones], min(handoffs, len(drones)))
+    start = time.perf_counter()
+    for drone_id in requesters:
+        control.receive_message(handoff(drone_id))
+    handoff_us = (time.perf_counter() - start) / len(requesters) * 1e6
+
+    start = time.perf_counter()
+    for planner in planners:
+        positions, batteries = planner._fleet_snapshot()
+        if positions:
+            planner._plan_allocation(positions, batteries, set())
+    plan_ms = (time.perf_counter() - start) * 1e3
+    return {"heartbeat_us": heartbeat_us, "handoff_us": handoff_us, "plan_ms": plan_ms}
+
+
+def main(args):
+    logging.disable(logging.CRITICAL)
+    print(f"{'drones':>6} {'mode':<10} {'us/heartbeat':>12} {'us/handoff':>10} {'plan ms':>9}")
+    for n in args.drones:
+        rng = random.Random(args.seed)
+        drones = [(f"DRONE-{i:04d}", rng.randrange(args.grid), rng.randrange(args.grid), rng.uniform(30, 100))
+                  for i in range(n)]
+        for mode in ("flat", "regional"):
+            sent = []
+            ground = GroundAgent("GROUND", (args.grid, args.grid), sent.append,
+                                 allocator=ZoneAllocator(args.grid, args.grid) if mode == "flat" else None)
+            control, planners = ground, [ground]
+            if mode == "regional":
+                control = RegionalHierarchy(ground, args.regions, sent.append,
+                                            allocator_factory=lambda: ZoneAllocator(args.grid, args.grid))
+                planners = control.coordinators
+            r = measure(control, planners, drones, args.grid, args.handoffs)
+            label = mode if mode == "flat" else f"{args.regions}x{args.regions}"
+            print(f"{n:>6} {label:<10} {r['heartbeat_us']:>12.1f} {r['handoff_us']:>10.1f} {r['plan_ms']:>9.1f}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare flat and regional ground coordination cost")
+    parser.add_argument('--drones', type=int, nargs='+', default=[500, 1000, 2000])
+    parser.add_argument('--grid', type=int, default=100, help='Grid width and height')
+    parser.add_argument('--regions', type=int, default=5, help='Regions per side')
+    parser.add_argument('--handoffs', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
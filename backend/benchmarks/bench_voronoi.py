@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Voronoi allocation benchmark: vectorized vs. per-tile loop. Usage: bench_voronoi.py [--sizes 20 50 100 200]."""
+import argparse
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim.zone_allocator import ZoneAllocator
+
+
+def loop_voronoi(drone_positions, unvisited_tiles, drone_batteries):
+    """Original nested-loop allocation, kept as the speed/equality reference."""
+    active_drones = {
+        drone_id: pos
+        for drone_id, pos in drone_positions.items()
+        if drone_batteries.get(drone_id, 0) > 5.0
+    }
+    allocation = defaultdict(list)
+    for tile in unvisited_tiles:
+        nearest_drone = None
+        min_distance = float('inf')
+        for drone_id, drone_pos in active_drones.items():
+            distance = abs(tile[0] - drone_pos[0]) + abs(tile[1] - drone_pos[1])
+            battery_factor = max(0.5, drone_batteries.get(drone_id, 100) / 100.0)
+            adjusted_distance = distance / battery_factor
+            if adjusted_distance < min_distance:
+                min_distance = adjusted_distance
+                nearest_drone = drone_id
+        if nearest_drone:
+            allocation[nearest_drone].append(tile)
+    return {drone_id: allocation.get(drone_id, []) for drone_id in drone_positions}
+
+
+def make_scenario(grid_size: int, num_drones: int, seed: int):
+    rng = random.Random(seed)
+    positions = {
+        f"DRONE-{i+1:02d}": (rng.randrange(grid_size), rng.randrange(grid_size))
+        for i in range(num_drones)
+    }
+    batteries = {drone_id: rng.uniform(10, 100) for drone_id in positions}
+    tiles = {(x, y) for x in range(grid_size) for y in range(grid_size)}
+    return positions, tiles, batteries
+
+
+def time_call(fn, *args, repeat: int = 3):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Voronoi zone allocation")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 50, 100, 200])
+    parser.add_argument('--drones', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'grid':>9} {'tiles':>7} {'loop (ms)':>11} {'vector (ms)':>12} {'speedup':>8}  same")
+    for size in args.sizes:
+        positions, tiles, batteries = make_scenario(size, args.drones, args.seed)
+        allocator = ZoneAllocator(size, size)
+
+        loop_time, expected = time_call(loop_voronoi, positions, tiles, batteries, repeat=args.repeat)
+        vec_time, actual = time_call(
+            allocator.allocate_zones_voronoi, positions, tiles, batteries, repeat=args.repeat
+        )
+
+        print(
+            f"{size:>4}x{size:<4} {len(tiles):>7} {loop_time * 1000:>11.1f} "
+            f"{vec_time * 1000:>12.1f} {loop_time / vec_time:>7.1f}x  {expected == actual}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Zone allocation benchmark suite: speed, memory and coverage quality per strategy.
+
+Usage: bench_zone_allocation.py [--sizes 20 50 100] [--drones 4 8 16] [--compare]
+
+Each run appends one JSON line per case to --output, tagged with a run id,
+timestamp and git revision, so results can be compared across commits.
+"""
+import argparse
+import json
+import logging
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from agents.drone_agent import DroneAgent
+from sim.zone_allocator import ZoneAllocator, balanced_quotas, tile_range_budget
+from sim.tour_optimizer import tour_length
+
+DEFAULT_OUTPUT = Path(__file__).parent / "results" / "zone_allocation.jsonl"
+
+ALLOCATORS = {
+    "voronoi": ZoneAllocator.allocate_zones_voronoi,
+    "kmeans": ZoneAllocator.allocate_zones_kmeans,
+    "balanced": ZoneAllocator.allocate_zones_balanced,
+}
+
+ORDERINGS = ("boustrophedon", "refined")
+
+BATTERY_DISTRIBUTIONS = ("full", "uniform", "skewed")
+
+
+def make_batteries(drone_ids, distribution: str, rng: random.Random) -> dict:
+    if distribution == "full":
+        return {drone_id: 100.0 for drone_id in drone_ids}
+    if distribution == "uniform":
+        return {drone_id: rng.uniform(20, 100) for drone_id in drone_ids}
+    # skewed: half the fleet is already low
+    return {
+        drone_id: rng.uniform(25, 40) if i % 2 else 100.0
+        for i, drone_id in enumerate(drone_ids)
+    }
+
+
+def make_scenario(grid_size: int, num_drones: int, distribution: str, visited_fraction: float, seed: int):
+    rng = random.Random(seed)
+    drone_ids = [f"DRONE-{i+1:02d}" for i in range(num_drones)]
+    positions = {
+        drone_id: (rng.randrange(grid_size), rng.randrange(grid_size)) for drone_id in drone_ids
+    }
+    batteries = make_batteries(drone_ids, distribution, rng)
+    tiles = {
+        (x, y) for x in range(grid_size) for y in range(grid_size)
+        if rng.random() >= visited_fraction
+    }
+    return positions, tiles, batteries
+
+
+def ticks_to_cover(tour: list, start: tuple) -> int:
+    """A drone moves one step per tick and scans a tile on the tick it arrives, so each tile costs at least one tick."""
+    ticks = 0
+    prev = start
+    for tile in tour:
+        ticks += max(1, abs(tile[0] - prev[0]) + abs(tile[1] - prev[1]))
+        prev = tile
+    return ticks
+
+
+def quality_metrics(allocator: ZoneAllocator, allocation: dict, positions: dict, batteries: dict, n_tiles: int) -> dict:
+    """
+    Zone balance, tour length and ticks to full coverage (moves plus scans).
+    Battery range and the balanced quotas use the allocator's own cost model
+    (tile_range_budget, balanced_quotas), the one allocate_zones_balanced plans with.
+    """
+    sizes = [len(tiles) for tiles in allocation.values()]
+    mean_size = sum(sizes) / len(sizes) if sizes else 0
+    tours = {
+        drone_id: int(tour_length(tiles, positions[drone_id])) for drone_id, tiles in allocation.items()
+    }
+    ticks = {
+        drone_id: ticks_to_cover(tiles, positions[drone_id]) for drone_id, tiles in allocation.items()
+    }
+
+    # A drone stops scanning once its range budget is spent
+    budgets = {
+        drone_id: tile_range_budget(
+            batteries.get(drone_id, 0), allocator.battery_reserve, allocator.battery_per_tile
+        )
+        for drone_id in allocation
+    }
+    uncovered = n_tiles - sum(sizes)
+    uncovered += sum(max(0, len(tiles) - budgets[drone_id]) for drone_id, tiles in allocation.items())
+
+    # Tiles beyond each drone's water-filled share of the work
+    quotas = balanced_quotas(np.array([budgets[drone_id] for drone_id in allocation], dtype=np.int64), n_tiles)
+    over_quota = sum(max(0, size - int(quota)) for size, quota in zip(sizes, quotas))
+
+    return {
+        "zone_imbalance": round((max(sizes) - min(sizes)) / mean_size, 3) if mean_size else 0.0,
+        "max_zone": max(sizes) if sizes else 0,
+        "total_tour_length": sum(tours.values()),
+        "est_ticks_to_coverage": max(ticks.values()) if uncovered == 0 and ticks else None,
+        "uncovered_tiles": uncovered,
+        "over_quota_tiles": over_quota,
+    }
+
+
+def run_case(allocator_name: str, ordering: str, grid_size: int, positions, tiles, batteries,
+             repeat: int, refine_budget: float) -> dict:
+    # The battery model the simulated drones run on, as SimulationEnvironment builds it
+    allocator = ZoneAllocator(
+        grid_size, grid_size,
+        battery_reserve=DroneAgent.CRITICAL_BATTERY,
+        battery_per_tile=DroneAgent.BATTERY_DRAIN_MOVE + DroneAgent.BATTERY_DRAIN_SCAN
+    )
+    allocate = ALLOCATORS[allocator_name]
+    order_budget = refine_budget if ordering == "refined" else 0.0
+
+    alloc_times, order_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        allocation = allocate(allocator, positions, tiles, batteries)
+        alloc_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        ordered = allocator.optimize_for_speed(allocation, positions, time_budget=order_budget)
+        order_times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    allocator.optimize_for_speed(allocate(allocator, positions, tiles, batteries), positions, order_budget)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        "alloc_ms": round(min(alloc_times) * 1000, 3),
+        "order_ms": round(min(order_times) * 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+    result.update(quality_metrics(allocator, ordered, positions, batteries, len(tiles)))
+    return result
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Path(__file__).parent, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def case_key(record: dict) -> tuple:
+    return (
+        record["allocator"], record["ordering"], record["grid_size"],
+        record["num_drones"], record["battery_distribution"], record["visited_fraction"]
+    )
+
+
+def load_previous(output: Path) -> dict:
+    """Latest stored result for each case, from earlier runs."""
+    previous = {}
+    if output.exists():
+        with open(output, 'r') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    previous[case_key(record)] = record
+    return previous
+
+
+def format_delta(current, before) -> str:
+    if before in (None, 0) or current is None:
+        return ""
+    return f" ({(current - before) / before * 100:+.0f}%)"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark zone allocation strategies")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 50, 100])
+    parser.add_argument('--drones', type=int, nargs='+', default=[4, 8, 16])
+    parser.add_argument('--batteries', nargs='+', default=list(BATTERY_DISTRIBUTIONS),
+                        choices=BATTERY_DISTRIBUTIONS)
+    parser.add_argument('--allocators', nargs='+', default=list(ALLOCATORS), choices=list(ALLOCATORS))
+    parser.add_argument('--orderings', nargs='+', default=list(ORDERINGS), choices=ORDERINGS)
+    parser.add_argument('--visited-fraction', type=float, default=0.0,
+                        help='Fraction of tiles already visited before allocating')
+    parser.add_argument('--refine-budget', type=float, default=0.1,
+                        help='Seconds for optimize_for_speed tour refinement')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument('--no-save', action='store_true', help='Do not append results to --output')
+    parser.add_argument('--compare', action='store_true', help='Show change vs the last stored run')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logging.getLogger("sim").setLevel(logging.ERROR)
+
+    previous = load_previous(args.output) if args.compare else {}
+    run_info = {
+        "run_id": uuid.uuid4().hex[:8],
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+
+    records = []
+    header = (
+        f"{'allocator':<9} {'order':<13} {'grid':>5} {'drones':>6} {'battery':<8} "
+        f"{'alloc ms':>9} {'order ms':>9} {'peak KB':>8} {'imbal':>6} {'tour':>7} {'ticks':>6} {'uncov':>6} {'overq':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for grid_size in args.sizes:
+        for num_drones in args.drones:
+            for distribution in args.batteries:
+                positions, tiles, batteries = make_scenario(
+                    grid_size, num_drones, distribution, args.visited_fraction, args.seed
+                )
+                for allocator_name in args.allocators:
+                    for ordering in args.orderings:
+                        result = run_case(
+                            allocator_name, ordering, grid_size, positions, tiles, batteries,
+                            args.repeat, args.refine_budget
+                        )
+                        record = dict(
+                            run_info,
+                            allocator=allocator_name,
+                            ordering=ordering,
+                            grid_size=grid_size,
+                            num_drones=num_drones,
+                            battery_distribution=distribution,
+                            visited_fraction=args.visited_fraction,
+                            **result
+                        )
+                        records.append(record)
+
+                        before = previous.get(case_key(record), {})
+                        ticks = result["est_ticks_to_coverage"]
+                        print(
+                            f"{allocator_name:<9} {ordering:<13} {grid_size:>5} {num_drones:>6} "
+                            f"{distribution:<8} {result['alloc_ms']:>9.2f} {result['order_ms']:>9.2f} "
+                            f"{result['peak_kb']:>8.0f} {result['zone_imbalance']:>6.2f} "
+                            f"{result['total_tour_length']:>7} {ticks if ticks is not None else '-':>6} "
+                            f"{result['uncovered_tiles']:>6} {result['over_quota_tiles']:>6}"
+                            f"{format_delta(result['alloc_ms'], before.get('alloc_ms'))}"
+                        )
+
+    if not args.no_save:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'a') as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        print(f"\nSaved {len(records)} results (run {run_info['run_id']}) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
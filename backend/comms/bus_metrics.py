@@ -0,0 +1,169 @@
+"""Bus instrumentation: delivery latency, handler time, queue depth and throughput."""
+import bisect
+import time
+from collections import deque
+from typing import Dict, Optional
+
+# Upper bucket bounds in milliseconds; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in milliseconds."""
+
+    def __init__(self, bounds: tuple = LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value_ms: float):
+        self.counts[bisect.bisect_left(self.bounds, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile, capped at the observed max."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "max": round(self.max, 3),
+            "buckets": self.counts
+        }
+
+
+class RateMeter:
+    """Events and bytes per second over a sliding window of one-second slots."""
+
+    def __init__(self, window: int = 10):
+        self.window = window
+        self.slots = deque()  # [second, events, bytes]
+        self.total_events = 0
+        self.total_bytes = 0
+
+    def record(self, nbytes: int = 0, now: Optional[float] = None):
+        second = int(now if now is not None else time.monotonic())
+        if not self.slots or self.slots[-1][0] != second:
+            self.slots.append([second, 0, 0])
+            while self.slots[0][0] <= second - self.window:
+                self.slots.popleft()
+        self.slots[-1][1] += 1
+        self.slots[-1][2] += nbytes
+        self.total_events += 1
+        self.total_bytes += nbytes
+
+    def rates(self, now: Optional[float] = None) -> tuple:
+        now = now if now is not None else time.monotonic()
+        live = [slot for slot in self.slots if slot[0] > now - self.window]
+        if not live:
+            return 0.0, 0.0
+        span = max(1.0, now - live[0][0])
+        return sum(s[1] for s in live) / span, sum(s[2] for s in live) / span
+
+    def to_dict(self) -> dict:
+        per_sec, bytes_per_sec = self.rates()
+        return {
+            "total": self.total_events,
+            "bytes": self.total_bytes,
+            "per_sec": round(per_sec, 1),
+            "bytes_per_sec": round(bytes_per_sec, 1)
+        }
+
+
+class HandlerTiming:
+    """Execution time of one agent's handler."""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value_ms: float):
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 4) if self.count else 0.0,
+            "max": round(self.max, 4),
+            "total": round(self.total, 3)
+        }
+
+
+class BusMetrics:
+    """
+    Per-bus instrumentation. Latency is publish-to-dispatch on the wall clock
+    (time.time()), so it stays meaningful across worker processes; handler time
+    uses perf_counter. Queue depth is the number of messages the receive loop
+    found waiting on each wakeup.
+    """
+
+    def __init__(self):
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.handlers: Dict[str, HandlerTiming] = {}
+        self.sent = RateMeter()
+        self.received = RateMeter()
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.wakeups = 0
+
+    def record_sent(self, nbytes: int):
+        self.sent.record(nbytes)
+
+    def record_received(self, msg_type: str, sent_at: Optional[float], nbytes: int, now: float):
+        self.received.record(nbytes)
+        if sent_at is not None:
+            histogram = self.latency.get(msg_type)
+            if histogram is None:
+                histogram = self.latency[msg_type] = LatencyHistogram()
+            histogram.record(max(0.0, (now - sent_at) * 1000))
+
+    def record_handler(self, agent_id: str, elapsed_ms: float):
+        timing = self.handlers.get(agent_id)
+        if timing is None:
+            timing = self.handlers[agent_id] = HandlerTiming()
+        timing.record(elapsed_ms)
+
+    def record_batch(self, depth: int):
+        self.wakeups += 1
+        self.queue_depth = depth
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def to_dict(self) -> dict:
+        return {
+            "latency_buckets_ms": list(LATENCY_BUCKETS_MS),
+            "latency_ms": {msg_type: h.to_dict() for msg_type, h in self.latency.items()},
+            "handler_ms": {agent_id: t.to_dict() for agent_id, t in self.handlers.items()},
+            "queue_depth": {
+                "last": self.queue_depth,
+                "max": self.max_queue_depth,
+                "wakeups": self.wakeups
+            },
+            "throughput": {
+                "sent": self.sent.to_dict(),
+                "received": self.received.to_dict()
+            }
+        }
+
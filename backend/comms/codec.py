@@ -0,0 +1,188 @@
+"""Wire codecs for bus messages: JSON, msgpack, and packed tile lists."""
+import base64
+import json
+import sys
+from array import array
+from typing import Any, Dict, Optional
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+# Payload keys whose values are tile coordinate lists
+TILE_KEYS = ("tiles", "accepted_tiles")
+PACKED_MARKER = "__tiles__"
+MAX_PACKED_COORD = 0xFFFF
+
+
+class JsonCodec:
+    """Default codec; human-readable and dependency-free."""
+
+    name = "json"
+    codec_id = 0
+
+    def encode(self, message: dict) -> bytes:
+        return json.dumps(message, separators=(",", ":")).encode("utf-8")
+
+    def decode(self, data: bytes) -> dict:
+        return json.loads(data)
+
+
+class MsgpackCodec:
+    """Binary codec; smaller and faster than JSON for numeric payloads."""
+
+    name = "msgpack"
+    codec_id = 1
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack codec requires the 'msgpack' package")
+
+    def encode(self, message: dict) -> bytes:
+        return msgpack.packb(message, use_bin_type=True)
+
+    def decode(self, data: bytes) -> dict:
+        return msgpack.unpackb(data, raw=False)
+
+
+def _pack_tiles(tiles: list) -> Optional[Dict[str, Any]]:
+    """Pack a tile list into uint8 or little-endian uint16 pairs, or None if it does not fit."""
+    if not tiles:
+        return None
+
+    first = tiles[0]
+    if isinstance(first, dict):
+        form = "dict"
+        if not all(isinstance(t, dict) and len(t) == 2 and "x" in t and "y" in t for t in tiles):
+            return None
+        flat = [c for t in tiles for c in (t["x"], t["y"])]
+    elif isinstance(first, (list, tuple)):
+        form = "xy"
+        if not all(isinstance(t, (list, tuple)) and len(t) == 2 for t in tiles):
+            return None
+        flat = [c for t in tiles for c in t]
+    else:
+        return None
+
+    if not all(type(c) is int for c in flat) or min(flat) < 0 or max(flat) > MAX_PACKED_COORD:
+        return None
+
+    typecode = "B" if max(flat) <= 0xFF else "H"
+    packed = array(typecode, flat)
+    if typecode == "H" and sys.byteorder == "big":
+        packed.byteswap()
+    return {PACKED_MARKER: form, "w": packed.itemsize, "data": packed.tobytes()}
+
+
+def _unpack_tiles(packed: dict) -> list:
+    data = packed["data"]
+    if isinstance(data, str):
+        data = base64.b64decode(data)
+    flat = array("B" if packed["w"] == 1 else "H")
+    flat.frombytes(data)
+    if flat.itemsize > 1 and sys.byteorder == "big":
+        flat.byteswap()
+    pairs = zip(flat[0::2], flat[1::2])
+    if packed[PACKED_MARKER] == "dict":
+        return [{"x": x, "y": y} for x, y in pairs]
+    return [[x, y] for x, y in pairs]
+
+
+class PackedTileCodec:
+    """
+    Packs tile lists found under TILE_KEYS (at any depth of the payload,
+    through nested dicts and lists) into binary coordinate pairs, then encodes
+    the message with an inner codec (msgpack when available, otherwise JSON
+    with base64 tile data).
+    HANDOFF_REQUEST tuples decode as [x, y] lists, as they do through JSON.
+    """
+
+    name = "packed"
+
+    def __init__(self, inner=None):
+        if inner is None:
+            inner = MsgpackCodec() if msgpack is not None else JsonCodec()
+        self.inner = inner
+        self._binary = isinstance(inner, MsgpackCodec)
+        # The frame id tells receivers which inner codec to unwrap with
+        self.codec_id = 2 if self._binary else 3
+
+    def _pack(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            packed = {}
+            for key, item in value.items():
+                if key in TILE_KEYS and isinstance(item, (list, tuple)):
+                    tiles = _pack_tiles(list(item))
+                    if tiles is not None:
+                        if not self._binary:
+                            tiles["data"] = base64.b64encode(tiles["data"]).decode("ascii")
+                        packed[key] = tiles
+                        continue
+                packed[key] = self._pack(item)
+            return packed
+        if isinstance(value, (list, tuple)):
+            # e.g. GROUND_COMMAND batches: payload["commands"][i]["payload"]["tiles"]
+            return [self._pack(item) for item in value]
+        return value
+
+    def _unpack(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            if PACKED_MARKER in value:
+                return _unpack_tiles(value)
+            return {key: self._unpack(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._unpack(item) for item in value]
+        return value
+
+    def encode(self, message: dict) -> bytes:
+        return self.inner.encode(self._pack(message))
+
+    def decode(self, data: bytes) -> dict:
+        return self._unpack(self.inner.decode(data))
+
+
+CODECS = {
+    JsonCodec.name: JsonCodec,
+    MsgpackCodec.name: MsgpackCodec,
+    PackedTileCodec.name: PackedTileCodec,
+}
+
+
+def get_codec(name: str):
+    """Instantiate a codec by name."""
+    if name not in CODECS:
+        raise ValueError(f"Unknown codec: {name}")
+    return CODECS[name]()
+
+
+# Frame codec id -> decoder factory
+DECODERS = {
+    0: JsonCodec,
+    1: MsgpackCodec,
+    2: lambda: PackedTileCodec(MsgpackCodec()),
+    3: lambda: PackedTileCodec(JsonCodec()),
+}
+
+
+class CodecRegistry:
+    """
+    Frames carry a one-byte codec id, so a receiver decodes each frame with the
+    codec its sender chose. Decoders are created lazily; a frame from a codec
+    whose dependency is missing raises ImportError.
+    """
+
+    def __init__(self):
+        self._by_id: Dict[int, Any] = {}
+
+    def encode(self, codec, message: dict) -> bytes:
+        return bytes((codec.codec_id,)) + codec.encode(message)
+
+    def decode(self, frame: bytes) -> dict:
+        codec_id = frame[0]
+        codec = self._by_id.get(codec_id)
+        if codec is None:
+            if codec_id not in DECODERS:
+                raise ValueError(f"Unknown codec id: {codec_id}")
+            codec = self._by_id[codec_id] = DECODERS[codec_id]()
+        return codec.decode(frame[1:])
@@ -0,0 +1,62 @@
+"""Bounded idempotency cache: suppress redelivery of an already-seen message id."""
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class IdempotencyCache:
+    """
+    Remembers recently seen message ids in insertion order. At most `capacity`
+    ids are kept (oldest evicted first); with `ttl`, ids older than ttl seconds
+    are also forgotten, so memory stays flat however long the run.
+    """
+
+    def __init__(self, capacity: int = 4096, ttl: Optional[float] = None):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.ttl = ttl
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def check(self, message_id: str, now: Optional[float] = None) -> bool:
+        """Record message_id; True if it was already seen (a duplicate)."""
+        now = now if now is not None else time.monotonic()
+        if self.ttl is not None:
+            self._expire(now)
+
+        if message_id in self._seen:
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        self._seen[message_id] = now
+        if len(self._seen) > self.capacity:
+            self._seen.popitem(last=False)
+            self.evictions += 1
+        return False
+
+    def _expire(self, now: float):
+        cutoff = now - self.ttl
+        while self._seen:
+            oldest_id, seen_at = next(iter(self._seen.items()))
+            if seen_at > cutoff:
+                break
+            del self._seen[oldest_id]
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def clear(self):
+        self._seen.clear()
+
+    def to_dict(self) -> dict:
+        return {
+            "size": len(self._seen),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
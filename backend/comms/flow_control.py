@@ -0,0 +1,167 @@
+"""Bus flow control: high-water marks, batch draining and per-message-class overload policies."""
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Tuple
+
+from comms.transport import message_field
+
+# Overload policies
+DROP = "drop"     # discard (and count) when the send queue is full
+BLOCK = "block"   # wait for the queue to drain; never dropped
+
+DEFAULT_POLICIES = {
+    # Heartbeats are periodic and superseded by the next one
+    "HEARTBEAT": DROP,
+    # Offers/handoffs move tile ownership and TARGET_FOUND is the mission result;
+    # losing any of them loses work, so they wait instead
+    "OFFER_TILE": BLOCK,
+    "ACCEPT_OFFER": BLOCK,
+    "HANDOFF_REQUEST": BLOCK,
+    "ACCEPT_HANDOFF": BLOCK,
+    "TARGET_FOUND": BLOCK,
+}
+
+
+@dataclass
+class FlowControl:
+    """
+    Bus flow-control settings.
+
+    send_hwm/recv_hwm are the ZMQ SNDHWM/RCVHWM (and the local queue bound;
+    0 means unbounded). Each receive wakeup drains up to max_batch messages.
+    When a wakeup fills a whole batch the bus is falling behind, and droppable
+    messages in it are coalesced to the newest per sender and type.
+    A BLOCK-class send keeps waiting for room; every block_timeout seconds it
+    waits is counted (and logged) as a timeout, but the message is not dropped.
+    """
+    send_hwm: int = 1000
+    recv_hwm: int = 1000
+    max_batch: int = 256
+    block_timeout: float = 5.0
+    default_policy: str = BLOCK
+    policies: Dict[str, str] = field(default_factory=lambda: dict(DEFAULT_POLICIES))
+
+    def policy_for(self, msg_type: str) -> str:
+        return self.policies.get(msg_type, self.default_policy)
+
+    def to_dict(self) -> dict:
+        return {
+            "send_hwm": self.send_hwm,
+            "recv_hwm": self.recv_hwm,
+            "max_batch": self.max_batch,
+            "block_timeout": self.block_timeout,
+            "default_policy": self.default_policy,
+            "policies": self.policies
+        }
+
+
+class FlowStats:
+    """Drop and backpressure counters, by message type."""
+
+    def __init__(self):
+        self.dropped: Dict[str, int] = {}
+        self.shed: Dict[str, int] = {}
+        self.blocked: Dict[str, int] = {}
+        self.timeouts: Dict[str, int] = {}
+        self.overflow: Dict[str, int] = {}
+
+    @staticmethod
+    def _bump(counter: Dict[str, int], msg_type: str, n: int = 1):
+        counter[msg_type] = counter.get(msg_type, 0) + n
+
+    def record_dropped(self, msg_type: str):
+        self._bump(self.dropped, msg_type)
+
+    def record_shed(self, msg_type: str):
+        self._bump(self.shed, msg_type)
+
+    def record_blocked(self, msg_type: str):
+        self._bump(self.blocked, msg_type)
+
+    def record_timeout(self, msg_type: str):
+        self._bump(self.timeouts, msg_type)
+
+    def record_overflow(self, msg_type: str):
+        """A BLOCK-class message queued past a full bound (nothing droppable left to shed)."""
+        self._bump(self.overflow, msg_type)
+
+    def to_dict(self) -> dict:
+        return {
+            "dropped": self.dropped,
+            "shed": self.shed,
+            "blocked": self.blocked,
+            "timeouts": self.timeouts,
+            "overflow": self.overflow,
+            "total_dropped": sum(self.dropped.values()) + sum(self.shed.values())
+        }
+
+
+def coalesce_droppable(batch: List[Tuple[Any, Any, int]], flow: FlowControl, stats: FlowStats) -> list:
+    """Keep only the newest droppable message per (sender, type) in a receive batch."""
+    newest = {}
+    for i, (message, _, _) in enumerate(batch):
+        msg_type = message_field(message, "type", "UNKNOWN")
+        if flow.policy_for(msg_type) == DROP:
+            newest[(message_field(message, "agent_id"), msg_type)] = i
+
+    kept = []
+    for i, envelope in enumerate(batch):
+        msg_type = message_field(envelope[0], "type", "UNKNOWN")
+        if flow.policy_for(msg_type) == DROP and newest[(message_field(envelope[0], "agent_id"), msg_type)] != i:
+            stats.record_shed(msg_type)
+            continue
+        kept.append(envelope)
+    return kept
+
+
+class PolicyQueue:
+    """
+    FIFO bounded at max_len that applies the per-class policy when full: an
+    arriving DROP-class message is dropped; a BLOCK-class one first sheds the
+    oldest queued DROP-class message and, if there is none, is queued past the
+    bound (counted as overflow). BLOCK-class messages are never lost; they are
+    queued by synchronous callers that cannot wait, so the queue grows instead.
+    """
+
+    def __init__(self, max_len: int, flow: FlowControl, stats: FlowStats):
+        self.max_len = max_len
+        self.flow = flow
+        self.stats = stats
+        self.items: Deque[Tuple[bool, Any]] = deque()
+        self.droppable = 0
+
+    def push(self, message: Any) -> bool:
+        """Queue a message; returns False if it was dropped."""
+        msg_type = message_field(message, "type", "UNKNOWN")
+        drop = self.flow.policy_for(msg_type) == DROP
+        if len(self.items) >= self.max_len:
+            if drop:
+                self.stats.record_dropped(msg_type)
+                return False
+            if self.droppable:
+                self._shed_oldest_droppable()
+            else:
+                self.stats.record_overflow(msg_type)
+        self.items.append((drop, message))
+        self.droppable += drop
+        return True
+
+    def _shed_oldest_droppable(self):
+        for i, (drop, queued) in enumerate(self.items):
+            if drop:
+                del self.items[i]
+                self.droppable -= 1
+                self.stats.record_shed(message_field(queued, "type", "UNKNOWN"))
+                return
+
+    def popleft(self) -> Any:
+        drop, message = self.items.popleft()
+        self.droppable -= drop
+        return message
+
+    def clear(self):
+        self.items.clear()
+        self.droppable = 0
+
+    def __len__(self) -> int:
+        return len(self.items)
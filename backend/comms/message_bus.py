@@ -1,12 +1,20 @@
-"""ZeroMQ in-process A2A message bus."""
+"""A2A message bus over ZeroMQ or an in-process queue."""
 import asyncio
-import json
 import logging
-from typing import Callable, Dict, List, Any, Optional
+import time
+from typing import Callable, Dict, List, Any, Optional, Iterable, Tuple
 from dataclasses import dataclass
-import zmq
 import zmq.asyncio
 
+from comms.bus_metrics import BusMetrics
+from comms.codec import get_codec
+from comms.dedup import IdempotencyCache
+from comms.flow_control import FlowControl, FlowStats, DROP, coalesce_droppable
+from comms.transport import (
+    ZmqTransport, LocalTransport, message_field, message_as_dict,
+    message_destination, make_topic, BROADCAST
+)
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -14,11 +22,18 @@ class MessageStats:
     """Message counts by type."""
     total_sent: int = 0
     total_received: int = 0
+    total_duplicates: int = 0
     by_type: Dict[str, int] = None
+    received_by_type: Dict[str, int] = None
+    duplicates_by_type: Dict[str, int] = None
     
     def __post_init__(self):
         if self.by_type is None:
             self.by_type = {}
+        if self.received_by_type is None:
+            self.received_by_type = {}
+        if self.duplicates_by_type is None:
+            self.duplicates_by_type = {}
     
     def record_sent(self, msg_type: str):
         self.total_sent += 1
@@ -26,40 +41,102 @@ class MessageStats:
     
     def record_received(self, msg_type: str):
         self.total_received += 1
+        self.received_by_type[msg_type] = self.received_by_type.get(msg_type, 0) + 1
+    
+    def record_duplicate(self, msg_type: str):
+        self.total_duplicates += 1
+        self.duplicates_by_type[msg_type] = self.duplicates_by_type.get(msg_type, 0) + 1
     
     def to_dict(self) -> dict:
         return {
             "total_sent": self.total_sent,
             "total_received": self.total_received,
-            "by_type": self.by_type
+            "total_duplicates": self.total_duplicates,
+            "by_type": self.by_type,
+            "received_by_type": self.received_by_type,
+            "duplicates_by_type": self.duplicates_by_type
         }
 
 class MessageBus:
-    """PUB/SUB in-process (inproc://); agents filter by sender."""
+    """
+    PUB/SUB bus with topic routing.
+
+    Each handler subscribes to a set of message types (or all of them) and only
+    receives broadcasts of those types, never its own. Messages whose payload
+    names a `target` agent are unicast to that agent alone. Frames carry a
+    "<destination>|<type>" topic, so ZMQ filters at the socket.
+
+    transport="zmq" (default) sends encoded frames over inproc:// sockets, using
+    `codec` ("json", "msgpack" or "packed"). transport="local" hands published
+    objects straight to handlers through an asyncio queue, so a Message published
+    in-process reaches handlers without encode/decode and the codec is unused.
+
+    `flow` sets the send/receive high-water marks and what happens to each
+    message type when the send queue is full: DROP-class messages (heartbeats)
+    are discarded and counted, BLOCK-class messages wait for room for as long
+    as the bus runs.
+
+    Set `range_filter` (e.g. a SpatialHash) to model radio range: broadcasts
+    from a positioned agent then reach only positioned agents in range, while
+    handlers without a position get relayed delivery of everything.
 
-    def __init__(self, context: Optional[zmq.asyncio.Context] = None):
-        self.context = context or zmq.asyncio.Context()
-        self.pub_socket: Optional[zmq.asyncio.Socket] = None
-        self.sub_socket: Optional[zmq.asyncio.Socket] = None
+    One bounded idempotency cache per bus, keyed by sender and message_id,
+    drops a message redelivered (e.g. by a retrying transport) before it is
+    counted, monitored or handled again; redeliveries are counted on their own
+    as total_duplicates. It holds one entry per message however many
+    handlers receive it, so size dedup_capacity to the bus's message rate
+    times the redelivery window, or bound entries by age with dedup_ttl.
+    dedup_capacity=0 disables it.
+    """
+
+    def __init__(
+        self,
+        context: Optional[zmq.asyncio.Context] = None,
+        transport: str = "zmq",
+        codec: str = "json",
+        flow: Optional[FlowControl] = None,
+        dedup_capacity: int = 16384,
+        dedup_ttl: Optional[float] = None
+    ):
+        self.flow = flow or FlowControl()
+        if transport == "local":
+            self.transport = LocalTransport(self.flow.send_hwm, self.flow.max_batch)
+        elif transport == "zmq":
+            self.transport = ZmqTransport(
+                context, get_codec(codec),
+                self.flow.send_hwm, self.flow.recv_hwm, self.flow.max_batch
+            )
+        else:
+            raise ValueError(f"Unknown transport: {transport}")
+        self.context = getattr(self.transport, "context", context)
         self.handlers: Dict[str, Callable] = {}
+        self.subscriptions: Dict[str, Optional[frozenset]] = {}
+        self.dedup_capacity = dedup_capacity
+        self.dedup_ttl = dedup_ttl
+        self.dedup = IdempotencyCache(dedup_capacity, dedup_ttl) if dedup_capacity else None
+        self._routes: Dict[str, List[Tuple[str, Callable]]] = {}
+        self.range_filter = None
+        self._range_routes: Dict[str, tuple] = {}
+        self.range_stats = {"delivered": 0, "out_of_range": 0}
+        self.monitors: List[Callable[[Any], None]] = []
         self.message_log: List[dict] = []
         self.record_messages = False
         self.stats = MessageStats()
+        self.metrics = BusMetrics()
+        self.flow_stats = FlowStats()
         self.running = False
         self._receiver_task: Optional[asyncio.Task] = None
         self.on_message_callback: Optional[Callable[[dict], None]] = None
+        # Called with (msg_type, publish-to-dispatch latency in ms) for each stamped delivery
+        self.on_latency_callback: Optional[Callable[[str, float], None]] = None
 
-    async def start(self, pub_address: str = "inproc://drone_messages"):
-        self.pub_socket = self.context.socket(zmq.PUB)
-        self.pub_socket.bind(pub_address)
-        self.sub_socket = self.context.socket(zmq.SUB)
-        self.sub_socket.connect(pub_address)
-        self.sub_socket.setsockopt_string(zmq.SUBSCRIBE, "")
-        await asyncio.sleep(0.1)
+    async def start(self, pub_address: str = "inproc://drone_messages", sub_address: Optional[str] = None):
+        """Start the bus; pass sub_address to join a multi-process proxy (see ZmqTransport.start)."""
+        await self.transport.start(pub_address, sub_address)
         
         self.running = True
         self._receiver_task = asyncio.create_task(self._receive_loop())
-        logger.info("MessageBus started on %s", pub_address)
+        logger.info("MessageBus started on %s (%s transport)", pub_address, self.transport.name)
     
     async def stop(self):
         self.running = False
@@ -71,51 +148,138 @@ class MessageBus:
             except asyncio.CancelledError:
                 pass
         
-        if self.pub_socket:
-            self.pub_socket.close()
-        if self.sub_socket:
-            self.sub_socket.close()
+        await self.transport.stop()
         
         logger.info("MessageBus stopped")
     
-    def register_handler(self, agent_id: str, handler: Callable[[dict], None]):
+    def register_handler(
+        self,
+        agent_id: str,
+        handler: Callable[[Any], None],
+        message_types: Optional[Iterable[str]] = None
+    ):
+        """
+        Register an agent's handler. With message_types, only broadcasts of those
+        types are delivered; messages targeted at agent_id always are.
+        """
         self.handlers[agent_id] = handler
+        self.subscriptions[agent_id] = frozenset(message_types) if message_types is not None else None
+        self._routes.clear()
+        self._range_routes.clear()
+        self._sync_subscriptions()
 
     def unregister_handler(self, agent_id: str):
         self.handlers.pop(agent_id, None)
+        self.subscriptions.pop(agent_id, None)
+        self._routes.clear()
+        self._range_routes.clear()
+        self._sync_subscriptions()
+
+    def add_monitor(self, callback: Callable[[Any], None]):
+        """Observe every message this bus receives, including unicast to other agents."""
+        self.monitors.append(callback)
+        self._sync_subscriptions()
+
+    def _sync_subscriptions(self):
+        """Point the transport's topic filters at what registered handlers need."""
+        wanted = {make_topic(agent_id) for agent_id in self.handlers}
+        if self.monitors:
+            wanted.add("")
+        for types in self.subscriptions.values():
+            if types is None:
+                wanted.add(make_topic(BROADCAST))
+            else:
+                wanted.update(make_topic(BROADCAST, msg_type) for msg_type in types)
+        
+        current = getattr(self.transport, "subscriptions", set())
+        for prefix in current - wanted:
+            self.transport.unsubscribe(prefix)
+        for prefix in wanted - current:
+            self.transport.subscribe(prefix)
+
+    def _routes_for(self, msg_type: str) -> List[Tuple[str, Callable]]:
+        routes = self._routes.get(msg_type)
+        if routes is None:
+            routes = self._routes[msg_type] = [
+                (agent_id, handler) for agent_id, handler in self.handlers.items()
+                if self.subscriptions.get(agent_id) is None or msg_type in self.subscriptions[agent_id]
+            ]
+        return routes
 
-    async def publish(self, message: dict):
-        if not self.pub_socket:
+    def _routes_in_range(self, msg_type: str, sender_id: Optional[str],
+                         routes: List[Tuple[str, Callable]]) -> List[Tuple[str, Callable]]:
+        """Narrow broadcast routes to agents within radio range of the sender, plus relayed ones."""
+        nearby = self.range_filter.neighbours(sender_id)
+        if nearby is None:
+            return routes
+        
+        cached = self._range_routes.get(msg_type)
+        if cached is None or cached[0] != self.range_filter.version:
+            relayed = [(agent_id, h) for agent_id, h in routes if not self.range_filter.tracks(agent_id)]
+            cached = self._range_routes[msg_type] = (self.range_filter.version, dict(routes), relayed)
+        _, route_map, relayed = cached
+        
+        in_range = [(agent_id, route_map[agent_id]) for agent_id in nearby if agent_id in route_map]
+        positioned = len(route_map) - len(relayed) - (1 if sender_id in route_map else 0)
+        self.range_stats["delivered"] += len(in_range)
+        self.range_stats["out_of_range"] += positioned - len(in_range)
+        return relayed + in_range
+
+    async def publish(self, message: Any):
+        """Publish a message dict, or a Message object (delivered as-is on the local transport)."""
+        if not self.transport.started:
             logger.warning("Cannot publish - MessageBus not started")
             return
         
         try:
-            msg_json = json.dumps(message)
-            await self.pub_socket.send_string(msg_json)
-            self.stats.record_sent(message.get("type", "UNKNOWN"))
+            msg_type = message_field(message, "type", "UNKNOWN")
+            topic = make_topic(message_destination(message), msg_type)
+            nbytes = await self.transport.try_send(message, topic)
+            if nbytes is None:
+                if self.flow.policy_for(msg_type) == DROP:
+                    self.flow_stats.record_dropped(msg_type)
+                    return
+                self.flow_stats.record_blocked(msg_type)
+                nbytes = await self._send_blocking(message, topic, msg_type)
+                if nbytes is None:
+                    return
+            self.stats.record_sent(msg_type)
+            self.metrics.record_sent(nbytes)
             if self.record_messages:
-                self.message_log.append(message)
+                self.message_log.append(message_as_dict(message))
             if self.on_message_callback:
-                self.on_message_callback(message)
+                self.on_message_callback(message_as_dict(message))
                 
         except Exception as e:
             logger.error("Error publishing message: %s", e)
     
+    async def _send_blocking(self, message: Any, topic: str, msg_type: str) -> Optional[int]:
+        """Wait for room to send a BLOCK-class message; only a stopped bus gives up on it."""
+        send = asyncio.ensure_future(self.transport.send(message, topic))
+        waited = 0.0
+        while True:
+            done, _ = await asyncio.wait({send}, timeout=self.flow.block_timeout)
+            if done:
+                return send.result()
+            waited += self.flow.block_timeout
+            self.flow_stats.record_timeout(msg_type)
+            if not self.running:
+                send.cancel()
+                logger.error("Bus stopped with %s still waiting to send; not delivered", msg_type)
+                return None
+            logger.warning("Send queue full for %.1fs; %s still waiting", waited, msg_type)
+
     async def _receive_loop(self):
         while self.running:
             try:
-                if await self.sub_socket.poll(timeout=100):
-                    msg_json = await self.sub_socket.recv_string()
-                    message = json.loads(msg_json)
-                    
-                    self.stats.record_received(message.get("type", "UNKNOWN"))
-                    sender_id = message.get("agent_id")
-                    for agent_id, handler in self.handlers.items():
-                        if agent_id != sender_id:
-                            try:
-                                handler(message)
-                            except Exception as e:
-                                logger.error("Handler error for %s: %s", agent_id, e)
+                batch = await self.transport.receive()
+                if batch:
+                    self.metrics.record_batch(len(batch))
+                    if len(batch) >= self.flow.max_batch:
+                        # Falling behind: only the newest droppable message per sender matters
+                        batch = coalesce_droppable(batch, self.flow, self.flow_stats)
+                for message, sent_at, nbytes in batch:
+                    self._dispatch(message, sent_at, nbytes)
                                 
             except asyncio.CancelledError:
                 break
@@ -123,8 +287,56 @@ class MessageBus:
                 logger.error("Error in receive loop: %s", e)
                 await asyncio.sleep(0.1)
     
+    def _dispatch(self, message: Any, sent_at: Optional[float] = None, nbytes: int = 0):
+        msg_type = message_field(message, "type", "UNKNOWN")
+        sender_id = message_field(message, "agent_id")
+        # A redelivery is counted on its own and goes no further: not into the
+        # receive counts or latency, and not to monitors or handlers
+        message_id = message_field(message, "message_id")
+        if message_id and self.dedup is not None and self.dedup.check(f"{sender_id}/{message_id}"):
+            self.stats.record_duplicate(msg_type)
+            return
+        
+        self.stats.record_received(msg_type)
+        now = time.time()
+        self.metrics.record_received(msg_type, sent_at, nbytes, now)
+        if sent_at is not None and self.on_latency_callback:
+            self.on_latency_callback(msg_type, max(0.0, (now - sent_at) * 1000))
+        
+        for monitor in self.monitors:
+            try:
+                monitor(message)
+            except Exception as e:
+                logger.error("Monitor error: %s", e)
+        
+        destination = message_destination(message)
+        if destination is not None:
+            handler = self.handlers.get(destination)
+            routes = [(destination, handler)] if handler else []
+        else:
+            routes = self._routes_for(msg_type)
+            if self.range_filter is not None:
+                routes = self._routes_in_range(msg_type, sender_id, routes)
+        
+        for agent_id, handler in routes:
+            if agent_id != sender_id:
+                started = time.perf_counter()
+                try:
+                    handler(message)
+                except Exception as e:
+                    logger.error("Handler error for %s: %s", agent_id, e)
+                self.metrics.record_handler(agent_id, (time.perf_counter() - started) * 1000)
+    
     def get_stats(self) -> dict:
-        return self.stats.to_dict()
+        """Message counts plus latency, handler time, queue depth, throughput and drops."""
+        stats = self.stats.to_dict()
+        stats.update(self.metrics.to_dict())
+        stats["flow"] = self.flow_stats.to_dict()
+        if self.dedup is not None:
+            stats["dedup"] = self.dedup.to_dict()
+        if self.range_filter is not None:
+            stats["range"] = dict(self.range_stats, comm_range=self.range_filter.comm_range)
+        return stats
 
     def get_message_log(self) -> List[dict]:
         return self.message_log.copy()
@@ -0,0 +1,67 @@
+"""Outbound message pump: agents enqueue, the environment flushes once per tick."""
+import asyncio
+import logging
+from typing import Any
+
+from comms.flow_control import PolicyQueue
+from comms.transport import message_field
+
+logger = logging.getLogger(__name__)
+
+
+class OutboundPump:
+    """
+    Bounded FIFO between agents' send callbacks and MessageBus.publish.
+
+    send() never blocks or spawns a task; flush() publishes everything queued
+    so far, in send order, from a single coroutine. When the queue is full the
+    bus's FlowControl class policy applies (see PolicyQueue): heartbeats are
+    dropped or shed first, and BLOCK-class messages (targets, handoffs, offers)
+    are always queued, counted in the bus's FlowStats.
+    """
+
+    def __init__(self, message_bus, max_queue: int = 10000):
+        self.message_bus = message_bus
+        self.max_queue = max_queue
+        self.queue = PolicyQueue(max_queue, message_bus.flow, message_bus.flow_stats)
+        self._flush_lock = asyncio.Lock()
+        self.stats = {
+            "enqueued": 0,
+            "published": 0,
+            "dropped": 0,
+            "flushes": 0,
+            "max_depth": 0,
+            "dropped_by_type": {}
+        }
+
+    def send(self, message: Any) -> bool:
+        """Queue a message for the next flush; returns False if it was dropped."""
+        if not self.queue.push(message):
+            msg_type = message_field(message, "type", "UNKNOWN")
+            self.stats["dropped"] += 1
+            self.stats["dropped_by_type"][msg_type] = self.stats["dropped_by_type"].get(msg_type, 0) + 1
+            if self.stats["dropped"] == 1 or self.stats["dropped"] % 1000 == 0:
+                logger.warning("Outbound queue full (%d); dropped %d messages so far",
+                               self.max_queue, self.stats["dropped"])
+            return False
+
+        self.stats["enqueued"] += 1
+        if len(self.queue) > self.stats["max_depth"]:
+            self.stats["max_depth"] = len(self.queue)
+        return True
+
+    async def flush(self):
+        """Publish all queued messages in order."""
+        async with self._flush_lock:
+            if not self.queue:
+                return
+            self.stats["flushes"] += 1
+            while self.queue:
+                await self.message_bus.publish(self.queue.popleft())
+                self.stats["published"] += 1
+
+    def clear(self):
+        self.queue.clear()
+
+    def get_stats(self) -> dict:
+        return dict(self.stats, depth=len(self.queue))
@@ -0,0 +1,83 @@
+"""Uniform-grid spatial hash of agent positions, for radio-range-limited delivery."""
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class SpatialHash:
+    """
+    Buckets agents into square cells of side `comm_range`, so everyone within
+    range of an agent lies in the 3x3 block of cells around it. Lookups cost
+    O(agents nearby) instead of O(fleet).
+
+    Used as MessageBus.range_filter: broadcasts from a tracked agent reach only
+    tracked agents within range. Agents that are not tracked (no position, e.g.
+    the ground station) are treated as reachable through relays and receive
+    every broadcast; broadcasts from them reach everyone.
+    """
+
+    def __init__(self, comm_range: float):
+        if comm_range <= 0:
+            raise ValueError("comm_range must be positive")
+        self.comm_range = comm_range
+        self._range_sq = comm_range * comm_range
+        self.cells: Dict[Tuple[int, int], Set[str]] = {}
+        self.positions: Dict[str, Tuple[float, float]] = {}
+        self._cell_of: Dict[str, Tuple[int, int]] = {}
+        # Bumped when the tracked set changes, so callers can cache per-set data
+        self.version = 0
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.comm_range), math.floor(y / self.comm_range))
+
+    def update(self, agent_id: str, x: float, y: float):
+        """Insert or move an agent."""
+        cell = self._cell(x, y)
+        old = self._cell_of.get(agent_id)
+        if old is None:
+            self.version += 1
+        elif old != cell:
+            self._discard_from_cell(agent_id, old)
+        if old != cell:
+            self.cells.setdefault(cell, set()).add(agent_id)
+            self._cell_of[agent_id] = cell
+        self.positions[agent_id] = (x, y)
+
+    def remove(self, agent_id: str):
+        cell = self._cell_of.pop(agent_id, None)
+        if cell is not None:
+            self._discard_from_cell(agent_id, cell)
+            del self.positions[agent_id]
+            self.version += 1
+
+    def clear(self):
+        self.cells.clear()
+        self.positions.clear()
+        self._cell_of.clear()
+        self.version += 1
+
+    def _discard_from_cell(self, agent_id: str, cell: Tuple[int, int]):
+        members = self.cells[cell]
+        members.discard(agent_id)
+        if not members:
+            del self.cells[cell]
+
+    def tracks(self, agent_id: str) -> bool:
+        return agent_id in self._cell_of
+
+    def neighbours(self, agent_id: Optional[str]) -> Optional[List[str]]:
+        """Tracked agents within range of agent_id (excluding it), or None if agent_id is untracked."""
+        position = self.positions.get(agent_id)
+        if position is None:
+            return None
+        x, y = position
+        cx, cy = self._cell_of[agent_id]
+        nearby = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for other in self.cells.get((cx + dx, cy + dy), ()):
+                    if other == agent_id:
+                        continue
+                    ox, oy = self.positions[other]
+                    if (ox - x) ** 2 + (oy - y) ** 2 <= self._range_sq:
+                        nearby.append(other)
+        return nearby
@@ -0,0 +1,213 @@
+"""Message bus transports: ZeroMQ PUB/SUB and a zero-copy in-process queue."""
+import asyncio
+import logging
+import struct
+import time
+from typing import Any, List, Optional, Tuple
+import zmq
+import zmq.asyncio
+
+from comms.codec import JsonCodec, CodecRegistry
+
+logger = logging.getLogger(__name__)
+
+
+def message_field(message: Any, name: str, default: Any = None) -> Any:
+    """Read a field from either a message dict or a Message object."""
+    if isinstance(message, dict):
+        return message.get(name, default)
+    return getattr(message, name, default)
+
+
+def message_as_dict(message: Any) -> dict:
+    """Dict form of a message, for logging, recording and the dashboard."""
+    return message if isinstance(message, dict) else message.to_dict()
+
+
+# What receive() yields per message: (message, wall-clock send time, wire bytes)
+Envelope = Tuple[Any, Optional[float], int]
+
+_STAMP = struct.Struct("<d")
+
+BROADCAST = "*"
+TOPIC_SEPARATOR = "|"
+
+
+def message_destination(message: Any) -> Optional[str]:
+    """Agent a message is addressed to (payload["target"]), or None for broadcasts."""
+    payload = message_field(message, "payload") or {}
+    target = payload.get("target") if isinstance(payload, dict) else None
+    return target if isinstance(target, str) else None
+
+
+def make_topic(destination: Optional[str], msg_type: str = "") -> str:
+    """
+    Frame topic "<destination>|<type>", destination "*" for broadcasts. Putting the
+    destination first lets ZMQ prefix subscriptions select either every broadcast
+    of a type ("*|HEARTBEAT") or all traffic for one agent ("DRONE-01|").
+    """
+    return f"{destination or BROADCAST}{TOPIC_SEPARATOR}{msg_type}"
+
+
+class ZmqTransport:
+    """
+    PUB/SUB socket pair; messages are encoded with the bus codec (JSON by default).
+    Frames are [topic, codec frame, send timestamp].
+    """
+
+    name = "zmq"
+
+    def __init__(self, context: Optional[zmq.asyncio.Context] = None, codec=None,
+                 send_hwm: int = 1000, recv_hwm: int = 1000, max_batch: int = 256):
+        self.context = context or zmq.asyncio.Context()
+        self.codec = codec or JsonCodec()
+        self.codecs = CodecRegistry()
+        self.send_hwm = send_hwm
+        self.recv_hwm = recv_hwm
+        self.max_batch = max_batch
+        self.pub_socket: Optional[zmq.asyncio.Socket] = None
+        self.sub_socket: Optional[zmq.asyncio.Socket] = None
+        self.subscriptions: set = set()
+
+    @property
+    def started(self) -> bool:
+        return self.pub_socket is not None
+
+    async def start(self, address: str, sub_address: Optional[str] = None):
+        """
+        Without sub_address, bind PUB to address and connect SUB to it (single
+        process). With sub_address, connect PUB to a proxy's XSUB at address and
+        SUB to its XPUB at sub_address, so buses in several processes share traffic.
+        """
+        self.pub_socket = self.context.socket(zmq.PUB)
+        self.sub_socket = self.context.socket(zmq.SUB)
+        self.pub_socket.setsockopt(zmq.SNDHWM, self.send_hwm)
+        # Report a full queue to the sender instead of silently dropping at the HWM
+        self.pub_socket.setsockopt(zmq.XPUB_NODROP, 1)
+        self.sub_socket.setsockopt(zmq.RCVHWM, self.recv_hwm)
+        if sub_address:
+            self.pub_socket.connect(address)
+            self.sub_socket.connect(sub_address)
+        else:
+            self.pub_socket.bind(address)
+            self.sub_socket.connect(address)
+        for prefix in self.subscriptions:
+            self.sub_socket.setsockopt_string(zmq.SUBSCRIBE, prefix)
+        # Give the SUB socket time to connect before the first publish
+        await asyncio.sleep(0.1)
+
+    async def stop(self):
+        if self.pub_socket:
+            self.pub_socket.close()
+        if self.sub_socket:
+            self.sub_socket.close()
+        self.pub_socket = None
+        self.sub_socket = None
+
+    def subscribe(self, prefix: str):
+        if prefix not in self.subscriptions:
+            self.subscriptions.add(prefix)
+            if self.sub_socket:
+                self.sub_socket.setsockopt_string(zmq.SUBSCRIBE, prefix)
+
+    def unsubscribe(self, prefix: str):
+        if prefix in self.subscriptions:
+            self.subscriptions.discard(prefix)
+            if self.sub_socket:
+                self.sub_socket.setsockopt_string(zmq.UNSUBSCRIBE, prefix)
+
+    def _frames(self, message: Any, topic: str) -> List[bytes]:
+        frame = self.codecs.encode(self.codec, message_as_dict(message))
+        return [topic.encode("utf-8"), frame, _STAMP.pack(time.time())]
+
+    async def send(self, message: Any, topic: str) -> int:
+        """Send a message, waiting while the send queue is at its HWM; returns its size on the wire."""
+        frames = self._frames(message, topic)
+        # PUB always polls writable, so retry until the queue has room
+        delay = 0.0005
+        while True:
+            try:
+                await self.pub_socket.send_multipart(frames, flags=zmq.NOBLOCK)
+                return sum(len(f) for f in frames)
+            except zmq.Again:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.01)
+
+    async def try_send(self, message: Any, topic: str) -> Optional[int]:
+        """Send without waiting; returns None if the send queue is at its HWM."""
+        frames = self._frames(message, topic)
+        try:
+            await self.pub_socket.send_multipart(frames, flags=zmq.NOBLOCK)
+        except zmq.Again:
+            return None
+        return sum(len(f) for f in frames)
+
+    def _envelope(self, frames: List[bytes]) -> Envelope:
+        sent_at = _STAMP.unpack(frames[2])[0] if len(frames) > 2 else None
+        return (self.codecs.decode(frames[1]), sent_at, sum(len(f) for f in frames))
+
+    async def receive(self) -> List[Envelope]:
+        """Wait up to 100 ms for a message, then drain up to max_batch readable ones."""
+        if not await self.sub_socket.poll(timeout=100):
+            return []
+        batch = [self._envelope(await self.sub_socket.recv_multipart())]
+        while len(batch) < self.max_batch:
+            try:
+                frames = await self.sub_socket.recv_multipart(flags=zmq.NOBLOCK)
+            except zmq.Again:
+                break
+            batch.append(self._envelope(frames))
+        return batch
+
+
+class LocalTransport:
+    """
+    In-process asyncio queue. Published objects are handed to handlers as-is,
+    with no encoding, decoding or socket hop, so handlers must treat them as
+    read-only. send_hwm bounds the queue (0 means unbounded).
+    """
+
+    name = "local"
+
+    def __init__(self, send_hwm: int = 0, max_batch: int = 256):
+        self.send_hwm = send_hwm
+        self.max_batch = max_batch
+        self.queue: Optional[asyncio.Queue] = None
+
+    @property
+    def started(self) -> bool:
+        return self.queue is not None
+
+    async def start(self, address: str, sub_address: Optional[str] = None):
+        self.queue = asyncio.Queue(maxsize=self.send_hwm)
+
+    async def stop(self):
+        self.queue = None
+
+    def subscribe(self, prefix: str):
+        """Routing happens in MessageBus dispatch; nothing to filter here."""
+
+    def unsubscribe(self, prefix: str):
+        pass
+
+    async def send(self, message: Any, topic: str) -> int:
+        await self.queue.put((message, time.time(), 0))
+        return 0
+
+    async def try_send(self, message: Any, topic: str) -> Optional[int]:
+        if self.queue.full():
+            return None
+        self.queue.put_nowait((message, time.time(), 0))
+        return 0
+
+    async def receive(self) -> List[Envelope]:
+        batch = [await self.queue.get()]
+        while len(batch) < self.max_batch and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+
+TRANSPORTS = {
+    ZmqTransport.name: ZmqTransport,
+    LocalTransport.name: LocalTransport,
+}
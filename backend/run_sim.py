@@ -12,6 +12,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from sim.environment import SimulationEnvironment, SimulationConfig
 from sim.metrics import MetricsTracker
 from comms.message_bus import MessageBus
+from comms.flow_control import FlowControl
 
 logging.basicConfig(
     level=logging.INFO,
@@ -89,6 +90,71 @@ Examples:
         help='Replay simulation from JSON file'
     )
     
+    parser.add_argument(
+        '--transport',
+        type=str,
+        default='zmq',
+        choices=['zmq', 'local'],
+        help='Message bus transport (local skips serialization for in-process agents)'
+    )
+    
+    parser.add_argument(
+        '--codec',
+        type=str,
+        default='json',
+        choices=['json', 'msgpack', 'packed'],
+        help='Wire codec for the zmq transport'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        help='Host drones in this many worker processes (0 = single process)'
+    )
+    
+    parser.add_argument(
+        '--worker-transport',
+        type=str,
+        default='ipc',
+        choices=['ipc', 'tcp'],
+        help='Socket transport between worker processes'
+    )
+    
+    parser.add_argument(
+        '--comm-range',
+        type=float,
+        default=None,
+        help='Radio range in tiles; broadcasts only reach drones this close (default: unlimited)'
+    )
+    
+    parser.add_argument(
+        '--no-reallocation',
+        action='store_true',
+        help='Keep the initial tile split; the ground agent never re-plans zones'
+    )
+    
+    parser.add_argument(
+        '--regions',
+        type=int,
+        default=0,
+        help='Regional coordinators per side under the ground agent (e.g. 4 for 4x4; 0 = none)'
+    )
+    
+    parser.add_argument(
+        '--send-hwm',
+        type=int,
+        default=1000,
+        help='Bus send high-water mark (messages queued before drop/backpressure)'
+    )
+    
+    parser.add_argument(
+        '--recv-hwm',
+        type=int,
+        default=1000,
+        help='Bus receive high-water mark'
+    )
+    
     parser.add_argument(
         '--verbose',
         '-v',
@@ -98,12 +164,19 @@ Examples:
     
     return parser.parse_args()
 
-async def run_simulation(config: SimulationConfig, record_file: str = None):
+async def run_simulation(
+    config: SimulationConfig,
+    record_file: str = None,
+    transport: str = "zmq",
+    codec: str = "json",
+    workers: int = 0,
+    worker_transport: str = "ipc",
+    flow: FlowControl = None
+):
     import zmq.asyncio
 
     context = zmq.asyncio.Context()
-    message_bus = MessageBus(context)
-    await message_bus.start()
+    message_bus = MessageBus(context, transport="zmq" if workers else transport, codec=codec, flow=flow)
 
     metrics = MetricsTracker(
         total_targets=config.num_targets,
@@ -111,7 +184,13 @@ async def run_simulation(config: SimulationConfig, record_file: str = None):
         total_agents=config.num_agents
     )
 
-    sim = SimulationEnvironment(config, message_bus)
+    if workers:
+        from sim.multiprocess import MultiProcessSimulation
+        sim = MultiProcessSimulation(config, message_bus, workers, worker_transport)
+        await sim.start_bus()
+    else:
+        await message_bus.start()
+        sim = SimulationEnvironment(config, message_bus)
     sim.initialize_agents()
 
     if record_file:
@@ -120,32 +199,25 @@ async def run_simulation(config: SimulationConfig, record_file: str = None):
 
     def on_message(msg):
         metrics.record_message(msg.get("type", ""))
-        if msg.get("type") == "TARGET_FOUND":
-            metrics.record_target_found()
     
     message_bus.on_message_callback = on_message
+    message_bus.on_latency_callback = metrics.record_message_latency
 
-    def on_state_update(state):
-        metrics.update(
-            tick=state["state"]["tick"],
-            agents=state["agents"],
-            visited_count=len(state["grid"]["visited_tiles"]),
-            targets_found=len(state["grid"]["target_positions"]),
-            msg_stats=state["message_stats"]
-        )
+    def on_world_update(update):
+        metrics.apply_world_update(update)
 
-        if state["state"]["tick"] % 10 == 0:
+        if update.tick % 10 == 0:
             current = metrics.get_current_metrics()
             logger.info(
                 "Tick %d | Coverage: %.1f%% | Targets: %d/%d | Messages: %d",
-                state["state"]["tick"],
+                update.tick,
                 current["coverage_percent"],
                 current["targets_found"],
                 current["total_targets"],
                 current["total_messages"]
             )
     
-    sim.on_state_update = on_state_update
+    sim.add_world_listener(on_world_update)
     metrics.start()
 
     logger.info("=" * 60)
@@ -178,7 +250,10 @@ async def run_simulation(config: SimulationConfig, record_file: str = None):
         sim.save_replay(record_file)
         logger.info("Replay saved to: %s", record_file)
 
-    await message_bus.stop()
+    if workers:
+        await sim.shutdown()
+    else:
+        await message_bus.stop()
     context.term()
     
     return summary
@@ -242,7 +317,10 @@ def main():
             num_agents=8,
             num_targets=10,
             duration_seconds=args.duration,
-            seed=args.seed
+            seed=args.seed,
+            comm_range=args.comm_range,
+            ground_reallocation=not args.no_reallocation,
+            ground_regions=args.regions
         )
     elif args.scenario == 'minimal':
         config = SimulationConfig(
@@ -251,7 +329,10 @@ def main():
             num_agents=2,
             num_targets=2,
             duration_seconds=min(args.duration, 60),
-            seed=args.seed
+            seed=args.seed,
+            comm_range=args.comm_range,
+            ground_reallocation=not args.no_reallocation,
+            ground_regions=args.regions
         )
     else:  # rescue_seeded (default)
         config = SimulationConfig(
@@ -260,10 +341,16 @@ def main():
             num_agents=args.agents,
             num_targets=args.targets,
             duration_seconds=args.duration,
-            seed=args.seed
+            seed=args.seed,
+            comm_range=args.comm_range,
+            ground_reallocation=not args.no_reallocation,
+            ground_regions=args.regions
         )
 
-    asyncio.run(run_simulation(config, args.record))
+    flow = FlowControl(send_hwm=args.send_hwm, recv_hwm=args.recv_hwm)
+    asyncio.run(run_simulation(
+        config, args.record, args.transport, args.codec, args.workers, args.worker_transport, flow
+    ))
 
 if __name__ == "__main__":
     main()
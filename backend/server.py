@@ -53,6 +53,9 @@ class SimulationConfigModel(BaseModel):
     seed: int = Field(default=42)
     tick_interval: float = Field(default=0.5, ge=0.1, le=2.0)
     detection_probability: float = Field(default=0.7, ge=0.1, le=1.0)
+    transport: str = Field(default="zmq", pattern="^(zmq|local)$")
+    codec: str = Field(default="json", pattern="^(json|msgpack|packed)$")
+    comm_range: Optional[float] = Field(default=None, gt=0)
 
 class SimulationCommand(BaseModel):
     action: str
@@ -76,10 +79,23 @@ async def get_metrics():
     return {"status": "not_initialized"}
 
 @api_router.get("/simulation/metrics/history")
-async def get_metrics_history():
-    """Metrics history."""
-    if simulation_state["metrics"]:
-        return {"history": simulation_state["metrics"].get_history()}
+async def get_metrics_history(
+    since: Optional[float] = Query(default=None, ge=0, description="Seconds back from the latest sample"),
+    points: int = Query(default=500, ge=1, le=5000),
+    full: bool = Query(default=False, description="Every stored sample instead of at most `points`"),
+    columnar: bool = False
+):
+    """
+    Metrics history, downsampled to at most `points` (500 by default) unless
+    `full` is set (columnar adds per-bucket min/max).
+    """
+    metrics = simulation_state["metrics"]
+    if full:
+        points = None
+    if columnar:
+        return metrics.query_history(since=since, points=points) if metrics else {"fields": {}}
+    if metrics:
+        return {"history": metrics.get_history(since=since, points=points)}
     return {"history": []}
 
 @api_router.get("/simulation/messages")
@@ -87,6 +103,18 @@ async def get_messages(limit: int = Query(default=50, le=200)):
     """Recent A2A messages."""
     return {"messages": simulation_state["message_log"][-limit:]}
 
+@api_router.get("/simulation/bus-stats")
+async def get_bus_stats():
+    """Message bus latency, handler time, queue depth and throughput."""
+    stats = {}
+    if simulation_state["message_bus"]:
+        stats["bus"] = simulation_state["message_bus"].get_stats()
+    if simulation_state["sim"]:
+        stats["outbound"] = simulation_state["sim"].outbound.get_stats()
+    if simulation_state["broadcaster"]:
+        stats["dashboard"] = simulation_state["broadcaster"].get_stats()
+    return stats or {"status": "not_initialized"}
+
 @api_router.get("/simulation/ground-agent")
 async def get_ground_agent_state():
     """Get ground agent status and statistics."""
@@ -122,7 +150,9 @@ async def initialize_simulation(config: SimulationConfigModel):
             await cleanup_simulation()
 
         simulation_state["zmq_context"] = zmq.asyncio.Context()
-        message_bus = MessageBus(simulation_state["zmq_context"])
+        message_bus = MessageBus(
+            simulation_state["zmq_context"], transport=config.transport, codec=config.codec
+        )
         await message_bus.start()
         simulation_state["message_bus"] = message_bus
 
@@ -134,7 +164,8 @@ async def initialize_simulation(config: SimulationConfigModel):
             duration_seconds=config.duration_seconds,
             seed=config.seed,
             tick_interval=config.tick_interval,
-            detection_probability=config.detection_probability
+            detection_probability=config.detection_probability,
+            comm_range=config.comm_range
         )
 
         metrics = MetricsTracker(
@@ -156,22 +187,17 @@ async def initialize_simulation(config: SimulationConfigModel):
                 simulation_state["message_log"] = simulation_state["message_log"][-200:]
             
             metrics.record_message(msg.get("type", ""))
-            if msg.get("type") == "TARGET_FOUND":
-                metrics.record_target_found()
 
-            asyncio.create_task(simulation_state["broadcaster"].broadcast_message(msg))
+            simulation_state["broadcaster"].queue_message(msg)
 
         message_bus.on_message_callback = on_message
+        message_bus.on_latency_callback = metrics.record_message_latency
+
+        # Metrics follow each tick's changes rather than rescanning the full state
+        sim.add_world_listener(metrics.apply_world_update)
 
         def on_state_update(state):
-            metrics.update(
-                tick=state["state"]["tick"],
-                agents=state["agents"],
-                visited_count=len(state["grid"]["visited_tiles"]),
-                targets_found=len(state["grid"]["target_positions"]),
-                msg_stats=state["message_stats"]
-            )
-            asyncio.create_task(simulation_state["broadcaster"].broadcast_state(state))
+            asyncio.create_task(simulation_state["broadcaster"].broadcast_tick(state))
 
         sim.on_state_update = on_state_update
         
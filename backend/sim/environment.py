@@ -9,6 +9,12 @@ from dataclasses import dataclass, field
 from pathlib import Path
 
 from agents.drone_agent import DroneAgent, Position, Message, DroneState
+from agents.ground_agent import GroundAgent
+from agents.regional import RegionalHierarchy
+from agents.world_state import WorldUpdate
+from comms.outbound import OutboundPump
+from comms.spatial_hash import SpatialHash
+from sim.zone_allocator import ZoneAllocator
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +29,10 @@ class SimulationConfig:
     seed: int = 42
     tick_interval: float = 0.5
     detection_probability: float = 0.7
+    comm_range: Optional[float] = None  # radio range in tiles; None = unlimited
+    ground_agent: bool = True
+    ground_reallocation: bool = True  # ground re-plans zones when drones idle, die or run low
+    ground_regions: int = 0  # regional coordinators per side under the ground agent; 0 = none
     
     def to_dict(self) -> dict:
         return {
@@ -33,7 +43,11 @@ class SimulationConfig:
             "duration_seconds": self.duration_seconds,
             "seed": self.seed,
             "tick_interval": self.tick_interval,
-            "detection_probability": self.detection_probability
+            "detection_probability": self.detection_probability,
+            "comm_range": self.comm_range,
+            "ground_agent": self.ground_agent,
+            "ground_reallocation": self.ground_reallocation,
+            "ground_regions": self.ground_regions
         }
 
 @dataclass
@@ -78,6 +92,20 @@ class SimulationEnvironment:
         self.recording = False
         self.replay_log: List[dict] = []
         self.on_state_update: Optional[Callable[[dict], None]] = None
+        self.world_listeners: List[Callable[[WorldUpdate], None]] = []
+        self._agent_snapshots: Dict[str, dict] = {}
+        self._reported_targets: Dict[str, int] = {}
+        self._tick_started = 0.0
+        self.outbound = OutboundPump(message_bus)
+        self.comm_hash: Optional[SpatialHash] = None
+        if config.comm_range:
+            self.comm_hash = SpatialHash(config.comm_range)
+            message_bus.range_filter = self.comm_hash
+        self.ground_agent: Optional[GroundAgent] = None
+        # What the bus, world feed and tick loop talk to: the ground agent or its regional hierarchy
+        self.ground_control = None
+        if config.ground_agent:
+            self._create_ground_agent()
         self._initialize_grid()
         self._place_targets()
     
@@ -95,7 +123,7 @@ class SimulationEnvironment:
     
     def _create_agent(self, agent_id: str, start_pos: Position) -> DroneAgent:
         def send_message(msg: Message):
-            asyncio.create_task(self.message_bus.publish(msg.to_dict()))
+            self.outbound.send(msg)
         
         agent = DroneAgent(
             agent_id=agent_id,
@@ -106,18 +134,68 @@ class SimulationEnvironment:
             detection_probability=self.config.detection_probability
         )
 
-        def handle_message(msg_dict: dict):
-            msg = Message.from_dict(msg_dict)
+        def handle_message(msg):
+            # The local transport delivers Message objects; ZMQ delivers decoded dicts
+            if not isinstance(msg, Message):
+                msg = Message.from_dict(msg)
             agent.receive_message(msg)
         
-        self.message_bus.register_handler(agent_id, handle_message)
+        self.message_bus.register_handler(agent_id, handle_message, DroneAgent.SUBSCRIBED_MESSAGES)
         
         return agent
     
+    def _create_ground_agent(self):
+        """(Re)create the ground station; it hears drones over the bus and the world feed."""
+        if self.ground_agent:
+            self.message_bus.unregister_handler(self.ground_agent.agent_id)
+            self.world_listeners.remove(self.ground_control.apply_world_update)
+        
+        def make_allocator():
+            return ZoneAllocator(
+                self.grid_width,
+                self.grid_height,
+                battery_reserve=DroneAgent.CRITICAL_BATTERY,
+                battery_per_tile=DroneAgent.BATTERY_DRAIN_MOVE + DroneAgent.BATTERY_DRAIN_SCAN
+            )
+        
+        regional = self.config.ground_regions > 1
+        ground = GroundAgent(
+            agent_id="GROUND",
+            grid_size=(self.grid_width, self.grid_height),
+            send_message_callback=self.outbound.send,
+            allocator=make_allocator() if self.config.ground_reallocation and not regional else None
+        )
+        control = ground
+        if regional:
+            control = RegionalHierarchy(
+                ground,
+                self.config.ground_regions,
+                self.outbound.send,
+                allocator_factory=make_allocator if self.config.ground_reallocation else None
+            )
+        
+        def handle_message(msg):
+            if not isinstance(msg, Message):
+                msg = Message.from_dict(msg)
+            control.receive_message(msg)
+        
+        self.message_bus.register_handler(ground.agent_id, handle_message, GroundAgent.SUBSCRIBED_MESSAGES)
+        self.world_listeners.append(control.apply_world_update)
+        self.ground_agent = ground
+        self.ground_control = control
+    
+    def add_world_listener(self, callback: Callable[[WorldUpdate], None]):
+        """Receive a WorldUpdate with each tick's changes."""
+        self.world_listeners.append(callback)
+    
     def initialize_agents(self):
         for agent_id in list(self.agents.keys()):
             self.message_bus.unregister_handler(agent_id)
         self.agents.clear()
+        self._agent_snapshots.clear()
+        self._reported_targets.clear()
+        if self.comm_hash is not None:
+            self.comm_hash.clear()
 
         start_positions = [
             Position(0, 0),
@@ -147,6 +225,7 @@ class SimulationEnvironment:
         
         agent_list = list(self.agents.values())
         tiles_per_agent = len(tiles_list) // len(agent_list)
+        allocation = {}
         
         for i, agent in enumerate(agent_list):
             start_idx = i * tiles_per_agent
@@ -154,7 +233,11 @@ class SimulationEnvironment:
             agent_tiles = tiles_list[start_idx:end_idx]
             agent.assign_tiles(agent_tiles)
             self.assigned_tiles.update(agent_tiles)
+            allocation[agent.agent_id] = agent_tiles
             logger.info("Assigned %d tiles to %s", len(agent_tiles), agent.agent_id)
+        
+        if self.ground_control:
+            self.ground_control.seed_allocation(allocation)
     
     async def start(self):
         if self.state.is_running:
@@ -181,10 +264,13 @@ class SimulationEnvironment:
                 break
 
             current_time = self.state.elapsed_time
-            for agent in self.agents.values():
-                await agent.tick(current_time, self.target_positions)
+            self._tick_started = time.perf_counter()
+            await self._tick_agents(current_time)
+            await self.flush_messages()
 
             self._update_state()
+            if self.ground_control:
+                await self.ground_control.tick(current_time)
             if self.on_state_update:
                 self.on_state_update(self.get_full_state())
 
@@ -198,18 +284,77 @@ class SimulationEnvironment:
             self.state.tick += 1
             await asyncio.sleep(self.config.tick_interval)
     
+    async def _tick_agents(self, current_time: float):
+        for agent in self.agents.values():
+            await agent.tick(current_time, self.target_positions)
+        self._update_comm_positions()
+    
+    def _update_comm_positions(self):
+        """Refresh radio positions before this tick's messages are published."""
+        if self.comm_hash is not None:
+            for agent in self.agents.values():
+                self.comm_hash.update(agent.agent_id, agent.position.x, agent.position.y)
+    
+    async def flush_messages(self):
+        """Publish every message agents have sent so far, in send order."""
+        await self.outbound.flush()
+    
     def _update_state(self):
-        self.visited_tiles.clear()
-        all_targets_found = set()
+        """Fold this tick's visits and discoveries in, costing O(agents) rather than O(visited)."""
+        new_visits = self._absorb_new_visits()
         
+        discoveries = []
+        inference_ms = []
         for agent in self.agents.values():
-            self.visited_tiles.update(agent.visited_tiles)
-            for target in agent.targets_found:
-                all_targets_found.add(target)
+            reported = self._reported_targets.get(agent.agent_id, 0)
+            for target in agent.targets_found[reported:]:
+                if target not in self.discovered_targets:
+                    self.discovered_targets.add(target)
+                    discoveries.append((agent.agent_id, target))
+            self._reported_targets[agent.agent_id] = len(agent.targets_found)
+            if agent.inference_ms:
+                inference_ms.extend(agent.inference_ms)
+                agent.inference_ms.clear()
 
         self.state.coverage_percent = (len(self.visited_tiles) / self.total_tiles) * 100
-        self.discovered_targets = all_targets_found
-        self.state.targets_found = list(all_targets_found)
+        self.state.targets_found = list(self.discovered_targets)
+        
+        if self.world_listeners:
+            self._publish_world_update(new_visits, discoveries, inference_ms)
+    
+    def _absorb_new_visits(self) -> List[tuple]:
+        """Tiles first visited this tick. A drone only ever marks the tile it ends its tick on."""
+        new_visits = []
+        for agent in self.agents.values():
+            pos = (agent.position.x, agent.position.y)
+            if pos not in self.visited_tiles and pos in agent.visited_tiles:
+                self.visited_tiles.add(pos)
+                new_visits.append(pos)
+        return new_visits
+    
+    def _publish_world_update(self, new_visits: List[tuple], discoveries: List[tuple], inference_ms: List[float]):
+        agent_changes = {}
+        for agent in self.agents.values():
+            current = agent.get_state()
+            previous = self._agent_snapshots.get(agent.agent_id)
+            if previous is None:
+                agent_changes[agent.agent_id] = current
+            else:
+                changed = {k: v for k, v in current.items() if previous.get(k) != v}
+                if changed:
+                    agent_changes[agent.agent_id] = changed
+            self._agent_snapshots[agent.agent_id] = current
+        
+        update = WorldUpdate(
+            self.state.tick, self.state.elapsed_time, new_visits, agent_changes, discoveries,
+            tick_ms=(time.perf_counter() - self._tick_started) * 1000 if self._tick_started else 0.0,
+            inference_ms=inference_ms
+        )
+        for callback in self.world_listeners:
+            try:
+                callback(update)
+            except Exception as e:
+                logger.error("World listener error: %s", e)
     
     async def stop(self):
         self.state.is_running = False
@@ -232,9 +377,12 @@ class SimulationEnvironment:
         self.discovered_targets.clear()
         self.visited_tiles.clear()
         self.replay_log.clear()
+        self.outbound.clear()
         self.rng = random.Random(self.config.seed)
         self._initialize_grid()
         self._place_targets()
+        if self.ground_agent:
+            self._create_ground_agent()
         self.initialize_agents()
         
         logger.info("Simulation reset")
@@ -252,7 +400,8 @@ class SimulationEnvironment:
                 "target_positions": [{"x": t[0], "y": t[1]} for t in self.target_positions],  # ✅ Correct
                 "discovered_targets": [{"x": t[0], "y": t[1]} for t in self.discovered_targets]
             },
-            "message_stats": self.message_bus.get_stats()
+            "message_stats": self.message_bus.get_stats(),
+            "outbound_stats": self.outbound.get_stats()
         }
     
     def start_recording(self, filename: Optional[str] = None):
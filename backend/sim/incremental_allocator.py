@@ -0,0 +1,337 @@
+"""Incremental Voronoi zone allocation that only re-examines tiles affected by drone changes."""
+import logging
+from typing import List, Dict, Set, Tuple, Optional
+from dataclasses import dataclass, field
+from collections import defaultdict
+from itertools import chain
+import numpy as np
+
+from sim.zone_allocator import ZoneAllocator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TileMove:
+    """A single tile changing owner. `from_drone` is None for newly allocated tiles."""
+    tile: Tuple[int, int]
+    from_drone: Optional[str]
+    to_drone: Optional[str]
+
+    def to_dict(self) -> dict:
+        return {
+            "tile": {"x": self.tile[0], "y": self.tile[1]},
+            "from_drone": self.from_drone,
+            "to_drone": self.to_drone
+        }
+
+
+@dataclass
+class AllocationDiff:
+    """Changes produced by one incremental update."""
+    moves: List[TileMove] = field(default_factory=list)
+    released: List[Tuple[int, int]] = field(default_factory=list)
+    full: bool = False
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def by_receiver(self) -> Dict[str, List[Tuple[int, int]]]:
+        """Tiles gained per drone."""
+        gained = defaultdict(list)
+        for move in self.moves:
+            if move.to_drone is not None:
+                gained[move.to_drone].append(move.tile)
+        return dict(gained)
+
+    def by_transfer(self) -> Dict[Tuple[Optional[str], Optional[str]], List[Tuple[int, int]]]:
+        """Tiles grouped by (from_drone, to_drone) pair, one entry per handoff."""
+        transfers = defaultdict(list)
+        for move in self.moves:
+            transfers[(move.from_drone, move.to_drone)].append(move.tile)
+        return dict(transfers)
+
+    def to_dict(self) -> dict:
+        return {
+            "full": self.full,
+            "moves": [move.to_dict() for move in self.moves],
+            "released": [{"x": t[0], "y": t[1]} for t in self.released]
+        }
+
+
+class IncrementalZoneAllocator:
+    """
+    Keeps the previous Voronoi allocation and per-tile owner distance, and on each
+    update only re-examines tiles whose answer can have changed:
+
+    - tiles owned by a drone that moved, changed battery factor, died or revived
+      are recomputed against all active drones;
+    - other tiles are compared only against the changed drones, and move only
+      where a changed drone now beats the stored owner distance. A drone gains
+      tiles outward from its zone, so the challenge starts at the tiles
+      bordering the changed drones' zones (and positions) and spreads only
+      through tiles they win, instead of checking every unvisited tile.
+
+    move_tolerance ignores movement up to that Manhattan distance from the
+    position last used, and factor_tolerance ignores battery drift below that
+    factor delta, so normal flight and a draining fleet do not invalidate
+    zones on every tick. With both tolerances at 0 every tile is challenged
+    and the result equals ZoneAllocator.allocate_zones_voronoi. Otherwise a
+    piece of a zone cut off from the rest (by visited tiles, or by a weaker
+    drone's zone) can keep its old owner, so every `refresh_interval` updates
+    all tiles are recomputed.
+    """
+
+    DEAD_BATTERY = 5.0
+
+    def __init__(
+        self,
+        grid_width: int,
+        grid_height: int,
+        factor_tolerance: float = 0.05,
+        move_tolerance: int = 2,
+        refresh_interval: int = 25
+    ):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.factor_tolerance = factor_tolerance
+        self.move_tolerance = move_tolerance
+        self.refresh_interval = refresh_interval
+        self.exact = factor_tolerance == 0 and move_tolerance == 0
+        self.allocator = ZoneAllocator(grid_width, grid_height)
+
+        n_tiles = grid_width * grid_height
+        xs, ys = np.divmod(np.arange(n_tiles), grid_height)
+        self._tile_coords = np.stack([xs, ys], axis=1).astype(np.int64)
+        self._owner = np.full(n_tiles, -1, dtype=np.intp)
+        self._best = np.full(n_tiles, np.inf, dtype=np.float64)
+        self._unvisited = np.zeros(n_tiles, dtype=bool)
+
+        self._drone_ids: List[str] = []
+        self._drone_index: Dict[str, int] = {}
+        self._positions = np.zeros((0, 2), dtype=np.int64)
+        self._factors = np.zeros(0, dtype=np.float64)
+        self._active = np.zeros(0, dtype=bool)
+        self._initialized = False
+
+        self.stats = {"updates": 0, "tiles_examined": 0, "tiles_moved": 0}
+
+    def reset(self):
+        """Forget all state; the next update is a full allocation."""
+        self.__init__(
+            self.grid_width, self.grid_height,
+            self.factor_tolerance, self.move_tolerance, self.refresh_interval
+        )
+
+    def _tile_index(self, tiles) -> np.ndarray:
+        if not tiles:
+            return np.zeros(0, dtype=np.intp)
+        coords = np.fromiter(chain.from_iterable(tiles), dtype=np.intp, count=2 * len(tiles))
+        return coords[0::2] * self.grid_height + coords[1::2]
+
+    def _register_drone(self, drone_id: str) -> int:
+        index = len(self._drone_ids)
+        self._drone_ids.append(drone_id)
+        self._drone_index[drone_id] = index
+        self._positions = np.vstack([self._positions, np.zeros((1, 2), dtype=np.int64)])
+        self._factors = np.append(self._factors, 1.0)
+        self._active = np.append(self._active, False)
+        return index
+
+    def _update_drones(
+        self,
+        drone_positions: Dict[str, Tuple[int, int]],
+        drone_batteries: Dict[str, float]
+    ) -> np.ndarray:
+        """Apply drone changes and return the indices of drones that changed."""
+        changed = []
+
+        for drone_id, pos in drone_positions.items():
+            index = self._drone_index.get(drone_id)
+            if index is None:
+                index = self._register_drone(drone_id)
+
+            battery = drone_batteries.get(drone_id, 0)
+            active = battery > self.DEAD_BATTERY
+            factor = max(0.5, drone_batteries.get(drone_id, 100) / 100.0)
+            step = int(abs(self._positions[index, 0] - pos[0]) + abs(self._positions[index, 1] - pos[1]))
+            moved = step > self.move_tolerance
+            drifted = abs(factor - self._factors[index]) > self.factor_tolerance
+
+            if active != self._active[index] or (active and (moved or drifted)):
+                changed.append(index)
+                self._active[index] = active
+                self._positions[index] = pos
+                self._factors[index] = factor
+
+        # Drones that disappeared from the input are treated as dead
+        for drone_id, index in self._drone_index.items():
+            if drone_id not in drone_positions and self._active[index]:
+                self._active[index] = False
+                changed.append(index)
+
+        return np.array(sorted(changed), dtype=np.intp)
+
+    def update(
+        self,
+        drone_positions: Dict[str, Tuple[int, int]],
+        unvisited_tiles: Set[Tuple[int, int]],
+        drone_batteries: Dict[str, float]
+    ) -> AllocationDiff:
+        """
+        Bring the allocation up to date and return the tile moves it caused.
+
+        Args:
+            drone_positions: {drone_id: (x, y)}
+            unvisited_tiles: Set of (x, y) tiles not yet visited
+            drone_batteries: {drone_id: battery_level}
+
+        Returns:
+            AllocationDiff with moved tiles and tiles released because they were visited
+        """
+        diff = AllocationDiff(full=not self._initialized)
+        changed = self._update_drones(drone_positions, drone_batteries)
+
+        unvisited = np.zeros_like(self._unvisited)
+        unvisited[self._tile_index(unvisited_tiles)] = True
+
+        released = self._unvisited & ~unvisited
+        diff.released = [tuple(int(c) for c in self._tile_coords[i]) for i in np.flatnonzero(released)]
+        self._owner[released] = -1
+        self._best[released] = np.inf
+
+        added = unvisited & ~self._unvisited
+        self._unvisited = unvisited
+
+        previous_owner = self._owner.copy()
+        changed_mask = np.zeros(len(self._drone_ids), dtype=bool)
+        changed_mask[changed] = True
+        owned_by_changed = np.zeros_like(unvisited)
+        owned = self._owner >= 0
+        owned_by_changed[owned] = changed_mask[self._owner[owned]]
+
+        refresh = (
+            not self.exact and self.refresh_interval > 0
+            and (self.stats["updates"] + 1) % self.refresh_interval == 0
+        )
+        recompute = unvisited if refresh else unvisited & (added | owned_by_changed)
+        self._recompute(np.flatnonzero(recompute))
+
+        changed_active = changed[self._active[changed]] if len(changed) else changed
+        if len(changed_active) and not refresh:
+            if self.exact:
+                self._challenge(np.flatnonzero(unvisited & ~recompute), changed_active)
+            else:
+                self._challenge_boundary(changed_active, unvisited & ~recompute)
+
+        for i in np.flatnonzero(self._owner != previous_owner):
+            if not unvisited[i]:
+                continue
+            old, new = previous_owner[i], self._owner[i]
+            diff.moves.append(TileMove(
+                tile=(int(self._tile_coords[i, 0]), int(self._tile_coords[i, 1])),
+                from_drone=self._drone_ids[old] if old >= 0 else None,
+                to_drone=self._drone_ids[new] if new >= 0 else None
+            ))
+
+        self._initialized = True
+        self.stats["updates"] += 1
+        self.stats["tiles_moved"] += len(diff.moves)
+
+        logger.debug(
+            "Incremental allocation: %d changed drones, %d tiles moved, %d released",
+            len(changed), len(diff.moves), len(diff.released)
+        )
+
+        return diff
+
+    def _recompute(self, tile_indices: np.ndarray):
+        """Reassign tiles against every active drone."""
+        self.stats["tiles_examined"] += len(tile_indices)
+        if len(tile_indices) == 0:
+            return
+
+        active = np.flatnonzero(self._active)
+        if len(active) == 0:
+            self._owner[tile_indices] = -1
+            self._best[tile_indices] = np.inf
+            return
+
+        labels, distances = self.allocator.nearest_drone_labels(
+            self._tile_coords[tile_indices],
+            self._positions[active],
+            self._factors[active],
+            return_distances=True
+        )
+        self._owner[tile_indices] = active[labels]
+        self._best[tile_indices] = distances
+
+    def _neighbours(self, tile_indices: np.ndarray) -> np.ndarray:
+        """Distinct 4-neighbours of the given flat tile indices."""
+        xs, ys = self._tile_coords[tile_indices, 0], self._tile_coords[tile_indices, 1]
+        neighbours = [
+            tile_indices[xs > 0] - self.grid_height,
+            tile_indices[xs < self.grid_width - 1] + self.grid_height,
+            tile_indices[ys > 0] - 1,
+            tile_indices[ys < self.grid_height - 1] + 1
+        ]
+        return np.unique(np.concatenate(neighbours))
+
+    def _challenge_boundary(self, challengers: np.ndarray, open_tiles: np.ndarray):
+        """
+        Challenge outward from the challengers' zones: first the open tiles
+        bordering their zones and positions, then the neighbours of every tile
+        they win, until a ring of tiles is all kept by its owners.
+        """
+        in_zone = np.zeros(len(self._drone_ids), dtype=bool)
+        in_zone[challengers] = True
+        owned = np.flatnonzero(self._owner >= 0)
+        seeds = np.concatenate([
+            owned[in_zone[self._owner[owned]]],
+            self._positions[challengers, 0] * self.grid_height + self._positions[challengers, 1]
+        ])
+
+        examined = np.zeros(len(self._owner), dtype=bool)
+        examined[seeds] = True
+        while len(seeds):
+            ring = self._neighbours(seeds)
+            ring = ring[open_tiles[ring] & ~examined[ring]]
+            examined[ring] = True
+            seeds = self._challenge(ring, challengers)
+
+    def _challenge(self, tile_indices: np.ndarray, challengers: np.ndarray) -> np.ndarray:
+        """Move tiles whose stored owner is beaten by one of the changed drones; returns the moved tiles."""
+        self.stats["tiles_examined"] += len(tile_indices)
+        if len(tile_indices) == 0:
+            return tile_indices
+
+        labels, distances = self.allocator.nearest_drone_labels(
+            self._tile_coords[tile_indices],
+            self._positions[challengers],
+            self._factors[challengers],
+            return_distances=True
+        )
+        candidates = challengers[labels]
+        owners = self._owner[tile_indices]
+        best = self._best[tile_indices]
+
+        # Same tie-break as a full scan: equal distance goes to the lower drone index
+        wins = (distances < best) | ((distances == best) & ((candidates < owners) | (owners < 0)))
+        won = tile_indices[wins]
+        self._owner[won] = candidates[wins]
+        self._best[won] = distances[wins]
+        return won
+
+    def get_allocation(self) -> Dict[str, List[Tuple[int, int]]]:
+        """Materialize the current allocation as {drone_id: [tiles]}."""
+        allocation = {drone_id: [] for drone_id in self._drone_ids}
+        for i in np.flatnonzero(self._unvisited & (self._owner >= 0)):
+            allocation[self._drone_ids[self._owner[i]]].append(
+                (int(self._tile_coords[i, 0]), int(self._tile_coords[i, 1]))
+            )
+        return allocation
+
+    def owner_of(self, tile: Tuple[int, int]) -> Optional[str]:
+        """Current owner of a tile, or None if unowned or visited."""
+        owner = self._owner[tile[0] * self.grid_height + tile[1]]
+        return self._drone_ids[owner] if owner >= 0 else None
@@ -0,0 +1,205 @@
+"""Stateful K-means zone allocation with warm-started centroids and a cached tile array."""
+import logging
+from typing import List, Dict, Set, Tuple, Optional, Iterable
+from collections import defaultdict
+import numpy as np
+from sklearn.cluster import KMeans, MiniBatchKMeans
+
+from sim.zone_allocator import ZoneAllocator
+
+logger = logging.getLogger(__name__)
+
+
+class KMeansZoneAllocator:
+    """
+    K-means allocator for repeated reallocation during a mission.
+
+    Unlike ZoneAllocator.allocate_zones_kmeans, which fits from the drone
+    positions every call, this keeps each drone's last centroid and starts the
+    next fit from it, so a reallocation usually converges in one or two
+    iterations. Unvisited tile coordinates live in a cached array that is
+    updated in place as tiles are visited, and fits above
+    `minibatch_threshold` tiles use MiniBatchKMeans.
+    """
+
+    DEAD_BATTERY = 5.0
+    COMPACT_RATIO = 0.25  # Rebuild the tile array once this fraction is stale
+
+    def __init__(
+        self,
+        grid_width: int,
+        grid_height: int,
+        max_iter: int = 10,
+        minibatch_threshold: int = 5000,
+        batch_size: int = 1024,
+        random_state: int = 42
+    ):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.max_iter = max_iter
+        self.minibatch_threshold = minibatch_threshold
+        self.batch_size = batch_size
+        self.random_state = random_state
+        self.fallback = ZoneAllocator(grid_width, grid_height)
+
+        self._tiles: List[Tuple[int, int]] = []
+        self._tile_row: Dict[Tuple[int, int], int] = {}
+        self._tile_coords = np.zeros((0, 2), dtype=np.float64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._stale = 0
+        self._centroids: Dict[str, np.ndarray] = {}
+
+        self.stats = {"fits": 0, "warm_fits": 0, "minibatch_fits": 0, "iterations": 0}
+
+    @property
+    def tile_count(self) -> int:
+        return len(self._tiles) - self._stale
+
+    def set_tiles(self, tiles: Iterable[Tuple[int, int]]):
+        """Replace the cached tile set."""
+        self._tiles = list(tiles)
+        self._tile_row = {tile: row for row, tile in enumerate(self._tiles)}
+        self._tile_coords = np.array(self._tiles, dtype=np.float64).reshape(-1, 2)
+        self._alive = np.ones(len(self._tiles), dtype=bool)
+        self._stale = 0
+
+    def mark_visited(self, tiles: Iterable[Tuple[int, int]]):
+        """Drop visited tiles from the cached array without rebuilding it."""
+        for tile in tiles:
+            row = self._tile_row.pop(tile, None)
+            if row is not None:
+                self._alive[row] = False
+                self._stale += 1
+
+        if self._stale > self.COMPACT_RATIO * len(self._tiles):
+            self._compact()
+
+    def add_tiles(self, tiles: Iterable[Tuple[int, int]]):
+        """Add tiles that became unvisited again."""
+        new_tiles = [tile for tile in tiles if tile not in self._tile_row]
+        if not new_tiles:
+            return
+        start = len(self._tiles)
+        self._tiles.extend(new_tiles)
+        for offset, tile in enumerate(new_tiles):
+            self._tile_row[tile] = start + offset
+        self._tile_coords = np.vstack([self._tile_coords, np.array(new_tiles, dtype=np.float64)])
+        self._alive = np.append(self._alive, np.ones(len(new_tiles), dtype=bool))
+
+    def _compact(self):
+        self.set_tiles(tile for tile, alive in zip(self._tiles, self._alive) if alive)
+
+    def sync_tiles(self, unvisited_tiles: Set[Tuple[int, int]]):
+        """
+        Bring the cache in line with an unvisited set.
+
+        Finding the difference is a set comparison against every cached tile;
+        only the rows in it are then updated, without rebuilding the array.
+        Callers that already know which tiles changed should pass them to
+        mark_visited/add_tiles and allocate with unvisited_tiles=None.
+        """
+        if not self._tiles:
+            self.set_tiles(unvisited_tiles)
+            return
+        self.mark_visited(self._tile_row.keys() - unvisited_tiles)
+        self.add_tiles(unvisited_tiles - self._tile_row.keys())
+
+    def _initial_centroids(self, drone_ids: List[str], drone_positions: Dict[str, Tuple[int, int]]) -> np.ndarray:
+        return np.array(
+            [
+                self._centroids[drone_id] if drone_id in self._centroids
+                else np.asarray(drone_positions[drone_id], dtype=np.float64)
+                for drone_id in drone_ids
+            ],
+            dtype=np.float64
+        )
+
+    def allocate(
+        self,
+        drone_positions: Dict[str, Tuple[int, int]],
+        unvisited_tiles: Optional[Set[Tuple[int, int]]],
+        drone_batteries: Dict[str, float]
+    ) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Allocate zones with a warm-started K-means fit.
+
+        Args:
+            drone_positions: {drone_id: (x, y)}
+            unvisited_tiles: Set of (x, y) tiles not yet visited, or None to use
+                the cache as maintained through mark_visited/add_tiles
+            drone_batteries: {drone_id: battery_level}
+
+        Returns:
+            {drone_id: [list of tiles]}
+        """
+        if unvisited_tiles is not None:
+            self.sync_tiles(unvisited_tiles)
+
+        if not drone_positions or self.tile_count == 0:
+            return {drone_id: [] for drone_id in drone_positions}
+
+        drone_ids = [
+            drone_id for drone_id in drone_positions
+            if drone_batteries.get(drone_id, 0) > self.DEAD_BATTERY
+        ]
+        if not drone_ids:
+            return {drone_id: [] for drone_id in drone_positions}
+
+        rows = np.flatnonzero(self._alive)
+        tile_coords = self._tile_coords[rows]
+        n_clusters = min(len(drone_ids), len(rows))
+        drone_ids = drone_ids[:n_clusters]
+        init = self._initial_centroids(drone_ids, drone_positions)
+        warm = any(drone_id in self._centroids for drone_id in drone_ids)
+
+        try:
+            if len(rows) > self.minibatch_threshold:
+                model = MiniBatchKMeans(
+                    n_clusters=n_clusters,
+                    init=init,
+                    n_init=1,
+                    max_iter=self.max_iter,
+                    batch_size=self.batch_size,
+                    random_state=self.random_state
+                )
+                self.stats["minibatch_fits"] += 1
+            else:
+                model = KMeans(
+                    n_clusters=n_clusters,
+                    init=init,
+                    n_init=1,
+                    max_iter=self.max_iter,
+                    random_state=self.random_state
+                )
+            labels = model.fit_predict(tile_coords)
+        except Exception as e:
+            logger.error("K-means clustering failed: %s. Falling back to Voronoi.", e)
+            return self.fallback.allocate_zones_voronoi(
+                drone_positions, set(self._tiles[row] for row in rows), drone_batteries
+            )
+
+        self.stats["fits"] += 1
+        self.stats["warm_fits"] += int(warm)
+        self.stats["iterations"] += int(model.n_iter_)
+
+        self._centroids = {
+            drone_id: model.cluster_centers_[i] for i, drone_id in enumerate(drone_ids)
+        }
+
+        allocation = defaultdict(list)
+        for row, label in zip(rows.tolist(), labels.tolist()):
+            allocation[drone_ids[label]].append(self._tiles[row])
+
+        result = {drone_id: allocation.get(drone_id, []) for drone_id in drone_positions}
+
+        logger.info(
+            "K-means allocation (%s, %d iterations): %s",
+            "warm" if warm else "cold", model.n_iter_,
+            {drone_id: len(tiles) for drone_id, tiles in result.items()}
+        )
+
+        return result
+
+    def reset(self):
+        """Forget centroids so the next fit starts from drone positions."""
+        self._centroids.clear()
@@ -3,6 +3,19 @@ import time
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 
+from agents.world_state import WorldUpdate
+from sim.metrics_history import MetricsHistory
+from sim.quantiles import QuantileSketch
+
+# Distributions kept as streaming quantile sketches (unit in the name)
+QUANTILE_METRICS = ("tick_ms", "inference_ms", "message_latency_ms", "time_to_detection_s")
+
+# Per-tick fields kept in the history; totals are constant and filled in on read
+HISTORY_FIELDS = (
+    "tick", "coverage_percent", "targets_found", "active_agents",
+    "handoffs", "messages_sent", "avg_battery"
+)
+
 @dataclass
 class MetricsSnapshot:
     """Metrics at a point in time."""
@@ -32,9 +45,21 @@ class MetricsSnapshot:
         }
 
 class MetricsTracker:
-    """Time-to-first-detection, coverage, handoffs, battery, message count."""
+    """
+    Time-to-first-detection, coverage, handoffs, battery, message count.
+
+    Driven by events: apply_world_update() (connected with
+    SimulationEnvironment.add_world_listener) turns each tick's WorldUpdate
+    into battery, state, visit and discovery events, record_message() counts
+    messages and handoffs. Each event adjusts a running aggregate in O(1),
+    so a tick costs O(what changed), never O(agents + tiles). update() still
+    accepts a full-state scrape for callers without a world feed.
+    """
 
-    def __init__(self, total_targets: int, total_tiles: int, total_agents: int):
+    HISTORY_POINTS = 500  # Default points per history query; pass points=None for the full history
+
+    def __init__(self, total_targets: int, total_tiles: int, total_agents: int,
+                 history_capacity: int = 2048):
         self.total_targets = total_targets
         self.total_tiles = total_tiles
         self.total_agents = total_agents
@@ -42,11 +67,19 @@ class MetricsTracker:
         self.first_detection_time: Optional[float] = None
         self.handoff_count = 0
         self.message_count = 0
-        self.history: List[MetricsSnapshot] = []
+        # Bounded columnar history; the latest snapshot is kept whole for current/summary
+        self.history = MetricsHistory(HISTORY_FIELDS, capacity=history_capacity)
+        self.last_snapshot: Optional[MetricsSnapshot] = None
         self.targets_found = 0
         self.visited_tiles = 0
         self.active_agents = total_agents
         self.total_messages = 0
+        # Running aggregates behind active_agents and avg_battery
+        self.agent_batteries: Dict[str, float] = {}
+        self.agent_states: Dict[str, str] = {}
+        self.battery_total = 0.0
+        self.dead_agents = 0
+        self.quantiles: Dict[str, QuantileSketch] = {name: QuantileSketch() for name in QUANTILE_METRICS}
     
     def start(self):
         self.start_time = time.time()
@@ -54,11 +87,21 @@ class MetricsTracker:
         self.handoff_count = 0
         self.message_count = 0
         self.history.clear()
+        self.last_snapshot = None
+        self.quantiles = {name: QuantileSketch() for name in QUANTILE_METRICS}
+    
+    def _elapsed(self) -> Optional[float]:
+        return time.time() - self.start_time if self.start_time else None
     
-    def record_target_found(self):
+    def record_target_found(self, elapsed: Optional[float] = None):
         self.targets_found += 1
-        if self.first_detection_time is None and self.start_time:
-            self.first_detection_time = time.time() - self.start_time
+        if elapsed is None:
+            elapsed = self._elapsed()
+        if elapsed is None:
+            return
+        self.quantiles["time_to_detection_s"].add(elapsed)
+        if self.first_detection_time is None:
+            self.first_detection_time = elapsed
     
     def record_handoff(self):
         """Record a successful handoff"""
@@ -67,37 +110,95 @@ class MetricsTracker:
     def record_message(self, msg_type: str):
         """Record a message sent"""
         self.message_count += 1
+        self.total_messages = self.message_count
         if msg_type in ["ACCEPT_HANDOFF"]:
             self.record_handoff()
     
-    def update(self, tick: int, agents: List[dict], visited_count: int, targets_found: int, msg_stats: dict):
+    def record_message_latency(self, msg_type: str, latency_ms: float):
+        """Publish-to-dispatch delay of one delivered message (MessageBus.on_latency_callback)."""
+        self.quantiles["message_latency_ms"].add(latency_ms)
+    
+    def record_inference(self, elapsed_ms: float):
+        self.quantiles["inference_ms"].add(elapsed_ms)
+    
+    def record_battery(self, agent_id: str, battery: float):
+        """An agent's battery level changed."""
+        self.battery_total += battery - self.agent_batteries.get(agent_id, 0.0)
+        self.agent_batteries[agent_id] = battery
+    
+    def record_state(self, agent_id: str, state: str):
+        """An agent changed state; only transitions into or out of "dead" move the active count."""
+        previous = self.agent_states.get(agent_id)
+        self.agent_states[agent_id] = state
+        self.dead_agents += (state == "dead") - (previous == "dead")
+        self.active_agents = max(len(self.agent_states), self.total_agents) - self.dead_agents
+    
+    def record_visits(self, count: int):
+        """Tiles visited for the first time."""
+        self.visited_tiles += count
+    
+    @property
+    def avg_battery(self) -> float:
+        if not self.agent_batteries:
+            return 100.0
+        return self.battery_total / len(self.agent_batteries)
+    
+    def apply_world_update(self, update: WorldUpdate):
+        """Fold one tick's changes in as events, then record the tick."""
+        for agent_id, changes in update.agent_changes.items():
+            if "battery" in changes:
+                self.record_battery(agent_id, changes["battery"])
+            if "state" in changes:
+                self.record_state(agent_id, changes["state"])
+        if update.visited:
+            self.record_visits(len(update.visited))
+        for _ in update.discoveries:
+            self.record_target_found(update.time)
+        for elapsed_ms in update.inference_ms:
+            self.record_inference(elapsed_ms)
+        if update.tick_ms:
+            self.quantiles["tick_ms"].add(update.tick_ms)
+        self.record_tick(update.tick, update.time)
+    
+    def record_tick(self, tick: int, elapsed: Optional[float] = None):
+        """Append the current aggregates to the history (nothing before start())."""
         if not self.start_time:
             return
+        if elapsed is None:
+            elapsed = self._elapsed()
         
-        current_time = time.time() - self.start_time
-        active = sum(1 for a in agents if a.get("state") != "dead")
-        avg_battery = sum(a.get("battery", 0) for a in agents) / len(agents) if agents else 0
-        if targets_found > 0 and self.first_detection_time is None:
-            self.first_detection_time = current_time
-
         snapshot = MetricsSnapshot(
-            timestamp=current_time,
+            timestamp=elapsed,
             tick=tick,
-            coverage_percent=(visited_count / self.total_tiles) * 100,
-            targets_found=targets_found,
+            coverage_percent=(self.visited_tiles / self.total_tiles) * 100 if self.total_tiles else 0,
+            targets_found=self.targets_found,
             total_targets=self.total_targets,
-            active_agents=active,
+            active_agents=self.active_agents,
             total_agents=self.total_agents,
             handoffs=self.handoff_count,
-            messages_sent=msg_stats.get("total_sent", 0),
-            avg_battery=avg_battery
+            messages_sent=self.total_messages,
+            avg_battery=self.avg_battery
         )
+        self.history.append(elapsed, [
+            tick, snapshot.coverage_percent, snapshot.targets_found, snapshot.active_agents,
+            snapshot.handoffs, snapshot.messages_sent, snapshot.avg_battery
+        ])
+        self.last_snapshot = snapshot
+    
+    def update(self, tick: int, agents: List[dict], visited_count: int, targets_found: int, msg_stats: dict):
+        """Resync every aggregate from a full-state scrape, then record the tick (O(agents))."""
+        if not self.start_time:
+            return
         
-        self.history.append(snapshot)
+        for agent in agents:
+            self.record_battery(agent["agent_id"], agent.get("battery", 0))
+            self.record_state(agent["agent_id"], agent.get("state"))
+        if targets_found > 0 and self.first_detection_time is None:
+            self.first_detection_time = self._elapsed()
         self.targets_found = targets_found
         self.visited_tiles = visited_count
-        self.active_agents = active
         self.total_messages = msg_stats.get("total_sent", 0)
+        self.record_tick(tick)
     
     def get_current_metrics(self) -> dict:
         """Get current metric values"""
@@ -110,17 +211,16 @@ class MetricsTracker:
             "active_agents": self.active_agents,
             "total_agents": self.total_agents,
             "total_messages": self.total_messages,
-            "avg_battery": round(
-                sum(s.avg_battery for s in self.history[-1:]) / 1 if self.history else 100, 1
-            )
+            "avg_battery": round(self.avg_battery, 1),
+            "quantiles": self.get_quantiles()
         }
     
     def get_summary(self) -> dict:
         """Get final summary metrics"""
-        if not self.history:
+        if not self.last_snapshot:
             return self.get_current_metrics()
         
-        final = self.history[-1]
+        final = self.last_snapshot
         return {
             "time_to_first_detection": round(self.first_detection_time, 2) if self.first_detection_time else "N/A",
             "final_coverage_percent": round(final.coverage_percent, 1),
@@ -128,9 +228,55 @@ class MetricsTracker:
             "total_handoffs": self.handoff_count,
             "avg_battery_at_end": round(final.avg_battery, 1),
             "total_messages_exchanged": final.messages_sent,
-            "duration_seconds": round(final.timestamp, 1)
+            "duration_seconds": round(final.timestamp, 1),
+            "quantiles": self.get_quantiles()
         }
     
-    def get_history(self) -> List[dict]:
-        """Get metrics history for graphing"""
-        return [s.to_dict() for s in self.history]
+    def get_quantiles(self) -> dict:
+        """count, mean, p50, p90, p99 and max of each sketched distribution."""
+        return {name: sketch.to_dict() for name, sketch in self.quantiles.items()}
+    
+    def quantile_states(self) -> dict:
+        """Serialisable sketches, to merge into another run's tracker with merge_quantiles()."""
+        return {name: sketch.to_state() for name, sketch in self.quantiles.items()}
+    
+    def merge_quantiles(self, states: Dict[str, dict]):
+        for name, state in states.items():
+            if name in self.quantiles:
+                self.quantiles[name].merge(QuantileSketch.from_state(state))
+    
+    def query_history(self, since: Optional[float] = None, start: Optional[float] = None,
+                      end: Optional[float] = None, points: Optional[int] = HISTORY_POINTS) -> dict:
+        """
+        Columnar history with min/max/mean per field, at most `points` points
+        (500 by default; None returns every stored sample at the finest
+        resolution still covering the range). `since` is seconds back from the
+        latest sample ("last 10 minutes" is since=600); start/end are run times
+        in seconds.
+        """
+        if since is not None and self.history.last_time is not None:
+            start = self.history.last_time - since
+        return self.history.query(start, end, points)
+    
+    def get_history(self, since: Optional[float] = None, points: Optional[int] = HISTORY_POINTS) -> List[dict]:
+        """
+        Get metrics history for graphing: one row per point, bucket means.
+        Downsampled to at most `points` (default 500); points=None for the full history.
+        """
+        columns = self.query_history(since=since, points=points)
+        fields = columns["fields"]
+        return [
+            MetricsSnapshot(
+                timestamp=timestamp,
+                tick=int(fields["tick"]["mean"][i]),
+                coverage_percent=fields["coverage_percent"]["mean"][i],
+                targets_found=int(round(fields["targets_found"]["mean"][i])),
+                total_targets=self.total_targets,
+                active_agents=int(round(fields["active_agents"]["mean"][i])),
+                total_agents=self.total_agents,
+                handoffs=int(round(fields["handoffs"]["mean"][i])),
+                messages_sent=int(round(fields["messages_sent"]["mean"][i])),
+                avg_battery=fields["avg_battery"]["mean"][i]
+            ).to_dict()
+            for i, timestamp in enumerate(columns["timestamp"])
+        ]
@@ -0,0 +1,196 @@
+"""Columnar metrics history: NumPy ring buffers per resolution with min/max/mean buckets."""
+import math
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+class _Level:
+    """
+    One resolution: a ring of `capacity` buckets, each summarising `factor`
+    consecutive samples as per-field min, max and sum. The bucket still
+    filling up is kept aside and included in queries.
+    """
+
+    def __init__(self, factor: int, capacity: int, n_fields: int):
+        self.factor = factor
+        self.capacity = capacity
+        self.times = np.zeros(capacity)
+        self.counts = np.zeros(capacity)
+        self.mins = np.zeros((n_fields, capacity))
+        self.maxs = np.zeros((n_fields, capacity))
+        self.sums = np.zeros((n_fields, capacity))
+        self.head = 0  # buckets ever completed
+        self._count = 0
+        self._time = 0.0
+        self._min = np.zeros(n_fields)
+        self._max = np.zeros(n_fields)
+        self._sum = np.zeros(n_fields)
+
+    def add(self, timestamp: float, row: np.ndarray):
+        if self._count == 0:
+            self._time = timestamp
+            self._min[:] = row
+            self._max[:] = row
+            self._sum[:] = row
+        else:
+            np.minimum(self._min, row, out=self._min)
+            np.maximum(self._max, row, out=self._max)
+            self._sum += row
+        self._count += 1
+        if self._count == self.factor:
+            slot = self.head % self.capacity
+            self.times[slot] = self._time
+            self.counts[slot] = self._count
+            self.mins[:, slot] = self._min
+            self.maxs[:, slot] = self._max
+            self.sums[:, slot] = self._sum
+            self.head += 1
+            self._count = 0
+
+    @property
+    def oldest_time(self) -> Optional[float]:
+        if self.head:
+            return float(self.times[self.head % self.capacity if self.head > self.capacity else 0])
+        return self._time if self._count else None
+
+    @property
+    def complete(self) -> bool:
+        """Still holds every bucket since the first sample."""
+        return self.head <= self.capacity
+
+    def buckets(self):
+        """(times, counts, mins, maxs, sums) oldest first, including the partial bucket."""
+        stored = min(self.head, self.capacity)
+        order = (np.arange(stored) + self.head - stored) % self.capacity
+        times, counts = self.times[order], self.counts[order]
+        mins, maxs, sums = self.mins[:, order], self.maxs[:, order], self.sums[:, order]
+        if self._count:
+            times = np.append(times, self._time)
+            counts = np.append(counts, self._count)
+            mins = np.column_stack((mins, self._min))
+            maxs = np.column_stack((maxs, self._max))
+            sums = np.column_stack((sums, self._sum))
+        return times, counts, mins, maxs, sums
+
+    def clear(self):
+        self.head = 0
+        self._count = 0
+
+
+class MetricsHistory:
+    """
+    Per-tick samples of numeric fields, kept at several resolutions: raw
+    samples plus buckets of `factors` samples each, every resolution in a
+    fixed-size ring of `capacity` buckets. Memory is bounded by
+    len(factors) x capacity x fields whatever the run length.
+
+    query() answers a time range at a number of points from the coarsest
+    resolution that still has at least that many buckets in the range (and
+    still holds its start), merging neighbouring buckets if there are more.
+    Its cost is bounded by `capacity`, not by how long the run has been going.
+    points=None skips the downsampling and returns every bucket of the finest
+    resolution that still holds the range start.
+    """
+
+    def __init__(self, fields: Sequence[str], capacity: int = 2048, factors: Sequence[int] = (1, 16, 256)):
+        self.fields = list(fields)
+        self.capacity = capacity
+        self.levels = [_Level(factor, capacity, len(self.fields)) for factor in factors]
+        self.last_time: Optional[float] = None
+        self.last_row: Optional[np.ndarray] = None
+        self.samples = 0
+
+    def append(self, timestamp: float, values: Sequence[float]):
+        row = np.asarray(values, dtype=np.float64)
+        for level in self.levels:
+            level.add(timestamp, row)
+        self.last_time = timestamp
+        self.last_row = row
+        self.samples += 1
+
+    def latest(self) -> Optional[Dict[str, float]]:
+        if self.last_row is None:
+            return None
+        return dict(zip(self.fields, self.last_row.tolist()), timestamp=self.last_time)
+
+    def clear(self):
+        for level in self.levels:
+            level.clear()
+        self.last_time = None
+        self.last_row = None
+        self.samples = 0
+
+    def __len__(self) -> int:
+        return self.samples
+
+    def _pick_level(self, start: Optional[float], end: Optional[float], points: Optional[int]) -> _Level:
+        covering = [
+            level for level in self.levels
+            if level.complete or (start is not None and level.oldest_time is not None and level.oldest_time <= start)
+        ] or [self.levels[-1]]
+        best = covering[0]
+        if points is None:
+            return best
+        for level in covering[1:]:
+            if self._count_in_range(level, start, end) >= points:
+                best = level
+        return best
+
+    @staticmethod
+    def _count_in_range(level: _Level, start: Optional[float], end: Optional[float]) -> int:
+        times = level.buckets()[0]
+        low = 0 if start is None else int(np.searchsorted(times, start, side='left'))
+        high = len(times) if end is None else int(np.searchsorted(times, end, side='right'))
+        return max(0, high - low)
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        points: Optional[int] = 500,
+        fields: Optional[Sequence[str]] = None
+    ) -> dict:
+        """
+        Samples with timestamp in [start, end] (None = open), at most `points`
+        of them (None: every stored bucket, see above), as columns: each field
+        has "min", "max" and "mean" lists aligned with "timestamp" (the start
+        of each bucket).
+        """
+        names = list(fields) if fields else self.fields
+        indices = [self.fields.index(name) for name in names]
+        result = {"resolution": 0, "points": 0, "timestamp": [], "fields": {n: {"min": [], "max": [], "mean": []} for n in names}}
+        if not self.samples:
+            return result
+
+        if points is not None:
+            points = max(1, points)
+        level = self._pick_level(start, end, points)
+        times, counts, mins, maxs, sums = level.buckets()
+        low = 0 if start is None else int(np.searchsorted(times, start, side='left'))
+        high = len(times) if end is None else int(np.searchsorted(times, end, side='right'))
+        times, counts = times[low:high], counts[low:high]
+        mins, maxs, sums = mins[indices, low:high], maxs[indices, low:high], sums[indices, low:high]
+        if not len(times):
+            return result
+
+        group = 1 if points is None else max(1, math.ceil(len(times) / points))
+        if group > 1:
+            edges = np.arange(0, len(times), group)
+            times = times[edges]
+            counts = np.add.reduceat(counts, edges)
+            mins = np.minimum.reduceat(mins, edges, axis=1)
+            maxs = np.maximum.reduceat(maxs, edges, axis=1)
+            sums = np.add.reduceat(sums, edges, axis=1)
+        means = sums / counts
+
+        result["resolution"] = level.factor * group
+        result["points"] = len(times)
+        result["timestamp"] = times.tolist()
+        for row, name in enumerate(names):
+            result["fields"][name] = {
+                "min": mins[row].tolist(),
+                "max": maxs[row].tolist(),
+                "mean": means[row].tolist()
+            }
+        return result
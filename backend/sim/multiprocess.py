@@ -0,0 +1,386 @@
+"""Multi-process agent hosting: drone shards tick in worker processes, in lockstep, over ipc:// or tcp://."""
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import uuid
+from typing import List, Dict, Optional
+import zmq
+import zmq.asyncio
+
+from agents.drone_agent import Position
+from comms.flow_control import FlowControl
+from comms.message_bus import MessageBus
+from comms.transport import message_field, message_as_dict
+from sim.environment import SimulationEnvironment, SimulationConfig
+
+logger = logging.getLogger(__name__)
+
+WORKER_TRANSPORTS = ("ipc", "tcp")
+
+
+class BusProxy:
+    """
+    XSUB/XPUB forwarder that joins the MessageBus of every process. Runs in a
+    background thread and is stopped through its steering socket.
+    """
+
+    def __init__(self, transport: str = "ipc"):
+        if transport not in WORKER_TRANSPORTS:
+            raise ValueError(f"Unknown worker transport: {transport}")
+        self.transport = transport
+        self.context = zmq.Context()
+        self.frontend_address = ""
+        self.backend_address = ""
+        self._control_address = f"inproc://bus-proxy-{uuid.uuid4().hex}"
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    def _bind(self, socket, name: str) -> str:
+        if self.transport == "tcp":
+            port = socket.bind_to_random_port("tcp://127.0.0.1")
+            return f"tcp://127.0.0.1:{port}"
+        address = f"ipc://{tempfile.gettempdir()}/drone-sar-{os.getpid()}-{uuid.uuid4().hex[:8]}-{name}"
+        socket.bind(address)
+        return address
+
+    def _run(self):
+        frontend = self.context.socket(zmq.XSUB)
+        backend = self.context.socket(zmq.XPUB)
+        control = self.context.socket(zmq.PAIR)
+        self.frontend_address = self._bind(frontend, "pub")
+        self.backend_address = self._bind(backend, "sub")
+        control.bind(self._control_address)
+        self._ready.set()
+        try:
+            zmq.proxy_steerable(frontend, backend, None, control)
+        except zmq.ContextTerminated:
+            pass
+        finally:
+            frontend.close(linger=0)
+            backend.close(linger=0)
+            control.close(linger=0)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="bus-proxy", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        logger.info("Bus proxy on %s -> %s", self.frontend_address, self.backend_address)
+
+    def stop(self):
+        if not self._thread:
+            return
+        control = self.context.socket(zmq.PAIR)
+        control.connect(self._control_address)
+        control.send(b"TERMINATE")
+        control.close(linger=0)
+        self._thread.join(timeout=2.0)
+        self._thread = None
+        self.context.term()
+
+
+class RemoteAgent:
+    """Coordinator-side view of a drone hosted in a worker, refreshed every tick."""
+
+    def __init__(self, agent_id: str, start_position: Position):
+        self.agent_id = agent_id
+        self.start_position = start_position
+        self.assigned: List[tuple] = []
+        self.visited_tiles: set = set()
+        self.targets_found: List[tuple] = []
+        self.inference_ms: List[float] = []
+        self.state = {
+            "agent_id": agent_id,
+            "position": start_position.to_dict(),
+            "battery": 100.0,
+            "state": "idle",
+            "assigned_tiles": 0,
+            "visited_tiles": 0,
+            "targets_found": 0
+        }
+
+    def assign_tiles(self, tiles: List[tuple]):
+        self.assigned.extend(tiles)
+        self.state["assigned_tiles"] = len(self.assigned)
+
+    def get_state(self) -> dict:
+        return self.state
+
+    def to_spec(self) -> dict:
+        return {
+            "agent_id": self.agent_id,
+            "position": [self.start_position.x, self.start_position.y],
+            "tiles": [list(t) for t in self.assigned]
+        }
+
+
+def _worker_main(worker_id: str, control_address: str, pub_address: str, sub_address: str,
+                 config: dict, agent_specs: List[dict], bus_settings: dict):
+    logging.basicConfig(level=logging.INFO, format=f'%(asctime)s [%(levelname)s] {worker_id} %(name)s: %(message)s')
+    asyncio.run(_run_worker(worker_id, control_address, pub_address, sub_address, config, agent_specs, bus_settings))
+
+
+async def _run_worker(worker_id: str, control_address: str, pub_address: str, sub_address: str,
+                      config: dict, agent_specs: List[dict], bus_settings: dict):
+    """Host a shard of drones: tick on each TICK from the coordinator, then report back."""
+    context = zmq.asyncio.Context()
+    # Same codec, flow control and dedup as the coordinator's bus
+    message_bus = MessageBus(
+        context,
+        codec=bus_settings["codec"],
+        flow=FlowControl(**bus_settings["flow"]),
+        dedup_capacity=bus_settings["dedup_capacity"],
+        dedup_ttl=bus_settings["dedup_ttl"]
+    )
+    await message_bus.start(pub_address, sub_address)
+
+    # A local environment gives the shard the same agent wiring as a single-process run
+    # The ground station lives with the coordinator, not in every shard
+    env = SimulationEnvironment(SimulationConfig(**dict(config, ground_agent=False)), message_bus)
+    for spec in agent_specs:
+        agent = env._create_agent(spec["agent_id"], Position(*spec["position"]))
+        agent.assign_tiles([tuple(t) for t in spec["tiles"]])
+        env.agents[agent.agent_id] = agent
+
+    control = context.socket(zmq.DEALER)
+    control.setsockopt_string(zmq.IDENTITY, worker_id)
+    control.connect(control_address)
+    await control.send_json({"type": "ready"})
+
+    reported_visited: Dict[str, set] = {agent_id: set() for agent_id in env.agents}
+    reported_targets: Dict[str, int] = {agent_id: 0 for agent_id in env.agents}
+
+    try:
+        while True:
+            command = await control.recv_json()
+            if command["type"] == "stop":
+                break
+            if "targets" in command:
+                env.target_positions = {tuple(t) for t in command["targets"]}
+
+            await env._tick_agents(command["time"])
+            await env.flush_messages()
+
+            visited, targets, inference = {}, {}, {}
+            for agent_id, agent in env.agents.items():
+                new_visited = agent.visited_tiles - reported_visited[agent_id]
+                reported_visited[agent_id] |= new_visited
+                visited[agent_id] = [list(t) for t in new_visited]
+                targets[agent_id] = [list(t) for t in agent.targets_found[reported_targets[agent_id]:]]
+                reported_targets[agent_id] = len(agent.targets_found)
+                if agent.inference_ms:
+                    inference[agent_id] = agent.inference_ms[:]
+                    agent.inference_ms.clear()
+
+            await control.send_json({
+                "type": "done",
+                "tick": command["tick"],
+                "states": [agent.get_state() for agent in env.agents.values()],
+                "visited": visited,
+                "targets": targets,
+                "inference_ms": inference
+            })
+    finally:
+        await message_bus.stop()
+        control.close(linger=0)
+        context.term()
+
+
+class MultiProcessSimulation(SimulationEnvironment):
+    """
+    SimulationEnvironment whose drones are sharded across worker processes.
+
+    Each tick the coordinator sends TICK to every worker and waits until all of
+    them report back (the tick barrier), then aggregates visited tiles, targets
+    and agent states exactly as the single-process environment does. Workers
+    publish A2A messages through a proxy, so drones in different processes
+    still hear each other; the coordinator's bus monitors all traffic for
+    stats, recording and on_message_callback.
+
+    Worker processes are spawned on first start(); call shutdown() when done.
+    Workers build their bus with the coordinator bus's codec, flow control and
+    dedup settings. If a worker exits, or no reply arrives for worker_timeout
+    seconds, the run fails with RuntimeError instead of waiting forever.
+    """
+
+    LIVENESS_POLL_MS = 500  # How often a wait for workers checks they are still alive
+
+    def __init__(self, config: SimulationConfig, message_bus: MessageBus,
+                 num_workers: int = 2, worker_transport: str = "ipc", worker_timeout: float = 30.0):
+        super().__init__(config, message_bus)
+        self.num_workers = max(1, num_workers)
+        self.worker_timeout = worker_timeout
+        self.proxy = BusProxy(worker_transport)
+        self.proxy.start()
+        self._control_context = zmq.asyncio.Context()
+        self._control: Optional[zmq.asyncio.Socket] = None
+        self._control_address = ""
+        self._workers: Dict[str, multiprocessing.Process] = {}
+        self._sent_targets = False
+        self._tick_visits: List[tuple] = []
+
+    async def start_bus(self):
+        """Join the coordinator's bus to the worker proxy and monitor all traffic."""
+        await self.message_bus.start(self.proxy.frontend_address, self.proxy.backend_address)
+        self.message_bus.add_monitor(self._observe_message)
+
+    def _observe_message(self, message):
+        # Sends happen in workers; the coordinator counts and records them here.
+        # Messages from the coordinator's own agents (the ground agent and any
+        # regional coordinators, which all send GROUND_COMMAND) were counted at publish.
+        if (message_field(message, "agent_id") in self.message_bus.handlers
+                or message_field(message, "type") == "GROUND_COMMAND"):
+            return
+        self.message_bus.stats.record_sent(message_field(message, "type", "UNKNOWN"))
+        if self.message_bus.record_messages:
+            self.message_bus.message_log.append(message_as_dict(message))
+        if self.message_bus.on_message_callback:
+            self.message_bus.on_message_callback(message_as_dict(message))
+
+    def _create_agent(self, agent_id: str, start_pos: Position) -> RemoteAgent:
+        return RemoteAgent(agent_id, start_pos)
+
+    def _shards(self) -> List[List[RemoteAgent]]:
+        shards = [[] for _ in range(min(self.num_workers, len(self.agents)))]
+        for i, agent in enumerate(self.agents.values()):
+            shards[i % len(shards)].append(agent)
+        return shards
+
+    async def _spawn_workers(self):
+        self._control = self._control_context.socket(zmq.ROUTER)
+        if self.proxy.transport == "tcp":
+            port = self._control.bind_to_random_port("tcp://127.0.0.1")
+            self._control_address = f"tcp://127.0.0.1:{port}"
+        else:
+            self._control_address = (
+                f"ipc://{tempfile.gettempdir()}/drone-sar-{os.getpid()}-{uuid.uuid4().hex[:8]}-control"
+            )
+            self._control.bind(self._control_address)
+
+        mp_context = multiprocessing.get_context("spawn")
+        for i, shard in enumerate(self._shards()):
+            worker_id = f"worker-{i}"
+            process = mp_context.Process(
+                target=_worker_main,
+                args=(
+                    worker_id, self._control_address,
+                    self.proxy.frontend_address, self.proxy.backend_address,
+                    self.config.to_dict(), [agent.to_spec() for agent in shard], self._bus_settings()
+                ),
+                name=worker_id,
+                daemon=True
+            )
+            process.start()
+            self._workers[worker_id] = process
+
+        ready = set()
+        while len(ready) < len(self._workers):
+            identity, payload = await self._recv_control("workers to start")
+            ready.add(identity.decode())
+        # Let worker subscriptions reach the proxy before the first publish
+        await asyncio.sleep(0.2)
+        self._sent_targets = False
+        logger.info("Spawned %d workers for %d agents", len(self._workers), len(self.agents))
+
+    def _bus_settings(self) -> dict:
+        bus = self.message_bus
+        return {
+            "codec": bus.transport.codec.name if hasattr(bus.transport, "codec") else "json",
+            "flow": bus.flow.to_dict(),
+            "dedup_capacity": bus.dedup_capacity,
+            "dedup_ttl": bus.dedup_ttl
+        }
+
+    async def _recv_control(self, waiting_for: str) -> List[bytes]:
+        """Next worker reply; raises RuntimeError if a worker has died or none replies in time."""
+        deadline = time.monotonic() + self.worker_timeout
+        while True:
+            if await self._control.poll(self.LIVENESS_POLL_MS):
+                return await self._control.recv_multipart()
+            dead = [
+                f"{worker_id} (exit code {process.exitcode})"
+                for worker_id, process in self._workers.items() if not process.is_alive()
+            ]
+            if dead:
+                raise RuntimeError(f"Worker died waiting for {waiting_for}: {', '.join(dead)}")
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"No worker reply in {self.worker_timeout:.0f}s waiting for {waiting_for}")
+
+    async def start(self):
+        try:
+            if not self._workers:
+                await self._spawn_workers()
+            await super().start()
+        except RuntimeError as e:
+            logger.error("Multi-process run failed: %s", e)
+            self.state.is_running = False
+            raise
+
+    async def _tick_agents(self, current_time: float):
+        command = {"type": "tick", "tick": self.state.tick, "time": current_time}
+        if not self._sent_targets:
+            command["targets"] = [list(t) for t in self.target_positions]
+            self._sent_targets = True
+
+        for worker_id in self._workers:
+            await self._control.send_multipart([worker_id.encode(), json.dumps(command).encode()])
+
+        # Tick barrier: every worker must finish this tick before the next one
+        pending = set(self._workers)
+        while pending:
+            identity, payload = await self._recv_control(f"tick {self.state.tick}")
+            reply = json.loads(payload)
+            if reply.get("type") != "done" or reply.get("tick") != self.state.tick:
+                continue
+            pending.discard(identity.decode())
+            for state in reply["states"]:
+                agent = self.agents[state["agent_id"]]
+                agent.state = state
+                visited = [tuple(t) for t in reply["visited"].get(agent.agent_id, [])]
+                agent.visited_tiles.update(visited)
+                self._tick_visits.extend(visited)
+                agent.targets_found.extend(tuple(t) for t in reply["targets"].get(agent.agent_id, []))
+                agent.inference_ms.extend(reply["inference_ms"].get(agent.agent_id, []))
+
+    def _absorb_new_visits(self) -> List[tuple]:
+        new_visits = []
+        for tile in self._tick_visits:
+            if tile not in self.visited_tiles:
+                self.visited_tiles.add(tile)
+                new_visits.append(tile)
+        self._tick_visits.clear()
+        return new_visits
+
+    async def shutdown(self):
+        """Stop worker processes and the bus proxy."""
+        if self._control:
+            for worker_id in self._workers:
+                await self._control.send_multipart(
+                    [worker_id.encode(), json.dumps({"type": "stop"}).encode()]
+                )
+        for process in self._workers.values():
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+        self._workers.clear()
+
+        if self._control:
+            self._control.close(linger=0)
+            self._control = None
+        await self.message_bus.stop()
+        self.proxy.stop()
+        self._control_context.term()
+        if self.proxy.transport == "ipc":
+            for address in (self.proxy.frontend_address, self.proxy.backend_address, self._control_address):
+                path = address[len("ipc://"):]
+                if os.path.exists(path):
+                    os.unlink(path)
+
+    def reset(self):
+        if self._workers:
+            raise RuntimeError("Call shutdown() before resetting a multi-process simulation")
+        super().reset()
@@ -0,0 +1,123 @@
+"""Streaming quantile sketch: log-spaced buckets with bounded relative error (DDSketch-style)."""
+import math
+from typing import Dict, Optional
+
+
+class QuantileSketch:
+    """
+    Counts values in buckets whose bounds grow geometrically by gamma =
+    (1 + a) / (1 - a), so any quantile is returned within relative error `a`
+    of a value actually seen. Values at or below `min_value` share one zero
+    bucket. Memory is bounded by `max_bins`: past that the lowest buckets are
+    folded together, which costs accuracy only at the low end and keeps the
+    upper quantiles (p99) exact to `a`.
+
+    Two sketches with the same relative accuracy merge by adding bucket
+    counts, so sketches from separate runs or processes combine into one
+    (to_state()/from_state() carry them as plain dicts).
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 1024, min_value: float = 1e-6):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        if value <= self.min_value:
+            self.zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + 1
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "QuantileSketch"):
+        """Fold another sketch's counts into this one."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, n in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + n
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def _collapse(self):
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins
+        self.bins[keys[excess]] += sum(self.bins.pop(key) for key in keys[:excess])
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile q in [0, 1], or None if nothing was added."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return self.min
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def __len__(self) -> int:
+        return self.count
+
+    def to_dict(self, digits: int = 3) -> dict:
+        if not self.count:
+            return {"count": 0, "mean": None, "p50": None, "p90": None, "p99": None, "max": None}
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, digits),
+            "p50": round(self.quantile(0.5), digits),
+            "p90": round(self.quantile(0.9), digits),
+            "p99": round(self.quantile(0.99), digits),
+            "max": round(self.max, digits)
+        }
+
+    def to_state(self) -> dict:
+        """Everything needed to rebuild or merge this sketch elsewhere."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "min_value": self.min_value,
+            "bins": [[key, n] for key, n in sorted(self.bins.items())],
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "QuantileSketch":
+        sketch = cls(state["relative_accuracy"], state["max_bins"], state["min_value"])
+        sketch.bins = {int(key): n for key, n in state["bins"]}
+        sketch.zero_count = state["zero_count"]
+        sketch.count = state["count"]
+        sketch.total = state["total"]
+        if sketch.count:
+            sketch.min = state["min"]
+            sketch.max = state["max"]
+        return sketch
@@ -0,0 +1,159 @@
+"""Local-search refinement of coverage tours (2-opt and Or-opt) under a CPU time budget."""
+import logging
+import time
+from typing import List, Tuple, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+IMPROVEMENT_EPS = 1e-9
+
+
+def tour_length(tour: List[Tuple[int, int]], start_position: Tuple[int, int]) -> int:
+    """Manhattan moves needed to visit `tour` in order starting from `start_position`."""
+    length = 0
+    prev = start_position
+    for tile in tour:
+        length += abs(tile[0] - prev[0]) + abs(tile[1] - prev[1])
+        prev = tile
+    return length
+
+
+def _edge_costs(path: np.ndarray) -> np.ndarray:
+    """Cost of edge k -> k+1 for every k; the last entry is 0 (open path end)."""
+    costs = np.zeros(len(path), dtype=np.int64)
+    costs[:-1] = np.abs(np.diff(path, axis=0)).sum(axis=1)
+    return costs
+
+
+def _distances(point: np.ndarray, points: np.ndarray) -> np.ndarray:
+    return np.abs(points - point).sum(axis=1)
+
+
+def _two_opt_pass(path: np.ndarray, deadline: float) -> Tuple[np.ndarray, bool]:
+    """
+    One sweep of best-improvement 2-opt over an open path whose first point
+    (the drone position) is fixed. Reversing path[i..j] replaces edges
+    (i-1, i) and (j, j+1) with (i-1, j) and (i, j+1).
+    """
+    n = len(path) - 1
+    improved = False
+    edges = _edge_costs(path)
+
+    for i in range(1, n):
+        if time.perf_counter() >= deadline:
+            break
+
+        j = np.arange(i + 1, n + 1)
+        delta = _distances(path[i - 1], path[j]) - edges[i - 1] - edges[j]
+        # The segment end has a successor except when j is the last tile
+        has_next = j < n
+        delta[has_next] += _distances(path[i], path[j[has_next] + 1])
+
+        best = int(np.argmin(delta))
+        if delta[best] < -IMPROVEMENT_EPS:
+            end = j[best]
+            path[i:end + 1] = path[i:end + 1][::-1].copy()
+            edges = _edge_costs(path)
+            improved = True
+
+    return path, improved
+
+
+def _or_opt_pass(path: np.ndarray, deadline: float, max_segment: int = 3) -> Tuple[np.ndarray, bool]:
+    """
+    One sweep of Or-opt: move a run of 1..max_segment consecutive tiles,
+    optionally reversed, to the cheapest other position in the path.
+    """
+    improved = False
+    i = 1
+
+    while i < len(path):
+        if time.perf_counter() >= deadline:
+            break
+
+        n = len(path) - 1
+        edges = _edge_costs(path)
+        moved = False
+
+        for length in range(1, max_segment + 1):
+            last = i + length - 1
+            if last > n:
+                break
+
+            first_tile, last_tile = path[i], path[last]
+            removal_gain = edges[i - 1] + edges[last]
+            if last < n:
+                removal_gain -= _distances(path[i - 1], path[last + 1:last + 2])[0]
+
+            # Insert after position k, for every k outside the segment and its left neighbour
+            k = np.concatenate([np.arange(0, i - 1), np.arange(last + 1, n + 1)])
+            if len(k) == 0:
+                continue
+            is_end = k == n
+            succ = np.minimum(k + 1, n)
+
+            forward = _distances(first_tile, path[k]) - edges[k]
+            forward[~is_end] += _distances(last_tile, path[succ[~is_end]])
+            backward = _distances(last_tile, path[k]) - edges[k]
+            backward[~is_end] += _distances(first_tile, path[succ[~is_end]])
+
+            best_fwd, best_bwd = int(np.argmin(forward)), int(np.argmin(backward))
+            reverse = backward[best_bwd] < forward[best_fwd]
+            best = best_bwd if reverse else best_fwd
+            insertion_cost = (backward if reverse else forward)[best]
+
+            if insertion_cost - removal_gain < -IMPROVEMENT_EPS:
+                segment = path[i:last + 1][::-1] if reverse else path[i:last + 1]
+                rest = np.concatenate([path[:i], path[last + 1:]])
+                at = k[best] + 1 if k[best] < i else k[best] + 1 - length
+                path = np.concatenate([rest[:at], segment, rest[at:]])
+                improved = moved = True
+                break
+
+        if not moved:
+            i += 1
+
+    return path, improved
+
+
+def improve_tour(
+    tour: List[Tuple[int, int]],
+    start_position: Tuple[int, int],
+    time_budget: float,
+    deadline: Optional[float] = None
+) -> List[Tuple[int, int]]:
+    """
+    Improve a tour with alternating 2-opt and Or-opt sweeps until no move helps
+    or the time budget runs out. Every accepted move shortens the tour, so the
+    result is the best tour found so far and never longer than the input.
+
+    Args:
+        tour: Initial tile order (e.g. boustrophedon)
+        start_position: Drone position; the tour is an open path starting here
+        time_budget: Seconds of CPU time allowed
+        deadline: Absolute perf_counter deadline, overrides time_budget if earlier
+
+    Returns:
+        Improved tile order
+    """
+    if len(tour) < 3 or time_budget <= 0:
+        return list(tour)
+
+    budget_deadline = time.perf_counter() + time_budget
+    deadline = min(deadline, budget_deadline) if deadline is not None else budget_deadline
+    path = np.array([start_position] + list(tour), dtype=np.int64)
+    initial = int(_edge_costs(path).sum())
+
+    while time.perf_counter() < deadline:
+        path, improved_2opt = _two_opt_pass(path, deadline)
+        path, improved_or = _or_opt_pass(path, deadline)
+        if not (improved_2opt or improved_or):
+            break
+
+    logger.debug(
+        "Tour refined for %d tiles: %d -> %d moves",
+        len(tour), initial, int(_edge_costs(path).sum())
+    )
+
+    return [(int(x), int(y)) for x, y in path[1:]]
@@ -1,21 +1,79 @@
 """Dynamic zone allocation using spatial clustering for optimal drone coverage."""
 import logging
+import time
 from typing import List, Dict, Set, Tuple, Optional
 import numpy as np
 from sklearn.cluster import KMeans
 from scipy.spatial import Voronoi
 from collections import defaultdict
 
+from sim.tour_optimizer import improve_tour
+
 logger = logging.getLogger(__name__)
 
 
+def battery_factor_array(drone_ids: List[str], drone_batteries: Dict[str, float]) -> np.ndarray:
+    """Per-drone distance divisor: low-battery drones see tiles as farther away."""
+    return np.array(
+        [max(0.5, drone_batteries.get(drone_id, 100) / 100.0) for drone_id in drone_ids],
+        dtype=np.float64
+    )
+
+
+def tile_range_budget(battery: float, battery_reserve: float, battery_per_tile: float) -> int:
+    """Tiles a drone can still scan before reaching its reserve, assuming one move per tile."""
+    usable = battery - battery_reserve
+    return max(0, int(usable // battery_per_tile))
+
+
+def balanced_quotas(capacities: np.ndarray, n_tiles: int) -> np.ndarray:
+    """
+    Water-fill tile quotas: the smallest common level L with
+    sum(min(capacity, L)) >= n_tiles, so the busiest drone has as few tiles as
+    capacities allow. If the fleet cannot cover every tile, quotas are the capacities.
+    """
+    if capacities.sum() <= n_tiles:
+        return capacities.copy()
+    
+    low, high = 0, int(capacities.max())
+    while low < high:
+        level = (low + high) // 2
+        if np.minimum(capacities, level).sum() >= n_tiles:
+            high = level
+        else:
+            low = level + 1
+    
+    return np.minimum(capacities, low)
+
+
 class ZoneAllocator:
     """Handles dynamic zone assignment for drone swarm using spatial algorithms."""
     
-    def __init__(self, grid_width: int, grid_height: int):
+    # Tiles per distance-matrix block; bounds memory to CHUNK_SIZE x drones floats
+    CHUNK_SIZE = 8192
+    # Closest drones each tile may propose to in balanced allocation; tiles
+    # rejected by all of them are placed by the nearest-spare pass
+    PREFERENCE_DEPTH = 32
+    
+    def __init__(
+        self,
+        grid_width: int,
+        grid_height: int,
+        battery_reserve: float = 5.0,
+        battery_per_tile: float = 0.8
+    ):
+        """
+        Args:
+            grid_width, grid_height: Search grid size
+            battery_reserve: Battery a drone keeps back (the drones' critical level)
+            battery_per_tile: Battery spent per tile (one move plus one scan)
+        """
         self.grid_width = grid_width
         self.grid_height = grid_height
+        self.battery_reserve = battery_reserve
+        self.battery_per_tile = battery_per_tile
         self.total_tiles = grid_width * grid_height
+        self.last_unassigned: List[Tuple[int, int]] = []
         
     def allocate_zones_voronoi(
         self,
@@ -48,27 +106,19 @@ class ZoneAllocator:
         if not active_drones:
             return {drone_id: [] for drone_id in drone_positions}
         
-        # Simple Voronoi: assign each tile to nearest drone
-        allocation = defaultdict(list)
+        # Simple Voronoi: assign each tile to nearest drone (vectorized)
+        drone_ids = list(active_drones.keys())
+        drone_coords = np.array([active_drones[did] for did in drone_ids], dtype=np.int64)
+        battery_factors = battery_factor_array(drone_ids, drone_batteries)
         
-        for tile in unvisited_tiles:
-            nearest_drone = None
-            min_distance = float('inf')
-            
-            for drone_id, drone_pos in active_drones.items():
-                # Manhattan distance
-                distance = abs(tile[0] - drone_pos[0]) + abs(tile[1] - drone_pos[1])
-                
-                # Adjust for battery - drones with low battery get tiles closer to them
-                battery_factor = max(0.5, drone_batteries.get(drone_id, 100) / 100.0)
-                adjusted_distance = distance / battery_factor
-                
-                if adjusted_distance < min_distance:
-                    min_distance = adjusted_distance
-                    nearest_drone = drone_id
-            
-            if nearest_drone:
-                allocation[nearest_drone].append(tile)
+        tiles = list(unvisited_tiles)
+        labels = self.nearest_drone_labels(
+            np.array(tiles, dtype=np.int64), drone_coords, battery_factors
+        )
+        
+        allocation = defaultdict(list)
+        for tile, label in zip(tiles, labels.tolist()):
+            allocation[drone_ids[label]].append(tile)
         
         # Ensure all drones in original list are in result
         result = {drone_id: allocation.get(drone_id, []) for drone_id in drone_positions}
@@ -80,6 +130,43 @@ class ZoneAllocator:
         
         return result
     
+    def nearest_drone_labels(
+        self,
+        tile_coords: np.ndarray,
+        drone_coords: np.ndarray,
+        battery_factors: np.ndarray,
+        return_distances: bool = False
+    ):
+        """
+        Index of the drone with the smallest battery-adjusted Manhattan distance
+        for each tile. Ties go to the earliest drone, matching a sequential scan.
+        
+        Args:
+            tile_coords: (n_tiles, 2) integer array
+            drone_coords: (n_drones, 2) integer array
+            battery_factors: (n_drones,) distance divisors
+            return_distances: Also return each tile's adjusted distance to its drone
+            
+        Returns:
+            (n_tiles,) array of drone indices, or (labels, distances) if requested
+        """
+        labels = np.empty(len(tile_coords), dtype=np.intp)
+        best = np.empty(len(tile_coords), dtype=np.float64) if return_distances else None
+        
+        for start in range(0, len(tile_coords), self.CHUNK_SIZE):
+            chunk = tile_coords[start:start + self.CHUNK_SIZE]
+            distances = np.abs(chunk[:, None, 0] - drone_coords[None, :, 0])
+            distances += np.abs(chunk[:, None, 1] - drone_coords[None, :, 1])
+            adjusted = distances / battery_factors[None, :]
+            chunk_labels = np.argmin(adjusted, axis=1)
+            labels[start:start + len(chunk)] = chunk_labels
+            if best is not None:
+                best[start:start + len(chunk)] = adjusted[np.arange(len(chunk)), chunk_labels]
+        
+        if return_distances:
+            return labels, best
+        return labels
+    
     def allocate_zones_kmeans(
         self,
         drone_positions: Dict[str, Tuple[int, int]],
@@ -152,6 +239,176 @@ class ZoneAllocator:
             logger.error("K-means clustering failed: %s. Falling back to Voronoi.", e)
             return self.allocate_zones_voronoi(drone_positions, unvisited_tiles, drone_batteries)
     
+    def allocate_zones_balanced(
+        self,
+        drone_positions: Dict[str, Tuple[int, int]],
+        unvisited_tiles: Set[Tuple[int, int]],
+        drone_batteries: Dict[str, float],
+        time_budget: float = 0.25
+    ) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Allocate zones under per-drone battery-range budgets with balanced workload.
+        
+        Each drone gets a quota: its range budget, water-filled down so the busiest
+        drone carries as few tiles as possible. Tiles then propose to drones in order
+        of Manhattan distance and each drone keeps its closest tiles up to quota
+        (deferred acceptance), so zones stay compact while never exceeding what a
+        battery can cover. Each tile proposes to at most its PREFERENCE_DEPTH
+        nearest drones and costs are taken from coordinates, so memory stays at
+        CHUNK_SIZE x drones while preferences are built. Rounds stop at the time
+        budget and any tiles still unplaced go to their nearest drone with spare
+        quota in a few vectorised passes.
+        
+        Tiles that exceed the whole fleet's budget are left out of the result and
+        recorded in `last_unassigned`.
+        
+        Args:
+            drone_positions: {drone_id: (x, y)}
+            unvisited_tiles: Set of (x, y) tiles not yet visited
+            drone_batteries: {drone_id: battery_level}
+            time_budget: Seconds allowed for the proposal rounds
+            
+        Returns:
+            {drone_id: [list of tiles]}
+        """
+        self.last_unassigned = []
+        if not drone_positions or not unvisited_tiles:
+            return {drone_id: [] for drone_id in drone_positions}
+        
+        deadline = time.perf_counter() + time_budget
+        drone_ids = list(drone_positions.keys())
+        drone_coords = np.array([drone_positions[did] for did in drone_ids], dtype=np.int64)
+        capacities = np.array(
+            [
+                tile_range_budget(drone_batteries.get(did, 0), self.battery_reserve, self.battery_per_tile)
+                for did in drone_ids
+            ],
+            dtype=np.int64
+        )
+        
+        tiles = list(unvisited_tiles)
+        tile_coords = np.array(tiles, dtype=np.int64)
+        n_tiles, n_drones = len(tiles), len(drone_ids)
+        quotas = balanced_quotas(capacities, n_tiles)
+        
+        # Drones with no quota are never proposed to
+        preferences = self._preference_lists(tile_coords, drone_coords, np.flatnonzero(quotas > 0))
+        depth = preferences.shape[1]
+        
+        holder = np.full(n_tiles, -1, dtype=np.intp)
+        next_choice = np.zeros(n_tiles, dtype=np.intp)
+        rounds = 0
+        
+        while depth and time.perf_counter() < deadline:
+            free = np.flatnonzero((holder < 0) & (next_choice < depth))
+            if len(free) == 0:
+                break
+            holder[free] = preferences[free, next_choice[free]]
+            next_choice[free] += 1
+            rounds += 1
+            
+            # Each drone keeps its closest `quota` tiles among those it holds
+            held = np.flatnonzero(holder >= 0)
+            owners = holder[held]
+            distances = np.abs(tile_coords[held] - drone_coords[owners]).sum(axis=1)
+            order = np.lexsort((distances, owners))
+            held, owners = held[order], owners[order]
+            group_start = np.searchsorted(owners, owners, side='left')
+            rank = np.arange(len(held)) - group_start
+            holder[held[rank >= quotas[owners]]] = -1
+        
+        spare = quotas - np.bincount(holder[holder >= 0], minlength=n_drones)
+        self._place_leftovers(tile_coords, drone_coords, holder, spare)
+        
+        allocation = defaultdict(list)
+        for tile, label in zip(tiles, holder.tolist()):
+            if label >= 0:
+                allocation[drone_ids[label]].append(tile)
+            else:
+                self.last_unassigned.append(tile)
+        
+        result = {drone_id: allocation.get(drone_id, []) for drone_id in drone_positions}
+        
+        logger.info(
+            "Balanced allocation (%d rounds): %s",
+            rounds, {drone_id: len(tiles) for drone_id, tiles in result.items()}
+        )
+        if self.last_unassigned:
+            logger.warning(
+                "Balanced allocation: %d tiles exceed fleet battery range",
+                len(self.last_unassigned)
+            )
+        
+        return result
+    
+    def _preference_lists(
+        self,
+        tile_coords: np.ndarray,
+        drone_coords: np.ndarray,
+        usable: np.ndarray
+    ) -> np.ndarray:
+        """
+        Each tile's closest usable drones (at most PREFERENCE_DEPTH), nearest
+        first with ties to the earliest drone, built CHUNK_SIZE tiles at a time.
+        
+        Returns:
+            (n_tiles, depth) array of drone indices
+        """
+        depth = min(self.PREFERENCE_DEPTH, len(usable))
+        preferences = np.empty((len(tile_coords), depth), dtype=np.intp)
+        if depth == 0:
+            return preferences
+        
+        usable_coords = drone_coords[usable]
+        for start in range(0, len(tile_coords), self.CHUNK_SIZE):
+            chunk = tile_coords[start:start + self.CHUNK_SIZE]
+            cost = np.abs(chunk[:, None, 0] - usable_coords[None, :, 0])
+            cost += np.abs(chunk[:, None, 1] - usable_coords[None, :, 1])
+            if depth < len(usable):
+                nearest = np.argpartition(cost, depth - 1, axis=1)[:, :depth]
+                nearest_cost = np.take_along_axis(cost, nearest, axis=1)
+                order = np.lexsort((nearest, nearest_cost), axis=-1)
+                nearest = np.take_along_axis(nearest, order, axis=1)
+            else:
+                nearest = np.argsort(cost, axis=1, kind='stable')
+            preferences[start:start + len(chunk)] = usable[nearest]
+        
+        return preferences
+    
+    def _place_leftovers(
+        self,
+        tile_coords: np.ndarray,
+        drone_coords: np.ndarray,
+        holder: np.ndarray,
+        spare: np.ndarray
+    ):
+        """
+        Give tiles still unplaced after the proposal rounds to their nearest
+        drone with spare quota, updating `holder` and `spare` in place. Each pass
+        lets every open drone keep its closest claimants up to its spare count,
+        so a pass either places every claimant or fills at least one drone.
+        """
+        free = np.flatnonzero(holder < 0)
+        spare_total = int(spare.sum())
+        
+        while len(free) and spare_total > 0:
+            open_drones = np.flatnonzero(spare > 0)
+            labels, distances = self.nearest_drone_labels(
+                tile_coords[free], drone_coords[open_drones],
+                np.ones(len(open_drones)), return_distances=True
+            )
+            owners = open_drones[labels]
+            order = np.lexsort((free, distances, owners))
+            free, owners = free[order], owners[order]
+            group_start = np.searchsorted(owners, owners, side='left')
+            rank = np.arange(len(free)) - group_start
+            taken = rank < spare[owners]
+            
+            holder[free[taken]] = owners[taken]
+            spare -= np.bincount(owners[taken], minlength=len(spare))
+            spare_total -= int(taken.sum())
+            free = free[~taken]
+    
     def should_reallocate(
         self,
         current_allocation: Dict[str, List[Tuple[int, int]]],
@@ -252,23 +509,37 @@ class ZoneAllocator:
     def optimize_for_speed(
         self,
         allocation: Dict[str, List[Tuple[int, int]]],
-        drone_positions: Dict[str, Tuple[int, int]]
+        drone_positions: Dict[str, Tuple[int, int]],
+        time_budget: float = 0.0
     ) -> Dict[str, List[Tuple[int, int]]]:
         """
         Optimize tile order within each zone for maximum speed coverage.
-        Uses boustrophedon pattern for each drone's zone.
+        Starts from a boustrophedon pattern for each drone's zone. Callers that
+        can afford it pass a time_budget to shorten the tours with 2-opt/Or-opt
+        moves; time left over by small zones carries over to the remaining ones.
         
         Args:
             allocation: Current zone allocation
             drone_positions: Current drone positions
+            time_budget: Total seconds for tour refinement (default 0: boustrophedon only)
             
         Returns:
             Allocation with optimized tile ordering
         """
         optimized = {}
+        deadline = time.perf_counter() + time_budget
+        zones_left = sum(1 for tiles in allocation.values() if tiles)
         
         for drone_id, tiles in allocation.items():
             drone_pos = drone_positions.get(drone_id, (0, 0))
-            optimized[drone_id] = self.generate_boustrophedon_order(tiles, drone_pos)
+            order = self.generate_boustrophedon_order(tiles, drone_pos)
+            
+            if tiles:
+                remaining = deadline - time.perf_counter()
+                if remaining > 0:
+                    order = improve_tour(order, drone_pos, remaining / zones_left, deadline)
+                zones_left -= 1
+            
+            optimized[drone_id] = order
         
         return optimized
@@ -0,0 +1,102 @@
+"""Round-trip tests for the bus wire codecs."""
+import json
+import time
+
+import pytest
+
+from agents.drone_agent import Message
+from comms.codec import (
+    PACKED_MARKER, CodecRegistry, JsonCodec, MsgpackCodec, PackedTileCodec, get_codec
+)
+
+
+def make(msg_type: str, payload: dict, agent_id: str = "DRONE-01") -> dict:
+    return Message(type=msg_type, agent_id=agent_id, timestamp=time.time(), payload=payload).to_dict()
+
+
+def sample_messages(tiles: list) -> dict:
+    """One message of each type, shaped like the ones agents send."""
+    tile_dicts = [{"x": x, "y": y} for x, y in tiles]
+    return {
+        "HEARTBEAT": make("HEARTBEAT", {"position": {"x": 3, "y": 4}, "battery": 87.5}),
+        "TARGET_FOUND": make("TARGET_FOUND", {
+            "position": {"x": 3, "y": 4}, "detection_method": "cnn", "confidence": 0.91, "detections": []
+        }),
+        "OFFER_TILE": make("OFFER_TILE", {"tiles": tile_dicts}),
+        "ACCEPT_OFFER": make("ACCEPT_OFFER", {"original_message_id": "abc", "accepted_tiles": tile_dicts}),
+        "HANDOFF_REQUEST": make("HANDOFF_REQUEST", {
+            "tiles": tiles, "position": {"x": 3, "y": 4}, "battery": 18.0
+        }),
+        "ACCEPT_HANDOFF": make("ACCEPT_HANDOFF", {"from_agent": "DRONE-02", "accepted_tiles": tiles}),
+        "GROUND_COMMAND": make("GROUND_COMMAND", {
+            "commands": [
+                {"command_type": "BATTERY_WARNING", "payload": {"level": "low", "battery": 18.0}},
+                {"command_type": "ASSIGN_TILES", "payload": {"tiles": tiles, "replace": True, "reason": "idle"}},
+                {"command_type": "RELEASE_TILES", "payload": {"tiles": tile_dicts}}
+            ],
+            "target": "DRONE-02"
+        }, agent_id="GROUND"),
+    }
+
+
+# uint8 pairs, uint16 pairs, and coordinates too large to pack
+TILE_SETS = {
+    "small": [(i % 50, i // 50) for i in range(120)],
+    "wide": [(i * 7, 300 + i) for i in range(40)],
+    "unpackable": [(70000, 1), (2, 3)],
+    "empty": [],
+}
+
+
+def codecs() -> list:
+    params = [
+        pytest.param(JsonCodec(), id="json"),
+        pytest.param(PackedTileCodec(JsonCodec()), id="packed-json"),
+    ]
+    try:
+        params += [
+            pytest.param(MsgpackCodec(), id="msgpack"),
+            pytest.param(PackedTileCodec(MsgpackCodec()), id="packed-msgpack"),
+        ]
+    except ImportError:  # optional dependency
+        pass
+    return params
+
+
+@pytest.mark.parametrize("codec", codecs())
+@pytest.mark.parametrize("tiles", list(TILE_SETS.values()), ids=list(TILE_SETS))
+def test_round_trip_matches_json(codec, tiles):
+    registry = CodecRegistry()
+    for msg_type, message in sample_messages(tiles).items():
+        # Tuples arrive as lists, as they do through JSON
+        expected = json.loads(json.dumps(message))
+        assert registry.decode(registry.encode(codec, message)) == expected, msg_type
+
+
+@pytest.mark.parametrize("inner", [JsonCodec, MsgpackCodec], ids=["json", "msgpack"])
+def test_packed_codec_packs_tiles_inside_command_lists(inner):
+    try:
+        codec = PackedTileCodec(inner())
+    except ImportError:
+        pytest.skip("msgpack not installed")
+
+    message = sample_messages(TILE_SETS["small"])["GROUND_COMMAND"]
+    packed = codec._pack(message)
+    commands = packed["payload"]["commands"]
+    assert PACKED_MARKER in commands[1]["payload"]["tiles"]
+    assert PACKED_MARKER in commands[2]["payload"]["tiles"]
+    assert len(codec.encode(message)) < len(JsonCodec().encode(message))
+
+
+def test_registry_decodes_each_sender_codec():
+    message = sample_messages(TILE_SETS["small"])["OFFER_TILE"]
+    registry = CodecRegistry()
+    frames = [registry.encode(JsonCodec(), message), registry.encode(PackedTileCodec(JsonCodec()), message)]
+    assert [registry.decode(frame) for frame in frames] == [message, message]
+
+
+def test_unknown_codec_rejected():
+    with pytest.raises(ValueError):
+        get_codec("xml")
+    with pytest.raises(ValueError):
+        CodecRegistry().decode(bytes((99,)) + b"{}")
@@ -0,0 +1,168 @@
+"""Exactly-once delivery tests for the idempotency cache and the message bus."""
+import asyncio
+import time
+
+import pytest
+
+from agents.drone_agent import DroneAgent, Message, Position
+from comms.dedup import IdempotencyCache
+from comms.message_bus import MessageBus
+
+RECEIVERS = ("DRONE-01", "DRONE-02", "GROUND")
+TILES = [(5, 5), (5, 6), (6, 5)]
+TILE_DICTS = [{"x": x, "y": y} for x, y in TILES]
+
+
+def make(msg_type: str = "TARGET_FOUND", agent_id: str = "DRONE-09", message_id=None, payload=None) -> Message:
+    payload = payload if payload is not None else {"position": {"x": 1, "y": 2}}
+    message = Message(type=msg_type, agent_id=agent_id, timestamp=time.time(), payload=payload)
+    if message_id is not None:
+        message.message_id = message_id
+    return message
+
+
+def test_cache_reports_repeat_ids():
+    cache = IdempotencyCache(capacity=8)
+    assert cache.check("a") is False
+    assert cache.check("a") is True
+    assert cache.check("b") is False
+    assert cache.to_dict() == {"size": 2, "hits": 1, "misses": 2, "evictions": 0}
+
+
+def test_cache_evicts_oldest_past_capacity():
+    cache = IdempotencyCache(capacity=2)
+    for message_id in ("a", "b", "c"):
+        cache.check(message_id)
+    assert len(cache) == 2
+    assert cache.check("a") is False
+    assert cache.check("c") is True
+
+
+def test_cache_forgets_ids_after_ttl():
+    cache = IdempotencyCache(capacity=8, ttl=1.0)
+    assert cache.check("a", now=0.0) is False
+    assert cache.check("a", now=0.5) is True
+    assert cache.check("a", now=2.0) is False
+    assert cache.evictions == 1
+
+
+def test_cache_rejects_zero_capacity():
+    with pytest.raises(ValueError):
+        IdempotencyCache(capacity=0)
+
+
+async def deliver(messages, dedup_capacity: int = 16384) -> dict:
+    """Publish messages on a local bus and return what each receiver handled."""
+    bus = MessageBus(transport="local", dedup_capacity=dedup_capacity)
+    await bus.start("inproc://test-dedup")
+    handled = {agent_id: [] for agent_id in RECEIVERS}
+    for agent_id in RECEIVERS:
+        bus.register_handler(agent_id, lambda m, seen=handled[agent_id]: seen.append(m.message_id))
+    for message in messages:
+        await bus.publish(message)
+    await asyncio.sleep(0.05)
+    stats = bus.get_stats()
+    await bus.stop()
+    return {"handled": handled, "stats": stats}
+
+
+def test_redelivered_message_reaches_each_receiver_once():
+    message = make()
+    result = asyncio.run(deliver([message, message, message]))
+    for agent_id in RECEIVERS:
+        assert result["handled"][agent_id] == [message.message_id]
+    assert result["stats"]["dedup"]["hits"] == 2
+    # One cache entry per message, not per receiver
+    assert result["stats"]["dedup"]["size"] == 1
+
+
+def test_same_id_from_different_senders_is_delivered():
+    messages = [make(agent_id="DRONE-08", message_id="m1"), make(agent_id="DRONE-09", message_id="m1")]
+    result = asyncio.run(deliver(messages))
+    assert result["handled"]["GROUND"] == ["m1", "m1"]
+
+
+def test_sender_never_receives_its_own_message():
+    result = asyncio.run(deliver([make(agent_id="DRONE-01")]))
+    assert result["handled"]["DRONE-01"] == []
+    assert len(result["handled"]["DRONE-02"]) == 1
+
+
+def test_dedup_disabled_delivers_duplicates():
+    message = make()
+    result = asyncio.run(deliver([message, message], dedup_capacity=0))
+    assert len(result["handled"]["GROUND"]) == 2
+    assert "dedup" not in result["stats"]
+
+
+def test_duplicate_is_counted_apart_and_skips_stats_and_monitors():
+    async def scenario():
+        bus = MessageBus(transport="local")
+        await bus.start("inproc://test-dedup-stats")
+        monitored = []
+        bus.add_monitor(monitored.append)
+        bus.register_handler("GROUND", lambda m: None)
+        message = make()
+        await bus.publish(message)
+        await asyncio.sleep(0.05)
+        first = bus.get_stats()
+        await bus.publish(message)
+        await bus.publish(message)
+        await asyncio.sleep(0.05)
+        stats = bus.get_stats()
+        await bus.stop()
+        return first, stats, monitored
+
+    first, stats, monitored = asyncio.run(scenario())
+    assert len(monitored) == 1
+    assert stats["total_received"] == first["total_received"] == 1
+    assert stats["received_by_type"] == {"TARGET_FOUND": 1}
+    assert stats["total_duplicates"] == 2
+    assert stats["duplicates_by_type"] == {"TARGET_FOUND": 2}
+
+
+# Per type: the replayed message, what the receiver holds before the first
+# delivery, and what it is re-given before the replay
+TILE_CASES = {
+    "OFFER_TILE": ({"tiles": TILE_DICTS}, [], []),
+    "ACCEPT_OFFER": ({"original_message_id": "m1", "accepted_tiles": TILE_DICTS}, TILES, TILES),
+    "ACCEPT_HANDOFF": ({"from_agent": "DRONE-02", "accepted_tiles": TILES}, TILES, TILES),
+}
+
+
+async def replay_to_drone(message: Message, held: list, regiven: list) -> dict:
+    """Deliver a message and its replay to a live drone; report its tiles and replies after each."""
+    bus = MessageBus(transport="local")
+    await bus.start(f"inproc://test-dedup-{message.type}")
+    replies = []
+    drone = DroneAgent("DRONE-02", Position(5, 5), (10, 10), 42, replies.append)
+    bus.register_handler(drone.agent_id, drone.receive_message, DroneAgent.SUBSCRIBED_MESSAGES)
+    drone.assign_tiles(held)
+
+    await bus.publish(message)
+    await asyncio.sleep(0.05)
+    await drone._process_inbox()
+    after_first = set(drone.assigned_tiles)
+    replies_first = len(replies)
+
+    drone.assigned_tiles = set(regiven)
+    await bus.publish(message)
+    await asyncio.sleep(0.05)
+    await drone._process_inbox()
+    await bus.stop()
+    return {
+        "after_first": after_first,
+        "after_replay": set(drone.assigned_tiles),
+        "replies": (replies_first, len(replies) - replies_first),
+    }
+
+
+@pytest.mark.parametrize("msg_type", list(TILE_CASES))
+def test_redelivered_tile_message_changes_tiles_once(msg_type):
+    payload, held, regiven = TILE_CASES[msg_type]
+    message = make(msg_type, agent_id="DRONE-01", payload=payload)
+    result = asyncio.run(replay_to_drone(message, held, regiven))
+    # The first delivery moves the tiles; the replay leaves the re-given set alone
+    assert result["after_first"] != set(held)
+    assert result["after_replay"] == set(regiven)
+    assert result["replies"][1] == 0
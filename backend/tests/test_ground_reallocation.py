@@ -0,0 +1,107 @@
+"""Zone reallocation sends each drone only the tiles it gains and loses."""
+from agents.drone_agent import DroneAgent, Position
+from agents.ground_agent import GroundAgent
+from sim.zone_allocator import ZoneAllocator
+
+GRID = 10
+
+
+def column(x0: int, x1: int) -> set:
+    return {(x, y) for x in range(x0, x1) for y in range(GRID)}
+
+
+class Harness:
+    """A ground agent whose flushed commands are applied straight to two drones."""
+
+    def __init__(self):
+        self.sent = []
+        self.ground = GroundAgent("GROUND", (GRID, GRID), self.sent.append, allocator=ZoneAllocator(GRID, GRID))
+        self.drones = {
+            drone_id: DroneAgent(drone_id, Position(x, 0), (GRID, GRID), 42, lambda m: None)
+            for drone_id, x in (("A", 0), ("B", 9))
+        }
+        self.now = 0.0
+
+    def seed(self, allocation: dict):
+        self.ground.seed_allocation(allocation)
+        for drone_id, tiles in allocation.items():
+            self.drones[drone_id].assign_tiles(tiles)
+
+    def apply(self, plan: dict) -> list:
+        """Apply a plan and return the (drone, command type, tile count, replace) sent for it."""
+        self.ground._realloc_job_reasons = ["periodic"]
+        self.ground._apply_reallocation({drone_id: list(tiles) for drone_id, tiles in plan.items()})
+        self.ground.now = self.now
+        self.ground._flush_commands()
+        self.now += GroundAgent.COMMAND_INTERVAL
+        sent = []
+        for message in self.sent:
+            target = message.payload["target"]
+            for command in message.payload["commands"]:
+                self.drones[target]._apply_ground_command(command)
+                payload = command["payload"]
+                sent.append((target, command["command_type"], len(payload["tiles"]), bool(payload.get("replace"))))
+        self.sent.clear()
+        return sent
+
+    def tiles(self, drone_id: str) -> set:
+        return self.drones[drone_id].assigned_tiles - self.drones[drone_id].visited_tiles
+
+
+def test_boundary_shift_sends_only_the_moved_tiles():
+    harness = Harness()
+    harness.seed({"A": column(0, 5), "B": column(5, 10)})
+
+    sent = harness.apply({"A": column(0, 6), "B": column(6, 10)})
+
+    assert sorted(sent) == [
+        ("A", "ASSIGN_TILES", GRID, False),
+        ("B", "RELEASE_TILES", GRID, False),
+    ]
+    assert harness.tiles("A") == column(0, 6)
+    assert harness.tiles("B") == column(6, 10)
+    assert harness.ground.stats["tiles_reassigned"] == GRID
+
+
+def test_unchanged_zone_sends_nothing():
+    harness = Harness()
+    harness.seed({"A": column(0, 5), "B": column(5, 10)})
+    assert harness.apply({"A": column(0, 5), "B": column(5, 10)}) == []
+
+
+def test_whole_zone_replace_when_no_smaller_than_the_change():
+    harness = Harness()
+    harness.seed({"A": column(0, 5), "B": column(5, 10)})
+
+    # Zones swap sides: the change is twice the size of either zone
+    sent = harness.apply({"A": column(5, 10), "B": column(0, 5)})
+
+    assert sorted(sent) == [("A", "ASSIGN_TILES", 50, True), ("B", "ASSIGN_TILES", 50, True)]
+    assert harness.tiles("A") == column(5, 10)
+    assert harness.tiles("B") == column(0, 5)
+
+
+def test_drone_without_a_record_gets_its_whole_zone():
+    harness = Harness()
+    harness.seed({"A": column(0, 10)})
+    harness.drones["B"].assign_tiles(column(8, 10))
+
+    sent = harness.apply({"A": column(0, 8), "B": column(8, 10)})
+
+    assert ("B", "ASSIGN_TILES", 2 * GRID, True) in sent
+    assert ("A", "RELEASE_TILES", 2 * GRID, False) in sent
+    assert harness.tiles("B") == column(8, 10)
+
+
+def test_periodic_resync_replaces_tiles_traded_between_peers():
+    harness = Harness()
+    harness.seed({"A": column(0, 5), "B": column(5, 10)})
+    # A peer trade the ground never saw
+    harness.drones["B"].assigned_tiles.add((0, 0))
+    harness.ground.stats["reallocations"] = GroundAgent.ZONE_RESYNC_INTERVAL - 1
+
+    sent = harness.apply({"A": column(0, 4), "B": column(4, 10)})
+
+    assert all(replace for _, _, _, replace in sent)
+    assert (0, 0) not in harness.tiles("B")
+    assert harness.tiles("A") == column(0, 4)
@@ -0,0 +1,104 @@
+"""Cache sync and warm-start tests for the stateful K-means allocator."""
+import random
+
+import numpy as np
+
+from sim.kmeans_allocator import KMeansZoneAllocator
+
+GRID = 30
+POSITIONS = {"DRONE-01": (2, 3), "DRONE-02": (25, 4), "DRONE-03": (14, 26)}
+BATTERIES = {drone_id: 90.0 for drone_id in POSITIONS}
+
+
+def all_tiles() -> set:
+    return {(x, y) for x in range(GRID) for y in range(GRID)}
+
+
+def cached_tiles(allocator: KMeansZoneAllocator) -> set:
+    return {tile for tile, alive in zip(allocator._tiles, allocator._alive) if alive}
+
+
+def assert_nearest_centroid(allocator: KMeansZoneAllocator, allocation: dict):
+    """Every tile went to the drone whose fitted centroid is closest."""
+    drone_ids = list(allocator._centroids)
+    centroids = np.array([allocator._centroids[drone_id] for drone_id in drone_ids])
+    for drone_id, tiles in allocation.items():
+        own = drone_ids.index(drone_id)
+        for tile in tiles:
+            distances = ((centroids - np.asarray(tile)) ** 2).sum(axis=1)
+            assert distances[own] <= distances.min() + 1e-9, (tile, drone_id)
+
+
+def test_sync_tiles_matches_the_unvisited_set():
+    allocator = KMeansZoneAllocator(GRID, GRID)
+    allocator.sync_tiles(all_tiles())
+    rng = random.Random(1)
+    for _ in range(5):
+        unvisited = {tile for tile in all_tiles() if rng.random() < 0.6}
+        allocator.sync_tiles(unvisited)
+        assert allocator.tile_count == len(unvisited)
+        assert cached_tiles(allocator) == unvisited
+        assert set(allocator._tile_row) == unvisited
+
+
+def test_labels_follow_tiles_after_sync_and_compaction():
+    allocator = KMeansZoneAllocator(GRID, GRID)
+    allocator.allocate(POSITIONS, all_tiles(), BATTERIES)
+
+    # Visit a third of the grid (enough to compact the array) and reopen a few tiles
+    unvisited = {tile for tile in all_tiles() if tile[1] >= GRID // 3} | {(0, 0), (29, 0)}
+    allocation = allocator.allocate(POSITIONS, unvisited, BATTERIES)
+
+    assigned = [tile for tiles in allocation.values() for tile in tiles]
+    assert len(assigned) == len(set(assigned))
+    assert set(assigned) == unvisited
+    assert_nearest_centroid(allocator, allocation)
+
+
+def test_labels_follow_tiles_with_incremental_updates():
+    allocator = KMeansZoneAllocator(GRID, GRID)
+    allocator.allocate(POSITIONS, all_tiles(), BATTERIES)
+    visited = {(x, y) for x in range(10) for y in range(10)}
+    allocator.mark_visited(visited)
+    allocator.add_tiles([(0, 0), (5, 5)])
+
+    allocation = allocator.allocate(POSITIONS, None, BATTERIES)
+    assert {tile for tiles in allocation.values() for tile in tiles} == (all_tiles() - visited) | {(0, 0), (5, 5)}
+    assert_nearest_centroid(allocator, allocation)
+
+
+def test_warm_start_converges_in_fewer_iterations():
+    cold = KMeansZoneAllocator(GRID, GRID, max_iter=100)
+    warm = KMeansZoneAllocator(GRID, GRID, max_iter=100)
+    warm.allocate(POSITIONS, all_tiles(), BATTERIES)
+
+    # Since the last plan each drone scanned the tiles nearest it and moved on
+    unvisited = all_tiles()
+    for x, y in POSITIONS.values():
+        unvisited -= set(sorted(unvisited, key=lambda t: abs(t[0] - x) + abs(t[1] - y))[:10])
+    moved = {"DRONE-01": (8, 3), "DRONE-02": (25, 10), "DRONE-03": (10, 26)}
+    cold.allocate(moved, unvisited, BATTERIES)
+    before = warm.stats["iterations"]
+    warm.allocate(moved, unvisited, BATTERIES)
+
+    assert warm.stats["warm_fits"] == 1
+    assert warm.stats["iterations"] - before < cold.stats["iterations"]
+
+
+def test_refit_of_unchanged_tiles_converges_immediately():
+    allocator = KMeansZoneAllocator(GRID, GRID, max_iter=100)
+    first = allocator.allocate(POSITIONS, all_tiles(), BATTERIES)
+    before = allocator.stats["iterations"]
+    second = allocator.allocate(POSITIONS, all_tiles(), BATTERIES)
+
+    assert allocator.stats["iterations"] - before <= 2
+    assert {d: set(t) for d, t in first.items()} == {d: set(t) for d, t in second.items()}
+
+
+def test_reset_starts_from_drone_positions():
+    allocator = KMeansZoneAllocator(GRID, GRID)
+    allocator.allocate(POSITIONS, all_tiles(), BATTERIES)
+    allocator.reset()
+    allocator.allocate(POSITIONS, all_tiles(), BATTERIES)
+    assert allocator.stats["fits"] == 2
+    assert allocator.stats["warm_fits"] == 0
@@ -0,0 +1,113 @@
+"""Tile ownership under regional coordinators: no unsearched tile has two owners."""
+import asyncio
+from collections import Counter
+
+from agents.drone_agent import DroneAgent, Message, Position
+from agents.ground_agent import GroundAgent
+from agents.regional import RegionalHierarchy
+from sim.zone_allocator import ZoneAllocator
+
+GRID = 10
+TICK = 0.5
+
+
+class Harness:
+    """A 2x2 regional hierarchy whose commands are applied straight to drones that only move when told."""
+
+    def __init__(self, positions: dict):
+        self.sent = []
+        ground = GroundAgent("GROUND", (GRID, GRID), self.sent.append)
+        self.hierarchy = RegionalHierarchy(
+            ground, 2, self.sent.append, allocator_factory=lambda: ZoneAllocator(GRID, GRID)
+        )
+        self.drones = {
+            drone_id: DroneAgent(drone_id, Position(x, y), (GRID, GRID), 42, lambda m: None)
+            for drone_id, (x, y) in positions.items()
+        }
+        self.now = 0.0
+
+    def seed(self, allocation: dict):
+        self.hierarchy.seed_allocation(allocation)
+        for drone_id, tiles in allocation.items():
+            self.drones[drone_id].assign_tiles(tiles)
+
+    def move(self, drone_id: str, x: int, y: int):
+        self.drones[drone_id].position = Position(x, y)
+
+    async def run(self, ticks: int):
+        for _ in range(ticks):
+            for drone in self.drones.values():
+                self.hierarchy.receive_message(Message(
+                    type="HEARTBEAT", agent_id=drone.agent_id, timestamp=self.now,
+                    payload={"position": {"x": drone.position.x, "y": drone.position.y}, "battery": 90.0}
+                ))
+            await self.hierarchy.tick(self.now)
+            # Let reallocation plans finish in the executor
+            await asyncio.sleep(0.01)
+            self.deliver()
+            self.now += TICK
+
+    def flush(self):
+        """Send what the coordinators queued, as the ground agent's tick would."""
+        self.hierarchy.ground.now = self.now
+        self.hierarchy.ground._flush_commands()
+        self.deliver()
+        self.now += self.hierarchy.ground.COMMAND_INTERVAL
+
+    def deliver(self):
+        for message in self.sent:
+            if message.type == "GROUND_COMMAND":
+                for command in message.payload["commands"]:
+                    self.drones[message.payload["target"]]._apply_ground_command(command)
+        self.sent.clear()
+
+    def owners(self) -> Counter:
+        return Counter(t for drone in self.drones.values() for t in drone.assigned_tiles - drone.visited_tiles)
+
+    def owned_by(self, drone_id: str, region_id: str) -> set:
+        region = self.hierarchy.by_id[region_id].region.tiles()
+        return self.drones[drone_id].assigned_tiles & region
+
+
+def region_tiles(hierarchy: RegionalHierarchy, region_id: str) -> set:
+    return hierarchy.by_id[region_id].region.tiles()
+
+
+def test_no_tile_has_two_owners_after_crossing_a_region_boundary():
+    async def scenario():
+        harness = Harness({"A": (1, 1), "B": (3, 3), "C": (7, 7)})
+        home = region_tiles(harness.hierarchy, "GROUND-R0-0")
+        rest = {(x, y) for x in range(GRID) for y in range(GRID)} - home
+        harness.seed({
+            "A": sorted(t for t in home if t[0] < 3),
+            "B": sorted(t for t in home if t[0] >= 3),
+            "C": sorted(rest)
+        })
+        await harness.run(3)
+
+        # A flies east: its home tiles are released and re-planned to B
+        harness.move("A", 6, 1)
+        await harness.run(20)
+        return harness, home
+
+    harness, home = asyncio.run(scenario())
+    owners = harness.owners()
+    assert [t for t, n in owners.items() if n > 1] == []
+    assert len(owners) == GRID * GRID
+    assert not harness.owned_by("A", "GROUND-R0-0")
+    assert home <= harness.drones["B"].assigned_tiles
+
+
+def test_relending_takes_tiles_back_from_a_borrower_that_never_arrived():
+    harness = Harness({"A": (7, 1), "B": (7, 7)})
+    empty = harness.hierarchy.by_id["GROUND-R0-0"]
+    home = region_tiles(harness.hierarchy, "GROUND-R0-0")
+    empty.lend_tiles("A")
+    harness.flush()
+    lent_to_a = harness.owned_by("A", "GROUND-R0-0")
+    empty.lend_tiles("B")
+    harness.flush()
+
+    assert lent_to_a == home
+    assert not harness.owned_by("A", "GROUND-R0-0")
+    assert harness.owned_by("B", "GROUND-R0-0") == home
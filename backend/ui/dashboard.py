@@ -5,16 +5,25 @@ import logging
 from typing import Set, Dict, Any, Optional, Callable
 from dataclasses import dataclass
 
+from comms.flow_control import FlowControl, FlowStats, PolicyQueue
+
 logger = logging.getLogger(__name__)
 
 class DashboardBroadcaster:
     """WebSocket clients; broadcasts state/messages to dashboard."""
 
-    def __init__(self):
+    def __init__(self, flow: Optional[FlowControl] = None):
         self.clients: Set[Any] = set()
         self.message_buffer: list = []
         self.max_buffer_size = 100
         self.messages_sent = 0
+        # A2A messages wait here and go out once per tick, ahead of the state update;
+        # when full, heartbeats give way and target/handoff messages are always kept
+        self.max_pending_messages = 500
+        self.flow_stats = FlowStats()
+        self.pending_messages = PolicyQueue(self.max_pending_messages, flow or FlowControl(), self.flow_stats)
+        self.pending_dropped = 0
+        self._tick_lock = asyncio.Lock()
 
     def add_client(self, websocket):
         self.clients.add(websocket)
@@ -56,6 +65,23 @@ class DashboardBroadcaster:
             "data": message
         })
     
+    def queue_message(self, message: dict) -> bool:
+        """Queue an A2A message for the next tick flush; returns False if it was dropped (full, DROP class)."""
+        if not self.pending_messages.push(message):
+            self.pending_dropped += 1
+            return False
+        return True
+
+    async def flush_messages(self):
+        while self.pending_messages:
+            await self.broadcast_message(self.pending_messages.popleft())
+
+    async def broadcast_tick(self, state: dict):
+        """Flush queued messages, then send the state, keeping ticks in order."""
+        async with self._tick_lock:
+            await self.flush_messages()
+            await self.broadcast_state(state)
+
     async def broadcast_metrics(self, metrics: dict):
         await self.broadcast({
             "type": "METRICS_UPDATE",
@@ -69,5 +95,8 @@ class DashboardBroadcaster:
         return {
             "connected_clients": len(self.clients),
             "messages_sent": self.messages_sent,
-            "buffer_size": len(self.message_buffer)
+            "buffer_size": len(self.message_buffer),
+            "pending_messages": len(self.pending_messages),
+            "pending_dropped": self.pending_dropped,
+            "pending_flow": self.flow_stats.to_dict()
         }